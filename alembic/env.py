@@ -9,7 +9,7 @@ from app.database import Base
 from app.models.core import (
     Manufacturer, Series, EquipmentType, Model, Material,
     MaterialColourSurcharge, Supplier, SupplierMaterial,
-    Customer, Order, OrderLine, PricingOption, ShippingRate
+    Customer, Order, OrderLine, PricingOption, ShippingRate, CatalogState
 )
 from app.models.templates import (
     AmazonProductType, ProductTypeKeyword, ProductTypeField, ProductTypeFieldValue,
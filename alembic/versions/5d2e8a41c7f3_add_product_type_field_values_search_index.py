@@ -0,0 +1,28 @@
+"""add product_type_field_values search index
+
+Revision ID: 5d2e8a41c7f3
+Revises: 039251c0f3ee
+Create Date: 2026-10-16 10:12:40.118402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e8a41c7f3'
+down_revision: Union[str, Sequence[str], None] = '039251c0f3ee'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_product_type_field_values_field_value', 'product_type_field_values', ['product_type_field_id', 'value'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_type_field_values_field_value', table_name='product_type_field_values')
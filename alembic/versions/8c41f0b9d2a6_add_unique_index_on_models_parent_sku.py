@@ -0,0 +1,67 @@
+"""add unique index on models.parent_sku
+
+Revision ID: 8c41f0b9d2a6
+Revises: 5d2e8a41c7f3
+Create Date: 2026-10-16 14:03:27.552910
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41f0b9d2a6'
+down_revision: Union[str, Sequence[str], None] = '5d2e8a41c7f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SKU_LENGTH = 40
+SKU_VERSION_START = 31
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+    
+    # Existing duplicates would block the unique index: the lowest id keeps its
+    # SKU and every other copy moves to the smallest version its base has free.
+    # SKUs that do not follow the generated format are cleared instead and are
+    # filled in again by POST /models/regenerate-skus.
+    duplicates = connection.execute(sa.text(
+        "SELECT id, parent_sku FROM models WHERE parent_sku IN "
+        "(SELECT parent_sku FROM models WHERE parent_sku IS NOT NULL GROUP BY parent_sku HAVING COUNT(*) > 1) "
+        "ORDER BY parent_sku, id"
+    )).fetchall()
+    
+    seen = set()
+    for model_id, sku in duplicates:
+        if sku not in seen:
+            seen.add(sku)
+            continue
+        new_sku = None
+        if len(sku) == SKU_LENGTH and sku[SKU_VERSION_START] == "V":
+            base = sku[:SKU_VERSION_START + 1]
+            taken = {
+                row[0][SKU_VERSION_START + 1:].rstrip("0")
+                for row in connection.execute(
+                    sa.text("SELECT parent_sku FROM models WHERE substr(parent_sku, 1, :n) = :base"),
+                    {"n": len(base), "base": base}
+                )
+            }
+            version = 1
+            while version % 10 == 0 or str(version) in taken:
+                version += 1
+            new_sku = f"{base}{version}".ljust(SKU_LENGTH, "0")
+        connection.execute(
+            sa.text("UPDATE models SET parent_sku = :sku WHERE id = :id"),
+            {"sku": new_sku, "id": model_id}
+        )
+    
+    op.create_index(op.f('ix_models_parent_sku'), 'models', ['parent_sku'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_models_parent_sku'), table_name='models')
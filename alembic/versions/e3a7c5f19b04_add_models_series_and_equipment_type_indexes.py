@@ -0,0 +1,30 @@
+"""add models series_id and equipment_type_id indexes
+
+Revision ID: e3a7c5f19b04
+Revises: 8c41f0b9d2a6
+Create Date: 2026-10-16 16:41:09.274815
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a7c5f19b04'
+down_revision: Union[str, Sequence[str], None] = '8c41f0b9d2a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_models_series_id'), 'models', ['series_id'], unique=False)
+    op.create_index(op.f('ix_models_equipment_type_id'), 'models', ['equipment_type_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_models_equipment_type_id'), table_name='models')
+    op.drop_index(op.f('ix_models_series_id'), table_name='models')
@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, Header, Query, Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.database import get_db
+from app.models.core import Manufacturer, Series, Model
+from app.schemas.core import CatalogManufacturerNode
+from app.services.catalog_version import catalog_version
+
+router = APIRouter(prefix="/catalog", tags=["catalog"])
+
+CATALOG_MAX_DEPTH = 3
+
+@router.get("/tree", response_model=List[CatalogManufacturerNode], response_model_exclude_unset=True)
+def get_catalog_tree(
+    response: Response,
+    depth: int = Query(CATALOG_MAX_DEPTH, ge=1, le=CATALOG_MAX_DEPTH),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Manufacturers with their series and models, nested, in name order.
+
+    depth=1 stops at manufacturers and depth=2 at series. Each level is one
+    query. The ETag comes from the persisted catalog version, so a matching
+    If-None-Match gets a 304 after a single primary-key read.
+    """
+    etag = catalog_version.etag(db, depth)
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
+    tree = [
+        {"id": row.id, "name": row.name}
+        for row in db.execute(select(Manufacturer.id, Manufacturer.name).order_by(Manufacturer.name, Manufacturer.id))
+    ]
+    if depth < 2:
+        return tree
+    
+    series_by_manufacturer = {node["id"]: node.setdefault("series", []) for node in tree}
+    models_by_series = {}
+    for row in db.execute(
+        select(Series.id, Series.name, Series.manufacturer_id).order_by(Series.name, Series.id)
+    ):
+        node = {"id": row.id, "name": row.name}
+        if depth > 2:
+            models_by_series[row.id] = node.setdefault("models", [])
+        if row.manufacturer_id in series_by_manufacturer:
+            series_by_manufacturer[row.manufacturer_id].append(node)
+    if depth < 3:
+        return tree
+    
+    for row in db.execute(
+        select(Model.id, Model.name, Model.series_id, Model.equipment_type_id, Model.parent_sku)
+        .order_by(Model.name, Model.id)
+    ):
+        if row.series_id in models_by_series:
+            models_by_series[row.series_id].append({
+                "id": row.id,
+                "name": row.name,
+                "equipment_type_id": row.equipment_type_id,
+                "parent_sku": row.parent_sku
+            })
+    return tree
@@ -1,16 +1,30 @@
-import re
-import io
-import csv
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from typing import List
+import os
+import json
+import hashlib
+import zipfile
+import tempfile
+from collections import defaultdict
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import APIRouter, Depends, HTTPException, Header, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional, Callable
 from pydantic import BaseModel
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
-from app.database import get_db
-from app.models.core import Model, Series, Manufacturer, EquipmentType
+from app.database import get_db, SessionLocal
+from app.models.core import Model, Series, EquipmentType
 from app.models.templates import AmazonProductType, ProductTypeField, EquipmentTypeProductType
+from app.services.export_rows import (
+    ExportEquipmentType, build_export_rows, build_row_slots, compile_field_resolver, export_field, model_row_slots,
+    normalize_for_url
+)
+from app.services.export_writer import (
+    EXPORT_GROUP_SPOOL, SpooledRows, read_spooled_rows, render_group_export, write_export_file, write_workbook_file
+)
+from app.services.jobs import Job, JobRunner
+from app.services.export_cache import export_cache, iter_file
 
 router = APIRouter(prefix="/export", tags=["export"])
 
@@ -28,59 +42,129 @@ class ExportPreviewResponse(BaseModel):
     rows: List[ExportRowData]
     template_code: str
 
-@router.post("/preview", response_model=ExportPreviewResponse)
-def generate_export_preview(request: ExportPreviewRequest, db: Session = Depends(get_db)):
+class ExportMultiRequest(ExportPreviewRequest):
+    package: str = "zip"  # "zip" (one file per template) or "workbook" (one sheet per template)
+    format: str = "xlsx"  # file format inside the zip: "xlsx", "xlsm" or "csv"
+
+class ExportJobRequest(ExportPreviewRequest):
+    format: str = "xlsx"  # "xlsx", "xlsm" or "csv"
+
+class ExportJobResponse(BaseModel):
+    job_id: str
+    status: str
+    format: str
+    rows_done: int
+    total_rows: int
+    filename: Optional[str] = None
+    error: Optional[str] = None
+    download_url: Optional[str] = None
+
+class ExportCacheStatsResponse(BaseModel):
+    entries: int
+    total_bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+
+EXPORT_MEDIA_TYPES = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "xlsm": "application/vnd.ms-excel.sheet.macroEnabled.12",
+    "csv": "text/csv",
+}
+
+class ExportGroup:
+    """Selected models that share one Amazon product type, with that template's fields."""
+    
+    def __init__(self, product_type: AmazonProductType, fields: List[ProductTypeField], models: List[Model]):
+        self.product_type = product_type
+        self.fields = fields
+        self.models = models
+
+def load_export_groups(request: ExportPreviewRequest, db: Session, single_equipment_type: bool = False):
+    """Group the selected models by the Amazon product type linked to their equipment type.
+    Models, equipment types, links, templates and fields are each loaded once,
+    so the query count doesn't depend on how many groups or models there are.
+    Series and manufacturers are eager-loaded with the models, so building rows
+    doesn't issue any further queries per model. With single_equipment_type,
+    a selection spanning several equipment types is rejected.
+    """
     if not request.model_ids:
         raise HTTPException(status_code=400, detail="No models selected")
     
-    models = db.query(Model).filter(Model.id.in_(request.model_ids)).all()
+    models = db.query(Model).options(
+        selectinload(Model.series).selectinload(Series.manufacturer)
+    ).filter(Model.id.in_(request.model_ids)).all()
     if not models:
         raise HTTPException(status_code=404, detail="No models found")
     
     equipment_type_ids = set(m.equipment_type_id for m in models)
-    if len(equipment_type_ids) > 1:
+    if single_equipment_type and len(equipment_type_ids) > 1:
         raise HTTPException(
             status_code=400, 
             detail="All selected models must have the same equipment type for export"
         )
     
-    equipment_type_id = list(equipment_type_ids)[0]
-    
-    link = db.query(EquipmentTypeProductType).filter(
-        EquipmentTypeProductType.equipment_type_id == equipment_type_id
-    ).first()
-    
-    if not link:
-        equipment_type = db.query(EquipmentType).filter(EquipmentType.id == equipment_type_id).first()
-        raise HTTPException(
-            status_code=400, 
-            detail=f"No Amazon template linked to equipment type: {equipment_type.name if equipment_type else 'Unknown'}"
-        )
-    
-    product_type = db.query(AmazonProductType).filter(
-        AmazonProductType.id == link.product_type_id
-    ).first()
-    
-    if not product_type:
+    equipment_types = {
+        et.id: et for et in db.query(EquipmentType).filter(EquipmentType.id.in_(equipment_type_ids))
+    }
+    
+    product_type_by_equipment_type = {}
+    links = db.query(EquipmentTypeProductType).filter(
+        EquipmentTypeProductType.equipment_type_id.in_(equipment_type_ids)
+    ).order_by(EquipmentTypeProductType.id)
+    for link in links:
+        product_type_by_equipment_type.setdefault(link.equipment_type_id, link.product_type_id)
+    
+    unlinked = sorted(equipment_type_ids - product_type_by_equipment_type.keys())
+    if unlinked:
+        names = ", ".join(equipment_types[i].name if i in equipment_types else 'Unknown' for i in unlinked)
+        raise HTTPException(status_code=400, detail=f"No Amazon template linked to equipment type: {names}")
+    
+    product_type_ids = set(product_type_by_equipment_type.values())
+    product_types = {
+        pt.id: pt for pt in db.query(AmazonProductType).filter(AmazonProductType.id.in_(product_type_ids))
+    }
+    if len(product_types) != len(product_type_ids):
         raise HTTPException(status_code=404, detail="Template not found")
     
+    fields_by_product_type = defaultdict(list)
     fields = db.query(ProductTypeField).filter(
-        ProductTypeField.product_type_id == product_type.id
-    ).order_by(ProductTypeField.order_index).all()
+        ProductTypeField.product_type_id.in_(product_type_ids)
+    ).order_by(ProductTypeField.product_type_id, ProductTypeField.order_index)
+    for field in fields:
+        fields_by_product_type[field.product_type_id].append(field)
+    
+    models_by_product_type = {}
+    for model in models:
+        models_by_product_type.setdefault(product_type_by_equipment_type[model.equipment_type_id], []).append(model)
     
+    groups = [
+        ExportGroup(product_types[product_type_id], fields_by_product_type[product_type_id], group_models)
+        for product_type_id, group_models in models_by_product_type.items()
+    ]
+    return groups, equipment_types
+
+def load_export_context(request: ExportPreviewRequest, db: Session):
+    """Resolve the selected models, which must share one equipment type, and their template.
+    Returns (models, product type, fields, equipment type) of the single export group.
+    """
+    groups, equipment_types = load_export_groups(request, db, single_equipment_type=True)
+    group = groups[0]
+    return group.models, group.product_type, group.fields, equipment_types.get(group.models[0].equipment_type_id)
+
+@router.post("/preview", response_model=ExportPreviewResponse)
+def generate_export_preview(request: ExportPreviewRequest, db: Session = Depends(get_db)):
+    models, product_type, fields, equipment_type = load_export_context(request, db)
     header_rows = product_type.header_rows or []
     
-    equipment_type = db.query(EquipmentType).filter(EquipmentType.id == equipment_type_id).first()
+    resolvers = [compile_field_resolver(field, equipment_type, request.listing_type) for field in fields]
     
     rows = []
     for model in models:
-        series = db.query(Series).filter(Series.id == model.series_id).first()
-        manufacturer = db.query(Manufacturer).filter(Manufacturer.id == series.manufacturer_id).first() if series else None
-        
-        row_data: List[str | None] = []
-        for field in fields:
-            value = get_field_value(field, model, series, manufacturer, equipment_type, request.listing_type)
-            row_data.append(value)
+        series = model.series
+        slots = build_row_slots(model, series, series.manufacturer if series else None)
+        row_data: List[str | None] = [resolve(slots) for resolve in resolvers]
         
         rows.append(ExportRowData(
             model_id=model.id,
@@ -97,307 +181,319 @@ def generate_export_preview(request: ExportPreviewRequest, db: Session = Depends
 
 from datetime import datetime
 
-def build_export_data(request: ExportPreviewRequest, db: Session):
-    """Build export data (headers and rows) for the given models."""
-    if not request.model_ids:
-        raise HTTPException(status_code=400, detail="No models selected")
-    
-    models = db.query(Model).filter(Model.id.in_(request.model_ids)).all()
-    if not models:
-        raise HTTPException(status_code=404, detail="No models found")
-    
-    equipment_type_ids = set(m.equipment_type_id for m in models)
-    if len(equipment_type_ids) > 1:
-        raise HTTPException(
-            status_code=400, 
-            detail="All selected models must have the same equipment type for export"
-        )
-    
-    equipment_type_id = list(equipment_type_ids)[0]
-    
-    link = db.query(EquipmentTypeProductType).filter(
-        EquipmentTypeProductType.equipment_type_id == equipment_type_id
-    ).first()
-    
-    if not link:
-        equipment_type = db.query(EquipmentType).filter(EquipmentType.id == equipment_type_id).first()
-        raise HTTPException(
-            status_code=400, 
-            detail=f"No Amazon template linked to equipment type: {equipment_type.name if equipment_type else 'Unknown'}"
-        )
-    
-    product_type = db.query(AmazonProductType).filter(
-        AmazonProductType.id == link.product_type_id
-    ).first()
-    
-    if not product_type:
-        raise HTTPException(status_code=404, detail="Template not found")
-    
-    fields = db.query(ProductTypeField).filter(
-        ProductTypeField.product_type_id == product_type.id
-    ).order_by(ProductTypeField.order_index).all()
-    
-    header_rows = product_type.header_rows or []
-    
-    equipment_type = db.query(EquipmentType).filter(EquipmentType.id == equipment_type_id).first()
-    
-    first_model = models[0]
-    first_series = db.query(Series).filter(Series.id == first_model.series_id).first()
-    first_manufacturer = db.query(Manufacturer).filter(Manufacturer.id == first_series.manufacturer_id).first() if first_series else None
+def export_filename_base(first_model: Model) -> str:
+    first_series = first_model.series
+    first_manufacturer = first_series.manufacturer if first_series else None
     
     mfr_name = normalize_for_url(first_manufacturer.name) if first_manufacturer else 'Unknown'
     series_name = normalize_for_url(first_series.name) if first_series else 'Unknown'
     date_str = datetime.now().strftime('%Y%m%d')
-    filename_base = f"Amazon_{mfr_name}_{series_name}_{date_str}"
+    return f"Amazon_{mfr_name}_{series_name}_{date_str}"
+
+def build_export_data(
+    request: ExportPreviewRequest,
+    db: Session,
+    export_format: str = "xlsx",
+    progress: Optional[Callable[[int, int], None]] = None,
+    context: Optional[tuple] = None
+):
+    """Build export data (headers, rows, column widths) for the given models.
+    CSV rows are returned as a generator for the writer to consume. Spreadsheet
+    rows are spooled to a temp file in the same pass that sizes their columns,
+    since the write-only sheet needs the widths first. progress is called with
+    (rows done, total rows) as rows are generated. An already loaded context from
+    load_export_context can be passed to skip reloading it.
+    """
+    models, product_type, fields, equipment_type = context or load_export_context(request, db)
     
-    data_rows = []
-    for model in models:
-        series = db.query(Series).filter(Series.id == model.series_id).first()
-        manufacturer = db.query(Manufacturer).filter(Manufacturer.id == series.manufacturer_id).first() if series else None
-        
-        row_data = []
-        for field in fields:
-            value = get_field_value(field, model, series, manufacturer, equipment_type, request.listing_type)
-            row_data.append(value if value else '')
-        
-        data_rows.append(row_data)
+    header_rows = product_type.header_rows or []
+    filename_base = export_filename_base(models[0])
+    data_rows = build_export_rows(
+        models, fields, {equipment_type.id: equipment_type} if equipment_type else {},
+        request.listing_type, progress
+    )
+    if export_format == "csv":
+        return header_rows, data_rows, [], filename_base
     
-    return header_rows, data_rows, filename_base
+    spooled_rows = SpooledRows(header_rows, data_rows)
+    return header_rows, spooled_rows, spooled_rows.widths, filename_base
 
 
-@router.post("/download/xlsx")
-def download_xlsx(request: ExportPreviewRequest, db: Session = Depends(get_db)):
-    """Download export as XLSX file."""
-    header_rows, data_rows, filename_base = build_export_data(request, db)
-    
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Template"
-    
-    row_styles = [
-        (Font(bold=True, color="FFFFFF"), PatternFill(start_color="1976D2", end_color="1976D2", fill_type="solid")),
-        (Font(color="FFFFFF"), PatternFill(start_color="2196F3", end_color="2196F3", fill_type="solid")),
-        (Font(bold=True, color="FFFFFF"), PatternFill(start_color="4CAF50", end_color="4CAF50", fill_type="solid")),
-        (Font(bold=True), PatternFill(start_color="8BC34A", end_color="8BC34A", fill_type="solid")),
-        (Font(size=9), PatternFill(start_color="C8E6C9", end_color="C8E6C9", fill_type="solid")),
-        (Font(italic=True, size=9), PatternFill(start_color="FFF9C4", end_color="FFF9C4", fill_type="solid")),
-    ]
-    
-    current_row = 1
-    for row_idx, header_row in enumerate(header_rows):
-        for col_idx, value in enumerate(header_row):
-            cell = ws.cell(row=current_row, column=col_idx + 1, value=value or '')
-            if row_idx < len(row_styles):
-                cell.font = row_styles[row_idx][0]
-                cell.fill = row_styles[row_idx][1]
-            cell.alignment = Alignment(horizontal='left', vertical='center')
-        current_row += 1
-    
-    for data_row in data_rows:
-        for col_idx, value in enumerate(data_row):
-            ws.cell(row=current_row, column=col_idx + 1, value=value or '')
-        current_row += 1
-    
-    for col in ws.columns:
-        max_length = 0
-        column = col[0].column_letter
-        for cell in col:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = min(len(str(cell.value)), 50)
-            except:
-                pass
-        adjusted_width = max_length + 2
-        ws.column_dimensions[column].width = adjusted_width
-    
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
-    
-    filename = f"{filename_base}.xlsx"
+EXPORT_CACHE_FORMAT_VERSION = 1
+
+def export_cache_key(request: ExportPreviewRequest, export_format: str, context: tuple) -> str:
+    """Hash of everything that determines an export's content.
+    Covers the model ids, listing type and format plus a version stamp of the
+    template, its fields and the involved model, series, manufacturer and
+    equipment type rows, so any edit to them yields a new key.
+    """
+    models, product_type, fields, equipment_type = context
+    series = {m.series.id: m.series for m in models if m.series}
+    manufacturers = {s.manufacturer.id: s.manufacturer for s in series.values() if s.manufacturer}
+    
+    stamp = {
+        "version": EXPORT_CACHE_FORMAT_VERSION,
+        "model_ids": sorted(m.id for m in models),
+        "listing_type": request.listing_type,
+        "format": export_format,
+        "template": [product_type.id, product_type.code, product_type.header_rows],
+        "fields": [
+            [f.id, f.field_name, f.required, f.order_index, f.selected_value, f.custom_value]
+            for f in fields
+        ],
+        "models": [
+            [m.id, m.name, m.parent_sku, m.series_id, m.equipment_type_id]
+            for m in models
+        ],
+        "series": sorted([s.id, s.name, s.manufacturer_id] for s in series.values()),
+        "manufacturers": sorted([m.id, m.name] for m in manufacturers.values()),
+        "equipment_type": [equipment_type.id, equipment_type.name] if equipment_type else None,
+    }
+    return hashlib.sha256(json.dumps(stamp, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def download_export(request: ExportPreviewRequest, db: Session, export_format: str, if_none_match: Optional[str]):
+    """Serve an export from the artifact cache, rendering it on a miss.
+    The cache key doubles as the ETag, so a matching If-None-Match gets a 304.
+    """
+    context = load_export_context(request, db)
+    key = export_cache_key(request, export_format, context)
+    etag = f'"{key}"'
+    filename = f"{export_filename_base(context[0][0])}.{export_format}"
+    
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    cached = export_cache.get(key, export_format)
+    if cached is None:
+        header_rows, data_rows, column_widths, _ = build_export_data(request, db, export_format, context=context)
+        fd, rendered_path = tempfile.mkstemp(suffix=f".{export_format}", prefix="export_")
+        os.close(fd)
+        try:
+            write_export_file(header_rows, data_rows, column_widths, export_format, rendered_path)
+        except Exception:
+            os.remove(rendered_path)
+            raise
+        cached = export_cache.put(key, export_format, rendered_path)
+    
+    # Stream from the handle the cache opened, so a concurrent eviction can't pull the file away mid-send
     return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+        iter_file(cached),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "ETag": etag,
+            "Content-Length": str(os.fstat(cached.fileno()).st_size),
+            "Content-Disposition": f'attachment; filename="{filename}"'
+        }
     )
 
 
+@router.post("/download/xlsx")
+def download_xlsx(request: ExportPreviewRequest, db: Session = Depends(get_db), if_none_match: Optional[str] = Header(None)):
+    """Download export as XLSX file."""
+    return download_export(request, db, "xlsx", if_none_match)
+
+
 @router.post("/download/xlsm")
-def download_xlsm(request: ExportPreviewRequest, db: Session = Depends(get_db)):
+def download_xlsm(request: ExportPreviewRequest, db: Session = Depends(get_db), if_none_match: Optional[str] = Header(None)):
     """Download export as XLSM file (macro-enabled workbook)."""
-    header_rows, data_rows, filename_base = build_export_data(request, db)
-    
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Template"
-    
-    row_styles = [
-        (Font(bold=True, color="FFFFFF"), PatternFill(start_color="1976D2", end_color="1976D2", fill_type="solid")),
-        (Font(color="FFFFFF"), PatternFill(start_color="2196F3", end_color="2196F3", fill_type="solid")),
-        (Font(bold=True, color="FFFFFF"), PatternFill(start_color="4CAF50", end_color="4CAF50", fill_type="solid")),
-        (Font(bold=True), PatternFill(start_color="8BC34A", end_color="8BC34A", fill_type="solid")),
-        (Font(size=9), PatternFill(start_color="C8E6C9", end_color="C8E6C9", fill_type="solid")),
-        (Font(italic=True, size=9), PatternFill(start_color="FFF9C4", end_color="FFF9C4", fill_type="solid")),
-    ]
-    
-    current_row = 1
-    for row_idx, header_row in enumerate(header_rows):
-        for col_idx, value in enumerate(header_row):
-            cell = ws.cell(row=current_row, column=col_idx + 1, value=value or '')
-            if row_idx < len(row_styles):
-                cell.font = row_styles[row_idx][0]
-                cell.fill = row_styles[row_idx][1]
-            cell.alignment = Alignment(horizontal='left', vertical='center')
-        current_row += 1
-    
-    for data_row in data_rows:
-        for col_idx, value in enumerate(data_row):
-            ws.cell(row=current_row, column=col_idx + 1, value=value or '')
-        current_row += 1
-    
-    for col in ws.columns:
-        max_length = 0
-        column = col[0].column_letter
-        for cell in col:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = min(len(str(cell.value)), 50)
-            except:
-                pass
-        adjusted_width = max_length + 2
-        ws.column_dimensions[column].width = adjusted_width
-    
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
-    
-    filename = f"{filename_base}.xlsm"
-    return StreamingResponse(
-        output,
-        media_type="application/vnd.ms-excel.sheet.macroEnabled.12",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+    return download_export(request, db, "xlsm", if_none_match)
 
 
 @router.post("/download/csv")
-def download_csv(request: ExportPreviewRequest, db: Session = Depends(get_db)):
+def download_csv(request: ExportPreviewRequest, db: Session = Depends(get_db), if_none_match: Optional[str] = Header(None)):
     """Download export as CSV file."""
-    header_rows, data_rows, filename_base = build_export_data(request, db)
-    
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    for header_row in header_rows:
-        writer.writerow([v or '' for v in header_row])
-    
-    for data_row in data_rows:
-        writer.writerow([v or '' for v in data_row])
-    
-    content = output.getvalue().encode('utf-8')
-    
-    filename = f"{filename_base}.csv"
-    return StreamingResponse(
-        iter([content]),
-        media_type="text/csv",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+    return download_export(request, db, "csv", if_none_match)
 
 
-IMAGE_FIELD_TO_NUMBER = {
-    'main_product_image_locator': '001',
-    'other_product_image_locator_1': '002',
-    'other_product_image_locator_2': '003',
-    'other_product_image_locator_3': '004',
-    'other_product_image_locator_4': '005',
-    'other_product_image_locator_5': '006',
-    'other_product_image_locator_6': '007',
-    'other_product_image_locator_7': '008',
-    'other_product_image_locator_8': '009',
-    'swatch_product_image_locator': '010',
-}
+@router.get("/cache/stats", response_model=ExportCacheStatsResponse)
+def get_export_cache_stats():
+    """Entry count, size and hit/miss/eviction counters of the export artifact cache."""
+    return export_cache.stats()
+
+
+EXPORT_FANOUT_WORKERS = min(4, os.cpu_count() or 1)
+
+_export_fanout_pool = None
 
-def normalize_for_url(name: str) -> str:
-    """Normalize a name for use in URL paths/filenames.
-    Removes spaces, special characters, and non-alphanumeric characters.
-    Example: "Fender USA" -> "FenderUSA", "Tone-Master" -> "ToneMaster"
+def get_export_fanout_pool() -> ProcessPoolExecutor:
+    """Worker processes for building group rows, started on first use and reused across requests."""
+    global _export_fanout_pool
+    if _export_fanout_pool is None:
+        # spawn, not fork: the server process has live threads and DB connections
+        _export_fanout_pool = ProcessPoolExecutor(
+            max_workers=EXPORT_FANOUT_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _export_fanout_pool
+
+def shutdown_export_fanout_pool():
+    """Stop the fan-out worker processes; registered on the app's shutdown event."""
+    global _export_fanout_pool
+    if _export_fanout_pool is not None:
+        _export_fanout_pool.shutdown(cancel_futures=True)
+        _export_fanout_pool = None
+
+def submit_group_exports(groups: List[ExportGroup], equipment_types: dict, listing_type: str, export_format: str) -> list:
+    """Queue one render_group_export per group, passing plain row data rather than ORM objects."""
+    global _export_fanout_pool
+    plain_equipment_types = {et.id: ExportEquipmentType(et.id, et.name) for et in equipment_types.values()}
+    tasks = [
+        (
+            group.product_type.header_rows or [],
+            list(model_row_slots(group.models)),
+            [export_field(field) for field in group.fields],
+            plain_equipment_types, listing_type, export_format
+        )
+        for group in groups
+    ]
+    try:
+        pool = get_export_fanout_pool()
+        return [pool.submit(render_group_export, *task) for task in tasks]
+    except BrokenProcessPool:
+        # A worker died in an earlier request; start a fresh pool
+        _export_fanout_pool = None
+        pool = get_export_fanout_pool()
+        return [pool.submit(render_group_export, *task) for task in tasks]
+
+def collect_group_exports(futures: list) -> List[tuple]:
+    """Wait for every group's (path, widths); if any group failed, remove the others' files and re-raise."""
+    rendered = []
+    error = None
+    for future in futures:
+        try:
+            rendered.append(future.result())
+        except Exception as e:
+            error = error or e
+    if error:
+        for path, _ in rendered:
+            os.remove(path)
+        raise error
+    return rendered
+
+@router.post("/download/multi")
+def download_multi(request: ExportMultiRequest, db: Session = Depends(get_db)):
+    """Export models spanning several equipment types in one request.
+    Models are grouped by their Amazon template and each group's rows are built
+    in parallel worker processes. Returns a ZIP with one file per template, or
+    one workbook with a sheet per template.
     """
-    if not name:
-        return ''
-    result = re.sub(r'[^a-zA-Z0-9]', '', name)
-    return result
-
-def substitute_placeholders(value: str, model: Model, series, manufacturer, equipment_type, is_image_url: bool = False) -> str:
-    result = value
-    mfr_name = manufacturer.name if manufacturer else ''
-    series_name = series.name if series else ''
-    model_name = model.name if model else ''
-    equip_type = equipment_type.name if equipment_type else ''
-    
-    if is_image_url:
-        mfr_name_norm = normalize_for_url(mfr_name)
-        series_name_norm = normalize_for_url(series_name)
-        model_name_norm = normalize_for_url(model_name)
-        
-        result = result.replace('[Manufacturer_Name]', mfr_name_norm)
-        result = result.replace('[Series_Name]', series_name_norm)
-        result = result.replace('[Model_Name]', model_name_norm)
-        result = result.replace('[MANUFACTURER_NAME]', mfr_name_norm)
-        result = result.replace('[SERIES_NAME]', series_name_norm)
-        result = result.replace('[MODEL_NAME]', model_name_norm)
-    else:
-        result = result.replace('[MANUFACTURER_NAME]', mfr_name)
-        result = result.replace('[SERIES_NAME]', series_name)
-        result = result.replace('[MODEL_NAME]', model_name)
-        result = result.replace('[Manufacturer_Name]', mfr_name)
-        result = result.replace('[Series_Name]', series_name)
-        result = result.replace('[Model_Name]', model_name)
+    if request.package not in ("zip", "workbook"):
+        raise HTTPException(status_code=400, detail=f"Unsupported package: {request.package}")
+    if request.format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {request.format}")
     
-    result = result.replace('[EQUIPMENT_TYPE]', equip_type)
-    result = result.replace('[Equipment_Type]', equip_type)
+    groups, equipment_types = load_export_groups(request, db)
+    date_str = datetime.now().strftime('%Y%m%d')
+    export_format = EXPORT_GROUP_SPOOL if request.package == "workbook" else request.format
+    rendered = collect_group_exports(submit_group_exports(groups, equipment_types, request.listing_type, export_format))
+    
+    if request.package == "workbook":
+        sheets = [
+            (group.product_type.code[:31], group.product_type.header_rows or [], read_spooled_rows(path), widths)
+            for group, (path, widths) in zip(groups, rendered)
+        ]
+        try:
+            path = write_workbook_file(sheets)
+        finally:
+            for spool_path, _ in rendered:
+                if os.path.exists(spool_path):
+                    os.remove(spool_path)
+        return FileResponse(
+            path,
+            media_type=EXPORT_MEDIA_TYPES["xlsx"],
+            filename=f"Amazon_Export_{date_str}.xlsx",
+            background=BackgroundTask(os.remove, path)
+        )
     
-    return result
+    fd, zip_path = tempfile.mkstemp(suffix=".zip", prefix="export_")
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for group, (path, _) in zip(groups, rendered):
+                name = f"{export_filename_base(group.models[0])}_{group.product_type.code}.{request.format}"
+                archive.write(path, arcname=name)
+    finally:
+        for path, _ in rendered:
+            os.remove(path)
+    
+    return FileResponse(
+        zip_path,
+        media_type="application/zip",
+        filename=f"Amazon_Export_{date_str}.zip",
+        background=BackgroundTask(os.remove, zip_path)
+    )
 
-def get_image_field_key(field_name: str) -> str | None:
-    """Extract the base image field key from a full Amazon field name.
-    Returns the key if it matches a known product image field, None otherwise.
-    """
-    for key in IMAGE_FIELD_TO_NUMBER.keys():
-        if field_name.startswith(key):
-            return key
-    return None
-
-def is_image_url_field(field_name: str) -> bool:
-    """Check if a field is a product image URL field that needs special processing."""
-    return get_image_field_key(field_name) is not None
-
-def get_field_value(field: ProductTypeField, model: Model, series, manufacturer, equipment_type=None, listing_type: str = "individual") -> str | None:
-    field_name_lower = field.field_name.lower()
-    is_image_field = is_image_url_field(field.field_name)
-    
-    if 'contribution_sku' in field_name_lower and listing_type == 'individual':
-        return model.parent_sku if model.parent_sku else None
+
+EXPORT_JOB_DIR = "./export_jobs"
+EXPORT_JOB_WORKERS = 2
+
+def remove_export_artifact(job: Job):
+    path = (job.result or {}).get("path")
+    if path and os.path.exists(path):
+        os.remove(path)
+
+export_jobs = JobRunner(max_workers=EXPORT_JOB_WORKERS, name="export-job", on_expire=remove_export_artifact)
+
+def run_export_job(job: Job, request: ExportJobRequest) -> dict:
+    """Build the export file for a background job into EXPORT_JOB_DIR."""
+    os.makedirs(EXPORT_JOB_DIR, exist_ok=True)
+    path = os.path.join(EXPORT_JOB_DIR, f"{job.id}.{request.format}")
+    
+    db = SessionLocal()
+    try:
+        header_rows, data_rows, column_widths, filename_base = build_export_data(
+            request, db, request.format, progress=job.set_progress
+        )
+        write_export_file(header_rows, data_rows, column_widths, request.format, path)
+    finally:
+        db.close()
     
-    # Only include custom_value or selected_value if field is marked as required
-    if field.required:
-        if field.custom_value:
-            return substitute_placeholders(field.custom_value, model, series, manufacturer, equipment_type, is_image_url=is_image_field)
-        
-        if field.selected_value:
-            return field.selected_value
-        
-        # Auto-generate values for common fields only if required
-        if 'item_name' in field_name_lower or 'product_name' in field_name_lower or 'title' in field_name_lower:
-            mfr_name = manufacturer.name if manufacturer else ''
-            series_name = series.name if series else ''
-            return f"{mfr_name} {series_name} {model.name} Cover"
-        
-        if 'brand' in field_name_lower or 'brand_name' in field_name_lower:
-            return manufacturer.name if manufacturer else None
-        
-        if 'model' in field_name_lower or 'model_number' in field_name_lower or 'model_name' in field_name_lower:
-            return model.name
-        
-        if 'manufacturer' in field_name_lower:
-            return manufacturer.name if manufacturer else None
+    return {"path": path, "filename": f"{filename_base}.{request.format}"}
+
+def export_job_response(job: Job) -> ExportJobResponse:
+    result = job.result or {}
+    return ExportJobResponse(
+        job_id=job.id,
+        status=job.status,
+        format=job.params["format"],
+        rows_done=job.progress_done,
+        total_rows=job.progress_total,
+        filename=result.get("filename"),
+        error=job.error,
+        download_url=f"/export/jobs/{job.id}/download" if job.status == "completed" else None
+    )
+
+@router.post("/jobs", response_model=ExportJobResponse, status_code=202)
+def create_export_job(request: ExportJobRequest):
+    """Queue an export to be built in the background; poll the returned job for progress."""
+    if request.format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {request.format}")
+    if not request.model_ids:
+        raise HTTPException(status_code=400, detail="No models selected")
     
-    return None
+    job = Job("export", params={"format": request.format})
+    job.set_progress(0, len(request.model_ids))
+    export_jobs.submit(job, run_export_job, request)
+    return export_job_response(job)
+
+@router.get("/jobs/{job_id}", response_model=ExportJobResponse)
+def get_export_job(job_id: str):
+    job = export_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return export_job_response(job)
+
+@router.get("/jobs/{job_id}/download")
+def download_export_job(job_id: str):
+    """Serve a finished export; supports HTTP Range requests so interrupted downloads can resume."""
+    job = export_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Export job is {job.status}")
+    
+    return FileResponse(
+        job.result["path"],
+        media_type=EXPORT_MEDIA_TYPES[job.params["format"]],
+        filename=job.result["filename"]
+    )
@@ -5,6 +5,8 @@ from typing import List
 from app.database import get_db
 from app.models.core import Manufacturer
 from app.schemas.core import ManufacturerCreate, ManufacturerResponse
+from app.services.catalog_version import catalog_version
+from app.services.sku_service import SkuService, is_parent_sku_conflict
 
 router = APIRouter(prefix="/manufacturers", tags=["manufacturers"])
 
@@ -24,6 +26,7 @@ def create_manufacturer(data: ManufacturerCreate, db: Session = Depends(get_db))
     try:
         manufacturer = Manufacturer(name=data.name)
         db.add(manufacturer)
+        catalog_version.bump(db)
         db.commit()
         db.refresh(manufacturer)
         return manufacturer
@@ -37,12 +40,19 @@ def update_manufacturer(id: int, data: ManufacturerCreate, db: Session = Depends
     if not manufacturer:
         raise HTTPException(status_code=404, detail="Manufacturer not found")
     try:
+        renamed = manufacturer.name != data.name
         manufacturer.name = data.name
+        if renamed:
+            # Models carry the manufacturer name in their parent SKU
+            SkuService(db).refresh_for_manufacturer(manufacturer.id)
+        catalog_version.bump(db)
         db.commit()
         db.refresh(manufacturer)
         return manufacturer
-    except IntegrityError:
+    except IntegrityError as e:
         db.rollback()
+        if is_parent_sku_conflict(e):
+            raise HTTPException(status_code=409, detail="Parent SKU was taken by concurrent changes; please retry")
         raise HTTPException(status_code=400, detail="Manufacturer with this name already exists")
 
 @router.delete("/{id}")
@@ -51,5 +61,6 @@ def delete_manufacturer(id: int, db: Session = Depends(get_db)):
     if not manufacturer:
         raise HTTPException(status_code=404, detail="Manufacturer not found")
     db.delete(manufacturer)
+    catalog_version.bump(db)
     db.commit()
     return {"message": "Manufacturer deleted"}
@@ -8,6 +8,7 @@ from app.schemas.core import (
     MaterialCreate, MaterialResponse,
     MaterialColourSurchargeCreate, MaterialColourSurchargeResponse
 )
+from app.services.pricing_cache import pricing_cache
 
 router = APIRouter(prefix="/materials", tags=["materials"])
 
@@ -67,6 +68,7 @@ def delete_material(id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Material not found")
     db.delete(material)
     db.commit()
+    pricing_cache.invalidate()
     return {"message": "Material deleted"}
 
 @router.get("/{id}/surcharges", response_model=List[MaterialColourSurchargeResponse])
@@ -82,5 +84,6 @@ def create_surcharge(data: MaterialColourSurchargeCreate, db: Session = Depends(
     )
     db.add(surcharge)
     db.commit()
+    pricing_cache.invalidate()
     db.refresh(surcharge)
     return surcharge
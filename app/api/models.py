@@ -1,61 +1,120 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import base64
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select, or_, and_
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List, Optional
-from app.database import get_db
+from typing import List, Literal, Optional
+from app.database import get_db, SessionLocal
 from app.models.core import Model, Series, Manufacturer
-from app.schemas.core import ModelCreate, ModelResponse
+from app.schemas.core import (
+    ModelCreate, ModelResponse, ModelListItem, SkuRegenerationResponse, SkuRegenerationJobResponse, SkuCollisionGroup
+)
+from app.services.catalog_version import catalog_version
+from app.services.sku_service import SkuService, is_parent_sku_conflict
+from app.services.jobs import Job, JobRunner
 
 router = APIRouter(prefix="/models", tags=["models"])
 
-def generate_parent_sku(manufacturer_name: str, series_name: str, model_name: str, version: str = "V1") -> str:
+# One sweep at a time; concurrent sweeps would only rewrite the same rows
+sku_regeneration_jobs = JobRunner(max_workers=1, name="sku-regeneration")
+
+# Parent SKU picks retried when a concurrent write claims the same SKU first
+SKU_ASSIGN_ATTEMPTS = 3
+
+MODEL_PAGE_MAX_SIZE = 1000
+MODEL_LIST_FIELDS = list(ModelListItem.model_fields)
+
+def encode_model_cursor(values: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+def decode_model_cursor(cursor: str) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or not values:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+@router.get("", response_model=List[ModelListItem], response_model_exclude_unset=True)
+def list_models(
+    response: Response,
+    series_id: Optional[int] = Query(None),
+    manufacturer_id: Optional[int] = Query(None),
+    equipment_type_id: Optional[int] = Query(None),
+    name_prefix: Optional[str] = Query(None),
+    sort: Literal["id", "-id", "name", "-name"] = Query("id"),
+    limit: Optional[int] = Query(None, ge=1, le=MODEL_PAGE_MAX_SIZE),
+    cursor: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return; id is always included"),
+    db: Session = Depends(get_db)
+):
     """
-    Generate a 40-character parent SKU.
-    Format: MFGR(8)-SERIES(8)-MODEL(13)V1 + zeros
-    Multi-word names are concatenated and camelCased.
+    Models, optionally filtered, sorted and paged.
+
+    Without limit every matching model is returned, as before. With limit,
+    pages are cut by keyset on (sort column, id) rather than OFFSET, and the
+    cursor for the next page is sent in the X-Next-Cursor header (absent on
+    the last page). fields= selects only the listed columns.
     """
-    def process_name(name: str, max_len: int, pad_char: str = "X") -> str:
-        # Split by spaces and camelCase each word
-        words = name.split()
-        if len(words) > 1:
-            # CamelCase: capitalize first letter of each word
-            result = "".join(word.capitalize() for word in words)
-        else:
-            result = name.capitalize()
-        
-        # Remove any non-alphanumeric characters
-        result = "".join(c for c in result if c.isalnum())
-        
-        # Truncate to max length
-        result = result[:max_len].upper()
-        
-        # Pad with pad_char if shorter than max_len
-        result = result.ljust(max_len, pad_char)
-        
-        return result
+    columns = MODEL_LIST_FIELDS
+    if fields:
+        requested = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = [name for name in requested if name not in MODEL_LIST_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        columns = ["id"] + [name for name in requested if name != "id"]
     
-    # Process each part
-    mfgr_part = process_name(manufacturer_name, 8)  # 8 chars
-    series_part = process_name(series_name, 8)      # 8 chars
-    model_part = process_name(model_name, 13)       # 13 chars
+    descending = sort.startswith("-")
+    sort_key = sort.lstrip("-")
+    keys = [Model.id] if sort_key == "id" else [getattr(Model, sort_key), Model.id]
+    selected = [getattr(Model, name) for name in columns]
+    selected += [key for key in keys if key.key not in columns]
     
-    # Ensure version is 2 chars
-    version_part = version[:2].upper()
+    stmt = select(*selected)
+    if manufacturer_id:
+        stmt = stmt.join(Series, Model.series_id == Series.id).where(Series.manufacturer_id == manufacturer_id)
+    if series_id:
+        stmt = stmt.where(Model.series_id == series_id)
+    if equipment_type_id:
+        stmt = stmt.where(Model.equipment_type_id == equipment_type_id)
+    if name_prefix:
+        pattern = name_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        stmt = stmt.where(Model.name.ilike(f"{pattern}%", escape="\\"))
     
-    # Build SKU: MFGR-SERIES-MODEL+VERSION (8+1+8+1+13+2 = 33)
-    sku = f"{mfgr_part}-{series_part}-{model_part}{version_part}"
+    if cursor is not None:
+        values = decode_model_cursor(cursor)
+        if len(values) != len(keys):
+            raise HTTPException(status_code=400, detail="Cursor does not match sort")
+        # (k1, k2) > (v1, v2) spelled out: k1 > v1 OR (k1 = v1 AND k2 > v2)
+        after = None
+        for key, value in reversed(list(zip(keys, values))):
+            beyond = key < value if descending else key > value
+            after = beyond if after is None else or_(beyond, and_(key == value, after))
+        stmt = stmt.where(after)
     
-    # Pad with zeros to reach 40 characters
-    sku = sku.ljust(40, "0")
+    stmt = stmt.order_by(*[key.desc() if descending else key for key in keys])
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
     
-    return sku
+    rows = db.execute(stmt).mappings().all()
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_model_cursor([rows[-1][key.key] for key in keys])
+    return [{name: row[name] for name in columns} for row in rows]
 
-@router.get("", response_model=List[ModelResponse])
-def list_models(series_id: Optional[int] = Query(None), db: Session = Depends(get_db)):
-    query = db.query(Model)
-    if series_id:
-        query = query.filter(Model.series_id == series_id)
-    return query.all()
+@router.get("/by-sku/{sku}", response_model=ModelResponse)
+def get_model_by_sku(sku: str, db: Session = Depends(get_db)):
+    model = db.query(Model).filter(Model.parent_sku == sku.upper()).first()
+    if not model:
+        raise HTTPException(status_code=404, detail="Model not found")
+    return model
+
+@router.get("/sku-collisions", response_model=List[SkuCollisionGroup])
+def list_sku_collisions(limit: Optional[int] = Query(None, ge=1), db: Session = Depends(get_db)):
+    """Models whose names truncate to the same SKU and so differ only by version suffix."""
+    return SkuService(db).find_collisions(limit=limit)
 
 @router.get("/{id}", response_model=ModelResponse)
 def get_model(id: int, db: Session = Depends(get_db)):
@@ -64,77 +123,63 @@ def get_model(id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Model not found")
     return model
 
+def save_model(db: Session, model: Model, data: ModelCreate) -> Model:
+    """
+    Copy data onto model, assign its parent SKU and commit; shared by create and update.
+
+    The SKU version is picked from committed rows, so a concurrent write can
+    claim the same SKU before this commit. The unique parent_sku index then
+    rejects it and the SKU is picked again against the rows that won, up to
+    SKU_ASSIGN_ATTEMPTS times.
+    """
+    for _ in range(SKU_ASSIGN_ATTEMPTS):
+        try:
+            # Get series and manufacturer names for SKU generation
+            series = db.query(Series).filter(Series.id == data.series_id).first()
+            if not series:
+                raise HTTPException(status_code=400, detail="Series not found")
+            manufacturer = db.query(Manufacturer).filter(Manufacturer.id == series.manufacturer_id).first()
+            if not manufacturer:
+                raise HTTPException(status_code=400, detail="Manufacturer not found")
+            
+            # Versioned past any model it collides with; an unchanged model keeps its SKU
+            parent_sku = SkuService(db).assign_parent_sku(
+                manufacturer.name, series.name, data.name, model_id=model.id, current_sku=model.parent_sku
+            )
+            
+            model.name = data.name
+            model.series_id = data.series_id
+            model.equipment_type_id = data.equipment_type_id
+            model.width = data.width
+            model.depth = data.depth
+            model.height = data.height
+            model.handle_length = data.handle_length
+            model.handle_width = data.handle_width
+            model.handle_location = data.handle_location
+            model.angle_type = data.angle_type
+            model.image_url = data.image_url
+            model.parent_sku = parent_sku
+            db.add(model)
+            catalog_version.bump(db)
+            db.commit()
+            db.refresh(model)
+            return model
+        except IntegrityError as e:
+            db.rollback()
+            if not is_parent_sku_conflict(e):
+                raise HTTPException(status_code=400, detail="Model with this name already exists in this series")
+    raise HTTPException(status_code=409, detail="Parent SKU was taken by concurrent changes; please retry")
+
 @router.post("", response_model=ModelResponse)
 def create_model(data: ModelCreate, db: Session = Depends(get_db)):
-    try:
-        # Get series and manufacturer names for SKU generation
-        series = db.query(Series).filter(Series.id == data.series_id).first()
-        if not series:
-            raise HTTPException(status_code=400, detail="Series not found")
-        manufacturer = db.query(Manufacturer).filter(Manufacturer.id == series.manufacturer_id).first()
-        if not manufacturer:
-            raise HTTPException(status_code=400, detail="Manufacturer not found")
-        
-        # Generate parent SKU
-        parent_sku = generate_parent_sku(manufacturer.name, series.name, data.name)
-        
-        model = Model(
-            name=data.name,
-            series_id=data.series_id,
-            equipment_type_id=data.equipment_type_id,
-            width=data.width,
-            depth=data.depth,
-            height=data.height,
-            handle_length=data.handle_length,
-            handle_width=data.handle_width,
-            handle_location=data.handle_location,
-            angle_type=data.angle_type,
-            image_url=data.image_url,
-            parent_sku=parent_sku
-        )
-        db.add(model)
-        db.commit()
-        db.refresh(model)
-        return model
-    except IntegrityError:
-        db.rollback()
-        raise HTTPException(status_code=400, detail="Model with this name already exists in this series")
+    return save_model(db, Model(), data)
 
 @router.put("/{id}", response_model=ModelResponse)
 def update_model(id: int, data: ModelCreate, db: Session = Depends(get_db)):
     model = db.query(Model).filter(Model.id == id).first()
     if not model:
         raise HTTPException(status_code=404, detail="Model not found")
-    try:
-        # Get series and manufacturer names for SKU regeneration
-        series = db.query(Series).filter(Series.id == data.series_id).first()
-        if not series:
-            raise HTTPException(status_code=400, detail="Series not found")
-        manufacturer = db.query(Manufacturer).filter(Manufacturer.id == series.manufacturer_id).first()
-        if not manufacturer:
-            raise HTTPException(status_code=400, detail="Manufacturer not found")
-        
-        # Regenerate parent SKU if name, series, or manufacturer changed
-        parent_sku = generate_parent_sku(manufacturer.name, series.name, data.name)
-        
-        model.name = data.name
-        model.series_id = data.series_id
-        model.equipment_type_id = data.equipment_type_id
-        model.width = data.width
-        model.depth = data.depth
-        model.height = data.height
-        model.handle_length = data.handle_length
-        model.handle_width = data.handle_width
-        model.handle_location = data.handle_location
-        model.angle_type = data.angle_type
-        model.image_url = data.image_url
-        model.parent_sku = parent_sku
-        db.commit()
-        db.refresh(model)
-        return model
-    except IntegrityError:
-        db.rollback()
-        raise HTTPException(status_code=400, detail="Model with this name already exists in this series")
+    return save_model(db, model, data)
 
 @router.delete("/{id}")
 def delete_model(id: int, db: Session = Depends(get_db)):
@@ -142,27 +187,45 @@ def delete_model(id: int, db: Session = Depends(get_db)):
     if not model:
         raise HTTPException(status_code=404, detail="Model not found")
     db.delete(model)
+    catalog_version.bump(db)
     db.commit()
     return {"message": "Model deleted"}
 
-@router.post("/regenerate-skus")
+def sku_regeneration_response(result: dict) -> SkuRegenerationResponse:
+    return SkuRegenerationResponse(message=f"Regenerated SKUs for {result['updated']} models", **result)
+
+@router.post("/regenerate-skus", response_model=SkuRegenerationResponse)
 def regenerate_all_skus(db: Session = Depends(get_db)):
-    """Regenerate parent SKUs for all models that don't have one."""
-    models = db.query(Model).all()
-    updated_count = 0
-    
-    for model in models:
-        series = db.query(Series).filter(Series.id == model.series_id).first()
-        if not series:
-            continue
-        manufacturer = db.query(Manufacturer).filter(Manufacturer.id == series.manufacturer_id).first()
-        if not manufacturer:
-            continue
-        
-        parent_sku = generate_parent_sku(manufacturer.name, series.name, model.name)
-        if model.parent_sku != parent_sku:
-            model.parent_sku = parent_sku
-            updated_count += 1
-    
-    db.commit()
-    return {"message": f"Regenerated SKUs for {updated_count} models"}
+    """Recompute parent SKUs for all models and store the ones that changed."""
+    result = SkuService(db).regenerate_all()
+    return sku_regeneration_response(result)
+
+def run_sku_regeneration_job(job: Job) -> dict:
+    db = SessionLocal()
+    try:
+        return SkuService(db).regenerate_all(progress=job.set_progress)
+    finally:
+        db.close()
+
+def sku_regeneration_job_response(job: Job) -> SkuRegenerationJobResponse:
+    return SkuRegenerationJobResponse(
+        job_id=job.id,
+        status=job.status,
+        skus_written=job.progress_done,
+        skus_to_write=job.progress_total,
+        result=sku_regeneration_response(job.result) if job.result else None,
+        error=job.error
+    )
+
+@router.post("/regenerate-skus/jobs", response_model=SkuRegenerationJobResponse, status_code=202)
+def create_sku_regeneration_job():
+    """Run the SKU regeneration in the background; poll the returned job for progress."""
+    job = sku_regeneration_jobs.submit(Job("sku-regeneration"), run_sku_regeneration_job)
+    return sku_regeneration_job_response(job)
+
+@router.get("/regenerate-skus/jobs/{job_id}", response_model=SkuRegenerationJobResponse)
+def get_sku_regeneration_job(job_id: str):
+    job = sku_regeneration_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return sku_regeneration_job_response(job)
@@ -1,15 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional
 from app.database import get_db
 from app.models.core import PricingOption, ShippingRate, EquipmentType, EquipmentTypePricingOption
+from app.models.enums import Carrier
 from app.schemas.core import (
     PricingOptionCreate, PricingOptionResponse,
     ShippingRateCreate, ShippingRateResponse,
-    PricingCalculateRequest, PricingCalculateResponse
+    PricingCalculateRequest, PricingCalculateResponse,
+    PricingBatchRequest, PricingBatchResponse, PriceMatrixResponse,
+    PricingCacheStatsResponse, ShippingRateLookupRequest, ShippingRateLookupResponse
 )
 from app.services.pricing_service import PricingService
+from app.services.price_matrix import PriceMatrixService
+from app.services.pricing_cache import pricing_cache
 
 router = APIRouter(prefix="/pricing", tags=["pricing"])
 
@@ -32,6 +37,39 @@ def calculate_pricing(data: PricingCalculateRequest, db: Session = Depends(get_d
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/calculate-batch", response_model=PricingBatchResponse)
+def calculate_pricing_batch(data: PricingBatchRequest, db: Session = Depends(get_db)):
+    """Price many model/material combinations in one call, returning results in request order."""
+    service = PricingService(db)
+    items = [item.model_dump() for item in data.items]
+    return {"results": service.calculate_batch(items)}
+
+@router.get("/matrix", response_model=PriceMatrixResponse)
+def get_price_matrix(
+    equipment_type_id: Optional[int] = Query(None),
+    series_id: Optional[int] = Query(None),
+    material_ids: Optional[List[int]] = Query(None),
+    carrier: Carrier = Query(Carrier.USPS),
+    zone: str = Query("1"),
+    quantity: int = Query(1, ge=1),
+    db: Session = Depends(get_db)
+):
+    """Price every model in every material as a columnar (row-major) matrix."""
+    service = PriceMatrixService(db)
+    return service.build(
+        equipment_type_id=equipment_type_id,
+        series_id=series_id,
+        material_ids=material_ids,
+        carrier=carrier,
+        zone=zone,
+        quantity=quantity
+    )
+
+@router.get("/cache/stats", response_model=PricingCacheStatsResponse)
+def get_pricing_cache_stats():
+    """Hit/miss counters and age of the in-memory pricing reference snapshot."""
+    return pricing_cache.stats()
+
 @router.get("/options", response_model=List[PricingOptionResponse])
 def list_pricing_options(db: Session = Depends(get_db)):
     return db.query(PricingOption).all()
@@ -49,6 +87,7 @@ def create_pricing_option(data: PricingOptionCreate, db: Session = Depends(get_d
         option = PricingOption(name=data.name, price=data.price)
         db.add(option)
         db.commit()
+        pricing_cache.invalidate()
         db.refresh(option)
         return option
     except IntegrityError:
@@ -64,6 +103,7 @@ def update_pricing_option(id: int, data: PricingOptionCreate, db: Session = Depe
         option.name = data.name
         option.price = data.price
         db.commit()
+        pricing_cache.invalidate()
         db.refresh(option)
         return option
     except IntegrityError:
@@ -77,6 +117,7 @@ def delete_pricing_option(id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Pricing option not found")
     db.delete(option)
     db.commit()
+    pricing_cache.invalidate()
     return {"message": "Pricing option deleted"}
 
 @router.get("/options/by-equipment-type/{equipment_type_id}", response_model=List[PricingOptionResponse])
@@ -112,5 +153,12 @@ def create_shipping_rate(data: ShippingRateCreate, db: Session = Depends(get_db)
     )
     db.add(rate)
     db.commit()
+    pricing_cache.invalidate()
     db.refresh(rate)
     return rate
+
+@router.post("/shipping-rates/lookup", response_model=ShippingRateLookupResponse)
+def lookup_shipping_rates(data: ShippingRateLookupRequest, db: Session = Depends(get_db)):
+    """Look up the shipping cost for many weights at once in one carrier/zone."""
+    shipping_index = pricing_cache.get(db).shipping_index(data.carrier, data.zone)
+    return {"rates": shipping_index.lookup_many(data.weights).tolist()}
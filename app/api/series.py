@@ -5,6 +5,8 @@ from typing import List, Optional
 from app.database import get_db
 from app.models.core import Series
 from app.schemas.core import SeriesCreate, SeriesResponse
+from app.services.catalog_version import catalog_version
+from app.services.sku_service import SkuService, is_parent_sku_conflict
 
 router = APIRouter(prefix="/series", tags=["series"])
 
@@ -27,6 +29,7 @@ def create_series(data: SeriesCreate, db: Session = Depends(get_db)):
     try:
         series = Series(name=data.name, manufacturer_id=data.manufacturer_id)
         db.add(series)
+        catalog_version.bump(db)
         db.commit()
         db.refresh(series)
         return series
@@ -40,13 +43,20 @@ def update_series(id: int, data: SeriesCreate, db: Session = Depends(get_db)):
     if not series:
         raise HTTPException(status_code=404, detail="Series not found")
     try:
+        sku_inputs_changed = series.name != data.name or series.manufacturer_id != data.manufacturer_id
         series.name = data.name
         series.manufacturer_id = data.manufacturer_id
+        if sku_inputs_changed:
+            # Models carry the series and manufacturer names in their parent SKU
+            SkuService(db).refresh_for_series(series.id)
+        catalog_version.bump(db)
         db.commit()
         db.refresh(series)
         return series
-    except IntegrityError:
+    except IntegrityError as e:
         db.rollback()
+        if is_parent_sku_conflict(e):
+            raise HTTPException(status_code=409, detail="Parent SKU was taken by concurrent changes; please retry")
         raise HTTPException(status_code=400, detail="Series with this name already exists for this manufacturer")
 
 @router.delete("/{id}")
@@ -55,5 +65,6 @@ def delete_series(id: int, db: Session = Depends(get_db)):
     if not series:
         raise HTTPException(status_code=404, detail="Series not found")
     db.delete(series)
+    catalog_version.bump(db)
     db.commit()
     return {"message": "Series deleted"}
@@ -1,31 +1,239 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+import io
+import os
+import re
+import zipfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import select, func, or_, and_
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Literal, Optional, Union
+from app.database import get_db, SessionLocal
 from app.models.core import EquipmentType
-from app.models.templates import AmazonProductType, ProductTypeField, EquipmentTypeProductType, ProductTypeFieldValue
+from app.models.templates import (
+    AmazonProductType, ProductTypeField, EquipmentTypeProductType, ProductTypeFieldValue, ProductTypeKeyword
+)
 from app.schemas.templates import (
-    AmazonProductTypeResponse, ProductTypeFieldResponse, TemplateImportResponse,
+    AmazonProductTypeResponse, AmazonProductTypeSummaryResponse,
+    ProductTypeFieldResponse, ProductTypeFieldSummaryResponse, TemplateImportResponse, TemplateImportJobResponse,
+    TemplateBatchImportResponse, TemplateBatchImportItem,
     EquipmentTypeProductTypeLinkCreate, EquipmentTypeProductTypeLinkResponse,
-    ProductTypeFieldUpdate, ProductTypeFieldValueCreate, ProductTypeFieldValueResponse
+    ProductTypeFieldUpdate, ProductTypeFieldValueCreate, ProductTypeFieldValueResponse,
+    ProductTypeFieldBulkUpdate, ProductTypeFieldBulkUpdateResponse
 )
-from app.services.template_service import TemplateService
+from app.services.template_service import TemplateService, parse_amazon_template
+from app.services.jobs import Job, JobRunner
+from app.services.prefix_range import prefix_range
 
 router = APIRouter(prefix="/templates", tags=["templates"])
 
+# TemplateService writes one import at a time, so more job workers would only wait on it
+TEMPLATE_IMPORT_WORKERS = 1
+
+TEMPLATE_FIELDS_PAGE_SIZE = 100
+TEMPLATE_FIELDS_MAX_PAGE_SIZE = 1000
+
+FIELD_VALUE_SEARCH_LIMIT = 50
+FIELD_VALUE_SEARCH_MAX_LIMIT = 500
+
+template_import_jobs = JobRunner(max_workers=TEMPLATE_IMPORT_WORKERS, name="template-import")
+
 @router.post("/import", response_model=TemplateImportResponse)
-async def import_template(
+def import_template(
     file: UploadFile = File(...),
     product_code: str = Form(...),
     db: Session = Depends(get_db)
 ):
+    # A sync endpoint runs in the threadpool, so parsing and writes stay off the event loop
     service = TemplateService(db)
-    result = await service.import_amazon_template(file, product_code)
+    try:
+        result = service.import_amazon_template(file.file.read(), product_code)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return result
 
-@router.get("", response_model=List[AmazonProductTypeResponse])
-def list_product_types(db: Session = Depends(get_db)):
-    return db.query(AmazonProductType).all()
+def run_template_import_job(job: Job, contents: bytes, product_code: str) -> dict:
+    db = SessionLocal()
+    try:
+        return TemplateService(db).import_amazon_template(contents, product_code)
+    finally:
+        db.close()
+
+def template_import_job_response(job: Job) -> TemplateImportJobResponse:
+    return TemplateImportJobResponse(
+        job_id=job.id,
+        status=job.status,
+        product_code=job.params["product_code"],
+        result=job.result,
+        error=job.error
+    )
+
+@router.post("/import-jobs", response_model=TemplateImportJobResponse, status_code=202)
+def create_template_import_job(
+    file: UploadFile = File(...),
+    product_code: str = Form(...)
+):
+    """Queue a template import and return at once; poll the returned job for its counts."""
+    job = Job("template_import", params={"product_code": product_code, "filename": file.filename})
+    template_import_jobs.submit(job, run_template_import_job, file.file.read(), product_code)
+    return template_import_job_response(job)
+
+@router.get("/import-jobs/{job_id}", response_model=TemplateImportJobResponse)
+def get_template_import_job(job_id: str):
+    job = template_import_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return template_import_job_response(job)
+
+TEMPLATE_PARSE_WORKERS = os.cpu_count() or 1
+TEMPLATE_WORKBOOK_EXTENSIONS = (".xlsx", ".xlsm")
+
+_template_parse_pool = None
+
+def get_template_parse_pool() -> ProcessPoolExecutor:
+    """Worker processes for parsing, started on first use and reused across requests."""
+    global _template_parse_pool
+    if _template_parse_pool is None:
+        # spawn, not fork: the server process has live threads and DB connections
+        _template_parse_pool = ProcessPoolExecutor(
+            max_workers=TEMPLATE_PARSE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _template_parse_pool
+
+def submit_template_parses(workbooks: List[tuple]) -> list:
+    global _template_parse_pool
+    try:
+        pool = get_template_parse_pool()
+        return [pool.submit(parse_amazon_template, contents) for _, contents in workbooks]
+    except BrokenProcessPool:
+        # A worker died in an earlier batch; start a fresh pool
+        _template_parse_pool = None
+        pool = get_template_parse_pool()
+        return [pool.submit(parse_amazon_template, contents) for _, contents in workbooks]
+
+def product_code_from_filename(filename: str) -> str:
+    """CARRIER_BAG_CASE(ALLKEYWORDS)_1766004879652.xlsx -> CARRIER_BAG_CASE"""
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    match = re.match(r"[A-Za-z0-9_]+", stem)
+    return match.group(0).strip("_").upper() if match else ""
+
+def expand_template_uploads(files: List[UploadFile]) -> List[tuple]:
+    """(filename, contents) for every uploaded workbook, with ZIP uploads unpacked in name order."""
+    workbooks = []
+    for upload in files:
+        contents = upload.file.read()
+        filename = upload.filename or ""
+        if not filename.lower().endswith(".zip"):
+            workbooks.append((filename, contents))
+            continue
+        try:
+            with zipfile.ZipFile(io.BytesIO(contents)) as archive:
+                for member in sorted(archive.namelist()):
+                    name = os.path.basename(member)
+                    if name.lower().endswith(TEMPLATE_WORKBOOK_EXTENSIONS) and not member.startswith("__MACOSX/"):
+                        workbooks.append((name, archive.read(member)))
+        except zipfile.BadZipFile:
+            raise HTTPException(status_code=400, detail=f"{filename} is not a valid ZIP archive")
+    return workbooks
+
+@router.post("/import-batch", response_model=TemplateBatchImportResponse)
+def import_template_batch(
+    files: List[UploadFile] = File(...),
+    product_codes: List[str] = Form([]),
+    db: Session = Depends(get_db)
+):
+    """
+    Import several templates at once, from workbooks and/or ZIPs of workbooks.
+
+    product_codes pairs with the workbooks in upload order (ZIP members in name
+    order); when omitted, each code is taken from the workbook's file name.
+    Workbooks are parsed in parallel worker processes, then each product type
+    is written in its own transaction, so one bad file doesn't stop the rest.
+    """
+    workbooks = expand_template_uploads(files)
+    if not workbooks:
+        raise HTTPException(status_code=400, detail="No workbooks found in upload")
+    if product_codes and len(product_codes) != len(workbooks):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Got {len(product_codes)} product codes for {len(workbooks)} workbooks"
+        )
+    codes = product_codes or [product_code_from_filename(filename) for filename, _ in workbooks]
+    
+    futures = submit_template_parses(workbooks)
+    
+    service = TemplateService(db)
+    results = []
+    for (filename, _), product_code, future in zip(workbooks, codes, futures):
+        result = None
+        error = None
+        try:
+            if not product_code:
+                raise ValueError("Could not derive a product code from the file name")
+            result = service.import_parsed_template(future.result(), product_code)
+        except Exception as e:
+            error = str(e)
+        results.append(TemplateBatchImportItem(
+            filename=filename,
+            product_code=product_code,
+            status="failed" if error else "imported",
+            result=result,
+            error=error
+        ))
+    
+    imported = sum(1 for item in results if item.status == "imported")
+    return TemplateBatchImportResponse(imported=imported, failed=len(results) - imported, results=results)
+
+def model_response(model: type[BaseModel], content, headers: Optional[dict] = None) -> JSONResponse:
+    """Serialize content (one object or a list) with the model the route picked.
+    The summary and full field schemas validate as each other, so routes whose
+    response_model is a Union of the two return this rather than letting
+    FastAPI choose a member.
+    """
+    if isinstance(content, list):
+        data = [model.model_validate(item).model_dump(mode="json") for item in content]
+    else:
+        data = model.model_validate(content).model_dump(mode="json")
+    return JSONResponse(data, headers=headers)
+
+def product_type_full_query(db: Session):
+    """Product types with keywords, fields and valid values loaded in three extra queries total."""
+    return db.query(AmazonProductType).options(
+        selectinload(AmazonProductType.keywords),
+        selectinload(AmazonProductType.fields).selectinload(ProductTypeField.valid_values)
+    )
+
+@router.get("", response_model=Union[List[AmazonProductTypeSummaryResponse], List[AmazonProductTypeResponse]])
+def list_product_types(
+    mode: Literal["full", "summary"] = Query("full"),
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    """
+    mode=summary returns one row per product type with field and keyword
+    counts instead of the nested fields, in a single query. mode=full keeps
+    the nested payload, loaded eagerly rather than per field.
+    """
+    if mode == "summary":
+        field_count = select(func.count(ProductTypeField.id)).where(
+            ProductTypeField.product_type_id == AmazonProductType.id
+        ).scalar_subquery()
+        keyword_count = select(func.count(ProductTypeKeyword.id)).where(
+            ProductTypeKeyword.product_type_id == AmazonProductType.id
+        ).scalar_subquery()
+        stmt = select(
+            AmazonProductType.id, AmazonProductType.code, AmazonProductType.name, AmazonProductType.description,
+            field_count.label("field_count"), keyword_count.label("keyword_count")
+        ).order_by(AmazonProductType.id).offset(offset).limit(limit)
+        return model_response(AmazonProductTypeSummaryResponse, [dict(row) for row in db.execute(stmt).mappings()])
+    
+    product_types = product_type_full_query(db).order_by(AmazonProductType.id).offset(offset).limit(limit).all()
+    return model_response(AmazonProductTypeResponse, product_types)
 
 @router.post("/equipment-type-links", response_model=EquipmentTypeProductTypeLinkResponse)
 def link_equipment_type_to_product_type(
@@ -67,7 +275,7 @@ def get_product_type_for_equipment_type(equipment_type_id: int, db: Session = De
     ).first()
     if not link:
         return None
-    return db.query(AmazonProductType).filter(AmazonProductType.id == link.product_type_id).first()
+    return product_type_full_query(db).filter(AmazonProductType.id == link.product_type_id).first()
 
 @router.delete("/equipment-type-links/{link_id}")
 def delete_equipment_type_link(link_id: int, db: Session = Depends(get_db)):
@@ -80,23 +288,62 @@ def delete_equipment_type_link(link_id: int, db: Session = Depends(get_db)):
 
 @router.get("/{product_code}", response_model=AmazonProductTypeResponse)
 def get_product_type(product_code: str, db: Session = Depends(get_db)):
-    product_type = db.query(AmazonProductType).filter(
+    product_type = product_type_full_query(db).filter(
         AmazonProductType.code == product_code
     ).first()
     if not product_type:
         raise HTTPException(status_code=404, detail="Product type not found")
     return product_type
 
-@router.get("/{product_code}/fields", response_model=List[ProductTypeFieldResponse])
-def get_product_type_fields(product_code: str, db: Session = Depends(get_db)):
-    product_type = db.query(AmazonProductType).filter(
-        AmazonProductType.code == product_code
-    ).first()
-    if not product_type:
+def parse_field_cursor(cursor: str) -> tuple:
+    try:
+        order_index, field_id = cursor.split(":")
+        return int(order_index), int(field_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+@router.get("/{product_code}/fields", response_model=Union[List[ProductTypeFieldSummaryResponse], List[ProductTypeFieldResponse]])
+def get_product_type_fields(
+    product_code: str,
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=TEMPLATE_FIELDS_MAX_PAGE_SIZE),
+    include_values: bool = Query(True),
+    db: Session = Depends(get_db)
+):
+    """
+    Fields in (order_index, id) order. Without limit or cursor every field is
+    returned as before; otherwise pages are cut by keyset and the cursor for
+    the next page is sent in the X-Next-Cursor header (absent on the last page).
+    """
+    product_type_id = db.execute(
+        select(AmazonProductType.id).where(AmazonProductType.code == product_code)
+    ).scalar()
+    if product_type_id is None:
         raise HTTPException(status_code=404, detail="Product type not found")
-    return db.query(ProductTypeField).filter(
-        ProductTypeField.product_type_id == product_type.id
-    ).order_by(ProductTypeField.order_index).all()
+    
+    query = db.query(ProductTypeField).filter(
+        ProductTypeField.product_type_id == product_type_id
+    ).order_by(ProductTypeField.order_index, ProductTypeField.id)
+    if cursor is not None:
+        after_order_index, after_id = parse_field_cursor(cursor)
+        query = query.filter(or_(
+            ProductTypeField.order_index > after_order_index,
+            and_(ProductTypeField.order_index == after_order_index, ProductTypeField.id > after_id)
+        ))
+    if cursor is not None or limit is not None:
+        limit = limit or TEMPLATE_FIELDS_PAGE_SIZE
+        query = query.limit(limit + 1)
+    if include_values:
+        query = query.options(selectinload(ProductTypeField.valid_values))
+    
+    fields = query.all()
+    headers = {}
+    if limit is not None and len(fields) > limit:
+        fields = fields[:limit]
+        headers["X-Next-Cursor"] = f"{fields[-1].order_index}:{fields[-1].id}"
+    
+    model = ProductTypeFieldResponse if include_values else ProductTypeFieldSummaryResponse
+    return model_response(model, fields, headers)
 
 @router.get("/{product_code}/header-rows")
 def get_header_rows(product_code: str, db: Session = Depends(get_db)):
@@ -118,12 +365,19 @@ def delete_product_type(product_code: str, db: Session = Depends(get_db)):
     db.commit()
     return {"message": "Product type deleted"}
 
-@router.get("/fields/{field_id}", response_model=ProductTypeFieldResponse)
-def get_field(field_id: int, db: Session = Depends(get_db)):
+@router.patch("/fields", response_model=ProductTypeFieldBulkUpdateResponse)
+def update_fields(bulk: ProductTypeFieldBulkUpdate, db: Session = Depends(get_db)):
+    service = TemplateService(db)
+    results = service.update_fields(bulk.updates)
+    updated = sum(1 for result in results if result["status"] == "updated")
+    return ProductTypeFieldBulkUpdateResponse(updated=updated, failed=len(results) - updated, results=results)
+
+@router.get("/fields/{field_id}", response_model=Union[ProductTypeFieldSummaryResponse, ProductTypeFieldResponse])
+def get_field(field_id: int, include_values: bool = Query(True), db: Session = Depends(get_db)):
     field = db.query(ProductTypeField).filter(ProductTypeField.id == field_id).first()
     if not field:
         raise HTTPException(status_code=404, detail="Field not found")
-    return field
+    return model_response(ProductTypeFieldResponse if include_values else ProductTypeFieldSummaryResponse, field)
 
 @router.patch("/fields/{field_id}", response_model=ProductTypeFieldResponse)
 def update_field(field_id: int, update: ProductTypeFieldUpdate, db: Session = Depends(get_db)):
@@ -140,6 +394,34 @@ def update_field(field_id: int, update: ProductTypeFieldUpdate, db: Session = De
     db.refresh(field)
     return field
 
+@router.get("/fields/{field_id}/values", response_model=List[ProductTypeFieldValueResponse])
+def search_field_values(
+    field_id: int,
+    q: str = Query(""),
+    mode: Literal["prefix", "contains"] = Query("contains"),
+    limit: int = Query(FIELD_VALUE_SEARCH_LIMIT, ge=1, le=FIELD_VALUE_SEARCH_MAX_LIMIT),
+    db: Session = Depends(get_db)
+):
+    """
+    Valid values of one field matching q, in value order.
+
+    Both modes read the (product_type_field_id, value) index. prefix is a
+    case-sensitive range seek on it; contains is a case-insensitive match
+    scanned over that field's index entries only.
+    """
+    if db.get(ProductTypeField, field_id) is None:
+        raise HTTPException(status_code=404, detail="Field not found")
+    
+    stmt = select(ProductTypeFieldValue).where(ProductTypeFieldValue.product_type_field_id == field_id)
+    if q and mode == "prefix":
+        stmt = stmt.where(*prefix_range(ProductTypeFieldValue.value, q))
+    elif q:
+        pattern = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        stmt = stmt.where(ProductTypeFieldValue.value.ilike(f"%{pattern}%", escape="\\"))
+    
+    stmt = stmt.order_by(ProductTypeFieldValue.value, ProductTypeFieldValue.id).limit(limit)
+    return db.execute(stmt).scalars().all()
+
 @router.post("/fields/{field_id}/values", response_model=ProductTypeFieldValueResponse)
 def add_field_value(field_id: int, value: ProductTypeFieldValueCreate, db: Session = Depends(get_db)):
     field = db.query(ProductTypeField).filter(ProductTypeField.id == field_id).first()
@@ -4,7 +4,7 @@ from app.database import engine, Base
 from app.api import (
     manufacturers, series, equipment_types, models,
     materials, suppliers, customers, orders,
-    pricing, templates, enums, export, design_options
+    pricing, templates, enums, export, design_options, catalog
 )
 
 Base.metadata.create_all(bind=engine)
@@ -21,6 +21,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 app.include_router(manufacturers.router)
@@ -36,6 +37,11 @@ app.include_router(templates.router)
 app.include_router(enums.router)
 app.include_router(export.router)
 app.include_router(design_options.router)
+app.include_router(catalog.router)
+
+@app.on_event("shutdown")
+def shutdown_export_workers():
+    export.shutdown_export_fanout_pool()
 
 @app.get("/health")
 def health_check():
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, DateTime, Enum, UniqueConstraint
+from sqlalchemy import DDL, event, Column, Integer, String, Float, Boolean, ForeignKey, DateTime, Enum, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -24,6 +24,18 @@ class Series(Base):
     
     __table_args__ = (UniqueConstraint('manufacturer_id', 'name', name='uq_series_manufacturer_name'),)
 
+class CatalogState(Base):
+    """Single row holding the catalog change counter (see services/catalog_version.py)."""
+    __tablename__ = "catalog_state"
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+event.listen(
+    CatalogState.__table__, "after_create",
+    DDL("INSERT INTO catalog_state (id, version) VALUES (1, 0)")
+)
+
 class EquipmentType(Base):
     __tablename__ = "equipment_types"
     
@@ -40,8 +52,8 @@ class Model(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
-    series_id = Column(Integer, ForeignKey("series.id"), nullable=False)
-    equipment_type_id = Column(Integer, ForeignKey("equipment_types.id"), nullable=False)
+    series_id = Column(Integer, ForeignKey("series.id"), nullable=False, index=True)
+    equipment_type_id = Column(Integer, ForeignKey("equipment_types.id"), nullable=False, index=True)
     width = Column(Float, nullable=False)
     depth = Column(Float, nullable=False)
     height = Column(Float, nullable=False)
@@ -50,7 +62,7 @@ class Model(Base):
     handle_location = Column(Enum(HandleLocation), default=HandleLocation.NO_AMP_HANDLE)
     angle_type = Column(Enum(AngleType), default=AngleType.TOP_ANGLE)
     image_url = Column(String, nullable=True)
-    parent_sku = Column(String(40), nullable=True)
+    parent_sku = Column(String(40), nullable=True, unique=True, index=True)
     
     series = relationship("Series", back_populates="models")
     equipment_type = relationship("EquipmentType", back_populates="models")
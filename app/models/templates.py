@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, JSON
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, JSON, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -50,10 +50,14 @@ class ProductTypeField(Base):
     custom_value = Column(String, nullable=True)
     
     product_type = relationship("AmazonProductType", back_populates="fields")
-    valid_values = relationship("ProductTypeFieldValue", back_populates="field", cascade="all, delete-orphan")
+    valid_values = relationship(
+        "ProductTypeFieldValue", back_populates="field", cascade="all, delete-orphan",
+        order_by="ProductTypeFieldValue.id"
+    )
 
 class ProductTypeFieldValue(Base):
     __tablename__ = "product_type_field_values"
+    __table_args__ = (Index('ix_product_type_field_values_field_value', 'product_type_field_id', 'value'),)
     
     id = Column(Integer, primary_key=True, index=True)
     product_type_field_id = Column(Integer, ForeignKey("product_type_fields.id"), nullable=False)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 from app.models.enums import HandleLocation, AngleType, Carrier, Marketplace
 
@@ -63,6 +63,64 @@ class ModelResponse(ModelBase):
     class Config:
         from_attributes = True
 
+class ModelListItem(BaseModel):
+    """GET /models row; with a fields= projection only the requested keys are sent."""
+    id: int
+    name: Optional[str] = None
+    series_id: Optional[int] = None
+    equipment_type_id: Optional[int] = None
+    width: Optional[float] = None
+    depth: Optional[float] = None
+    height: Optional[float] = None
+    handle_length: Optional[float] = None
+    handle_width: Optional[float] = None
+    handle_location: Optional[HandleLocation] = None
+    angle_type: Optional[AngleType] = None
+    image_url: Optional[str] = None
+    parent_sku: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+class CatalogModelNode(BaseModel):
+    id: int
+    name: str
+    equipment_type_id: int
+    parent_sku: Optional[str] = None
+
+class CatalogSeriesNode(BaseModel):
+    id: int
+    name: str
+    models: Optional[List[CatalogModelNode]] = None
+
+class CatalogManufacturerNode(BaseModel):
+    id: int
+    name: str
+    series: Optional[List[CatalogSeriesNode]] = None
+
+class SkuRegenerationResponse(BaseModel):
+    message: str
+    scanned: int
+    updated: int
+
+class SkuRegenerationJobResponse(BaseModel):
+    job_id: str
+    status: str
+    skus_written: int = 0
+    skus_to_write: int = 0
+    result: Optional[SkuRegenerationResponse] = None
+    error: Optional[str] = None
+
+class SkuCollisionModel(BaseModel):
+    id: int
+    name: str
+    series_id: int
+    parent_sku: str
+
+class SkuCollisionGroup(BaseModel):
+    base_sku: str
+    models: List[SkuCollisionModel]
+
 class MaterialBase(BaseModel):
     name: str
     base_color: str
@@ -200,6 +258,14 @@ class ShippingRateResponse(ShippingRateBase):
     class Config:
         from_attributes = True
 
+class ShippingRateLookupRequest(BaseModel):
+    carrier: Carrier = Carrier.USPS
+    zone: str = "1"
+    weights: List[float]
+
+class ShippingRateLookupResponse(BaseModel):
+    rates: List[float]
+
 class PricingCalculateRequest(BaseModel):
     model_id: int
     material_id: int
@@ -223,6 +289,39 @@ class PricingCalculateResponse(BaseModel):
     unit_total: float
     total: float
 
+class PricingBatchRequest(BaseModel):
+    items: List[PricingCalculateRequest]
+
+class PricingBatchItemResult(BaseModel):
+    index: int
+    result: Optional[PricingCalculateResponse] = None
+    error: Optional[str] = None
+
+class PricingBatchResponse(BaseModel):
+    results: List[PricingBatchItemResult]
+
+class PricingCacheStatsResponse(BaseModel):
+    version: int
+    snapshot_version: Optional[int] = None
+    hits: int
+    misses: int
+    reloads: int
+    snapshot_age_seconds: Optional[float] = None
+
+class PriceMatrixMaterialError(BaseModel):
+    material_id: int
+    error: str
+
+class PriceMatrixResponse(BaseModel):
+    carrier: Carrier
+    zone: str
+    quantity: int
+    row_count: int
+    model_ids: List[int]
+    material_ids: List[int]
+    material_errors: List[PriceMatrixMaterialError] = []
+    columns: Dict[str, List[int | float]]
+
 class DesignOptionBase(BaseModel):
     name: str
     description: Optional[str] = None
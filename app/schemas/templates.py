@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Dict
 
 class ProductTypeFieldValueResponse(BaseModel):
     id: int
@@ -8,7 +8,7 @@ class ProductTypeFieldValueResponse(BaseModel):
     class Config:
         from_attributes = True
 
-class ProductTypeFieldResponse(BaseModel):
+class ProductTypeFieldSummaryResponse(BaseModel):
     id: int
     field_name: str
     display_name: Optional[str] = None
@@ -18,11 +18,13 @@ class ProductTypeFieldResponse(BaseModel):
     description: Optional[str] = None
     selected_value: Optional[str] = None
     custom_value: Optional[str] = None
-    valid_values: List[ProductTypeFieldValueResponse] = []
     
     class Config:
         from_attributes = True
 
+class ProductTypeFieldResponse(ProductTypeFieldSummaryResponse):
+    valid_values: List[ProductTypeFieldValueResponse] = []
+
 class ProductTypeKeywordResponse(BaseModel):
     id: int
     keyword: str
@@ -42,11 +44,71 @@ class AmazonProductTypeResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class AmazonProductTypeSummaryResponse(BaseModel):
+    id: int
+    code: str
+    name: Optional[str] = None
+    description: Optional[str] = None
+    # Required, so a full product type (which has no counts) never validates as a summary
+    field_count: int
+    keyword_count: int
+    
+    class Config:
+        from_attributes = True
+
+class TemplateImportChanges(BaseModel):
+    created: bool = False
+    header_rows_changed: bool = False
+    fields_added: int = 0
+    fields_updated: int = 0
+    fields_removed: int = 0
+    values_added: int = 0
+    values_removed: int = 0
+    keywords_added: int = 0
+    keywords_removed: int = 0
+
+class TemplateImportError(BaseModel):
+    step: str
+    message: str
+
+class UnmatchedDefaultValue(BaseModel):
+    local_label: Optional[str] = None
+    field_name: Optional[str] = None
+
+class TemplateImportDiagnostics(BaseModel):
+    steps: Dict[str, Dict[str, int]] = {}
+    unmatched_valid_value_labels: List[str] = []
+    unmatched_default_values: List[UnmatchedDefaultValue] = []
+    missing_sheets: List[str] = []
+    errors: List[TemplateImportError] = []
+
 class TemplateImportResponse(BaseModel):
     product_code: str
     fields_imported: int
     keywords_imported: int
     valid_values_imported: int
+    timings: Dict[str, float] = {}
+    changes: Optional[TemplateImportChanges] = None
+    diagnostics: Optional[TemplateImportDiagnostics] = None
+
+class TemplateImportJobResponse(BaseModel):
+    job_id: str
+    status: str
+    product_code: str
+    result: Optional[TemplateImportResponse] = None
+    error: Optional[str] = None
+
+class TemplateBatchImportItem(BaseModel):
+    filename: str
+    product_code: str
+    status: str  # "imported" or "failed"
+    result: Optional[TemplateImportResponse] = None
+    error: Optional[str] = None
+
+class TemplateBatchImportResponse(BaseModel):
+    imported: int
+    failed: int
+    results: List[TemplateBatchImportItem]
 
 class EquipmentTypeProductTypeLinkCreate(BaseModel):
     equipment_type_id: int
@@ -64,5 +126,22 @@ class ProductTypeFieldUpdate(BaseModel):
     required: Optional[bool] = None
     selected_value: Optional[str] = None
 
+class ProductTypeFieldBulkUpdateItem(ProductTypeFieldUpdate):
+    field_id: int
+
+class ProductTypeFieldBulkUpdate(BaseModel):
+    updates: List[ProductTypeFieldBulkUpdateItem]
+
+class ProductTypeFieldBulkUpdateResult(BaseModel):
+    field_id: int
+    status: str  # "updated" or "failed"
+    error: Optional[str] = None
+    field: Optional[ProductTypeFieldSummaryResponse] = None
+
+class ProductTypeFieldBulkUpdateResponse(BaseModel):
+    updated: int
+    failed: int
+    results: List[ProductTypeFieldBulkUpdateResult]
+
 class ProductTypeFieldValueCreate(BaseModel):
     value: str
@@ -0,0 +1,39 @@
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from app.models.core import CatalogState
+
+CATALOG_STATE_ID = 1
+
+
+class CatalogVersion:
+    """
+    Change counter for manufacturers, series and models, kept in the database.
+
+    Write handlers call bump() before committing, so the new version commits
+    together with the change it describes. The counter lives in the
+    catalog_state row rather than in memory, so every worker process builds
+    the same ETag and a write through one worker invalidates all of them.
+    """
+
+    def current(self, db: Session) -> int:
+        version = db.execute(
+            select(CatalogState.version).where(CatalogState.id == CATALOG_STATE_ID)
+        ).scalar()
+        return version or 0
+
+    def bump(self, db: Session):
+        result = db.execute(
+            update(CatalogState)
+            .where(CatalogState.id == CATALOG_STATE_ID)
+            .values(version=CatalogState.version + 1)
+        )
+        if result.rowcount == 0:
+            # The row is seeded on table creation; recreate it if it has gone missing
+            db.add(CatalogState(id=CATALOG_STATE_ID, version=1))
+
+    def etag(self, db: Session, *variant) -> str:
+        parts = ["catalog", str(self.current(db)), *(str(part) for part in variant)]
+        return f'"{"-".join(parts)}"'
+
+
+catalog_version = CatalogVersion()
@@ -0,0 +1,102 @@
+import os
+import threading
+from typing import BinaryIO, Iterator, Optional
+
+EXPORT_CACHE_DIR = "./export_cache"
+EXPORT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+EXPORT_CACHE_CHUNK_SIZE = 64 * 1024
+
+class ExportArtifactCache:
+    """
+    Size-bounded, content-addressed store for rendered export files.
+
+    Files are named by their cache key, which callers derive from everything
+    that affects the output, so an entry never needs invalidating - it just
+    stops being requested. Reads touch the file's mtime; when the directory
+    grows past max_bytes the least recently used files are removed.
+
+    get() and put() hand out an open file rather than a path, opened under
+    the same lock eviction holds, so an entry evicted while it is being sent
+    stays readable until the response closes it.
+    """
+
+    def __init__(self, directory: str = EXPORT_CACHE_DIR, max_bytes: int = EXPORT_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key: str, extension: str) -> str:
+        return os.path.join(self.directory, f"{key}.{extension}")
+
+    def get(self, key: str, extension: str) -> Optional[BinaryIO]:
+        """Open a cached file for reading, or None on a miss."""
+        path = self._path(key, extension)
+        with self._lock:
+            try:
+                handle = open(path, "rb")
+            except FileNotFoundError:
+                self.misses += 1
+                return None
+            os.utime(path)
+            self.hits += 1
+            return handle
+
+    def put(self, key: str, extension: str, source_path: str) -> BinaryIO:
+        """Move a rendered file into the cache and return it opened for reading."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key, extension)
+        with self._lock:
+            os.replace(source_path, path)
+            handle = open(path, "rb")
+            self._evict(keep=path)
+        return handle
+
+    def _entries(self):
+        try:
+            with os.scandir(self.directory) as it:
+                return [(entry.path, entry.stat()) for entry in it if entry.is_file()]
+        except FileNotFoundError:
+            return []
+
+    def _evict(self, keep: str):
+        """Remove least recently used files until the directory fits; call with the lock held."""
+        entries = sorted(self._entries(), key=lambda e: e[1].st_mtime)
+        total = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= stat.st_size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._entries()
+            return {
+                "entries": len(entries),
+                "total_bytes": sum(stat.st_size for _, stat in entries),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+
+def iter_file(handle: BinaryIO, chunk_size: int = EXPORT_CACHE_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield an open file in chunks and close it once sent (or once the client goes away)."""
+    try:
+        while chunk := handle.read(chunk_size):
+            yield chunk
+    finally:
+        handle.close()
+
+
+export_cache = ExportArtifactCache()
@@ -0,0 +1,177 @@
+"""
+Row building for Amazon template exports.
+
+Everything here reads plain attributes of the models, fields and equipment
+types it is given and never touches the session, so export worker processes
+can import it without loading the API, the app or the database engine.
+"""
+import re
+from collections import namedtuple
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+# The settings of a template field that decide its value, detached from the ORM row
+ExportField = namedtuple("ExportField", ["field_name", "required", "custom_value", "selected_value"])
+ExportEquipmentType = namedtuple("ExportEquipmentType", ["id", "name"])
+
+IMAGE_FIELD_TO_NUMBER = {
+    'main_product_image_locator': '001',
+    'other_product_image_locator_1': '002',
+    'other_product_image_locator_2': '003',
+    'other_product_image_locator_3': '004',
+    'other_product_image_locator_4': '005',
+    'other_product_image_locator_5': '006',
+    'other_product_image_locator_6': '007',
+    'other_product_image_locator_7': '008',
+    'other_product_image_locator_8': '009',
+    'swatch_product_image_locator': '010',
+}
+
+def normalize_for_url(name: str) -> str:
+    """Normalize a name for use in URL paths/filenames.
+    Removes spaces, special characters, and non-alphanumeric characters.
+    Example: "Fender USA" -> "FenderUSA", "Tone-Master" -> "ToneMaster"
+    """
+    if not name:
+        return ''
+    result = re.sub(r'[^a-zA-Z0-9]', '', name)
+    return result
+
+PLACEHOLDER_SLOTS = {
+    '[MANUFACTURER_NAME]': 'manufacturer',
+    '[Manufacturer_Name]': 'manufacturer',
+    '[SERIES_NAME]': 'series',
+    '[Series_Name]': 'series',
+    '[MODEL_NAME]': 'model',
+    '[Model_Name]': 'model',
+}
+EQUIPMENT_TYPE_PLACEHOLDERS = ('[EQUIPMENT_TYPE]', '[Equipment_Type]')
+PLACEHOLDER_PATTERN = re.compile('|'.join(re.escape(p) for p in PLACEHOLDER_SLOTS))
+
+def build_row_slots(model, series, manufacturer) -> dict:
+    """Per-model values the compiled resolvers read from, computed once per row."""
+    mfr_name = manufacturer.name if manufacturer else ''
+    series_name = series.name if series else ''
+    model_name = model.name if model else ''
+    return {
+        'manufacturer': mfr_name,
+        'series': series_name,
+        'model': model_name,
+        'manufacturer_url': normalize_for_url(mfr_name),
+        'series_url': normalize_for_url(series_name),
+        'model_url': normalize_for_url(model_name),
+        'brand': manufacturer.name if manufacturer else None,
+        'parent_sku': model.parent_sku if model and model.parent_sku else None,
+    }
+
+def compile_placeholder_template(value: str, equipment_type, is_image_url: bool = False):
+    """Turn a custom value into a format template with fixed slots.
+    The equipment type is constant for an export, so it is substituted here once;
+    image URLs use the URL-normalized names.
+    """
+    equip_type = equipment_type.name if equipment_type else ''
+    suffix = '_url' if is_image_url else ''
+    
+    parts = []
+    position = 0
+    for match in PLACEHOLDER_PATTERN.finditer(value):
+        parts.append(value[position:match.start()].replace('{', '{{').replace('}', '}}'))
+        parts.append('{' + PLACEHOLDER_SLOTS[match.group(0)] + suffix + '}')
+        position = match.end()
+    parts.append(value[position:].replace('{', '{{').replace('}', '}}'))
+    
+    template = ''.join(parts)
+    for placeholder in EQUIPMENT_TYPE_PLACEHOLDERS:
+        template = template.replace(placeholder, equip_type.replace('{', '{{').replace('}', '}}'))
+    return template.format_map
+
+def get_image_field_key(field_name: str) -> str | None:
+    """Extract the base image field key from a full Amazon field name.
+    Returns the key if it matches a known product image field, None otherwise.
+    """
+    for key in IMAGE_FIELD_TO_NUMBER.keys():
+        if field_name.startswith(key):
+            return key
+    return None
+
+def is_image_url_field(field_name: str) -> bool:
+    """Check if a field is a product image URL field that needs special processing."""
+    return get_image_field_key(field_name) is not None
+
+def compile_field_resolver(field, equipment_type=None, listing_type: str = "individual"):
+    """Compile a field into a resolver taking the row slots from build_row_slots.
+    Which value a field produces depends only on the field itself, so the name
+    checks and placeholder parsing run once per export instead of once per cell.
+    """
+    field_name_lower = field.field_name.lower()
+    
+    if 'contribution_sku' in field_name_lower and listing_type == 'individual':
+        return lambda slots: slots['parent_sku']
+    
+    # Only include custom_value or selected_value if field is marked as required
+    if field.required:
+        if field.custom_value:
+            return compile_placeholder_template(field.custom_value, equipment_type, is_image_url=is_image_url_field(field.field_name))
+        
+        if field.selected_value:
+            selected_value = field.selected_value
+            return lambda slots: selected_value
+        
+        # Auto-generate values for common fields only if required
+        if 'item_name' in field_name_lower or 'product_name' in field_name_lower or 'title' in field_name_lower:
+            return '{manufacturer} {series} {model} Cover'.format_map
+        
+        if 'brand' in field_name_lower or 'brand_name' in field_name_lower:
+            return lambda slots: slots['brand']
+        
+        if 'model' in field_name_lower or 'model_number' in field_name_lower or 'model_name' in field_name_lower:
+            return lambda slots: slots['model']
+        
+        if 'manufacturer' in field_name_lower:
+            return lambda slots: slots['brand']
+    
+    return lambda slots: None
+
+
+def export_field(field) -> ExportField:
+    return ExportField(field.field_name, field.required, field.custom_value, field.selected_value)
+
+def model_row_slots(models) -> Iterator[Tuple[int, dict]]:
+    """(equipment type id, row slots) per model, read from its eager-loaded series and manufacturer."""
+    for model in models:
+        series = model.series
+        yield model.equipment_type_id, build_row_slots(model, series, series.manufacturer if series else None)
+
+def resolve_export_rows(
+    row_slots: Iterable[Tuple[int, dict]],
+    total_rows: int,
+    fields: list,
+    equipment_types: dict,
+    listing_type: str,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> Iterator[List[str]]:
+    """Yield one row per (equipment type id, slots) pair by applying the compiled field resolvers.
+    Rows are generated as the writer consumes them, so no row list is held.
+    Resolvers are compiled once per equipment type present in the selection.
+    """
+    resolvers_by_equipment_type = {}
+    
+    for row_number, (equipment_type_id, slots) in enumerate(row_slots, start=1):
+        resolvers = resolvers_by_equipment_type.get(equipment_type_id)
+        if resolvers is None:
+            equipment_type = equipment_types.get(equipment_type_id)
+            resolvers = [compile_field_resolver(field, equipment_type, listing_type) for field in fields]
+            resolvers_by_equipment_type[equipment_type_id] = resolvers
+        
+        yield [resolve(slots) or '' for resolve in resolvers]
+        if progress:
+            progress(row_number, total_rows)
+
+def build_export_rows(
+    models: list,
+    fields: list,
+    equipment_types: dict,
+    listing_type: str,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> Iterator[List[str]]:
+    """Yield one export row per model; see resolve_export_rows."""
+    return resolve_export_rows(model_row_slots(models), len(models), fields, equipment_types, listing_type, progress)
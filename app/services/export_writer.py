@@ -0,0 +1,201 @@
+import os
+import csv
+import tempfile
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.utils import get_column_letter
+from typing import Iterable, List, Optional, Tuple
+from app.services.export_rows import resolve_export_rows
+
+MAX_COLUMN_WIDTH = 50
+
+HEADER_ROW_STYLES = [
+    (Font(bold=True, color="FFFFFF"), PatternFill(start_color="1976D2", end_color="1976D2", fill_type="solid")),
+    (Font(color="FFFFFF"), PatternFill(start_color="2196F3", end_color="2196F3", fill_type="solid")),
+    (Font(bold=True, color="FFFFFF"), PatternFill(start_color="4CAF50", end_color="4CAF50", fill_type="solid")),
+    (Font(bold=True), PatternFill(start_color="8BC34A", end_color="8BC34A", fill_type="solid")),
+    (Font(size=9), PatternFill(start_color="C8E6C9", end_color="C8E6C9", fill_type="solid")),
+    (Font(italic=True, size=9), PatternFill(start_color="FFF9C4", end_color="FFF9C4", fill_type="solid")),
+]
+HEADER_ALIGNMENT = Alignment(horizontal='left', vertical='center')
+
+
+class ColumnWidthTracker:
+    """Keeps the widest value per column as rows are generated, capped at MAX_COLUMN_WIDTH."""
+
+    def __init__(self):
+        self.max_lengths: List[int] = []
+
+    def update(self, row: Iterable[Optional[str]]):
+        max_lengths = self.max_lengths
+        for col_idx, value in enumerate(row):
+            length = min(len(str(value)), MAX_COLUMN_WIDTH) if value else 0
+            if col_idx >= len(max_lengths):
+                max_lengths.append(length)
+            elif length > max_lengths[col_idx]:
+                max_lengths[col_idx] = length
+
+    @property
+    def widths(self) -> List[int]:
+        return [length + 2 for length in self.max_lengths]
+
+
+def spool_rows(output, header_rows: List[list], data_rows: Iterable[list]) -> List[int]:
+    """Write data rows to output as CSV and return the column widths of the header and data rows."""
+    width_tracker = ColumnWidthTracker()
+    for header_row in header_rows:
+        width_tracker.update(header_row)
+
+    writer = csv.writer(output)
+    for data_row in data_rows:
+        width_tracker.update(data_row)
+        writer.writerow([value or '' for value in data_row])
+    return width_tracker.widths
+
+
+def read_spooled_rows(path: str):
+    """Yield the rows of a spool file written by spool_rows, removing the file once read."""
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from csv.reader(f)
+    finally:
+        os.remove(path)
+
+
+class SpooledRows:
+    """
+    Data rows spooled to a temp file while their column widths are tracked.
+
+    A write-only sheet needs its column widths before the first row is
+    appended, so rows are generated once into the spool, sized on the way, and
+    then replayed into the sheet. Memory stays flat at the cost of writing the
+    rows to disk and reading them back once.
+    """
+
+    def __init__(self, header_rows: List[list], data_rows: Iterable[list]):
+        self._file = tempfile.TemporaryFile(mode="w+", newline="", encoding="utf-8")
+        self.widths = spool_rows(self._file, header_rows, data_rows)
+
+    def __iter__(self):
+        # The spool is read once; the temp file goes away when the rows are exhausted
+        try:
+            self._file.seek(0)
+            yield from csv.reader(self._file)
+        finally:
+            self._file.close()
+
+
+def write_template_sheet(ws, header_rows: List[list], data_rows: Iterable[list], column_widths: List[int]):
+    """Append styled header rows and data rows to a write-only worksheet."""
+    # Column widths are written ahead of the rows in write-only mode, so set them first
+    for col_idx, width in enumerate(column_widths):
+        ws.column_dimensions[get_column_letter(col_idx + 1)].width = width
+
+    for row_idx, header_row in enumerate(header_rows):
+        cells = []
+        for value in header_row:
+            cell = WriteOnlyCell(ws, value=value or '')
+            if row_idx < len(HEADER_ROW_STYLES):
+                cell.font = HEADER_ROW_STYLES[row_idx][0]
+                cell.fill = HEADER_ROW_STYLES[row_idx][1]
+            cell.alignment = HEADER_ALIGNMENT
+            cells.append(cell)
+        ws.append(cells)
+
+    for data_row in data_rows:
+        ws.append([value or '' for value in data_row])
+
+
+def write_xlsx_file(
+    header_rows: List[list],
+    data_rows: Iterable[list],
+    column_widths: List[int],
+    suffix: str = ".xlsx",
+    path: Optional[str] = None
+) -> str:
+    """
+    Render the export with a write-only (constant-memory) workbook.
+
+    Rows are serialized as they are appended instead of being held as cell
+    objects, so memory stays flat as the model count grows. Writes to path,
+    or to a new temp file if none is given, and returns the file path; the
+    caller is responsible for removing a temp file once it has been sent.
+    """
+    return write_workbook_file([("Template", header_rows, data_rows, column_widths)], suffix=suffix, path=path)
+
+
+def write_workbook_file(
+    sheets: List[Tuple[str, List[list], Iterable[list], List[int]]],
+    suffix: str = ".xlsx",
+    path: Optional[str] = None
+) -> str:
+    """Write-only workbook with one template sheet per (title, header rows, data rows, widths)."""
+    wb = Workbook(write_only=True)
+    for title, header_rows, data_rows, column_widths in sheets:
+        ws = wb.create_sheet(title)
+        write_template_sheet(ws, header_rows, data_rows, column_widths)
+
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix=suffix, prefix="export_")
+        os.close(fd)
+    try:
+        wb.save(path)
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+
+def write_csv_rows(output, header_rows: List[list], data_rows: Iterable[list]):
+    writer = csv.writer(output)
+    for header_row in header_rows:
+        writer.writerow([v or '' for v in header_row])
+    for data_row in data_rows:
+        writer.writerow([v or '' for v in data_row])
+
+
+def write_export_file(header_rows: List[list], data_rows: Iterable[list], column_widths: List[int], export_format: str, path: str) -> str:
+    if export_format == "csv":
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            write_csv_rows(f, header_rows, data_rows)
+        return path
+    return write_xlsx_file(header_rows, data_rows, column_widths, path=path)
+
+
+EXPORT_GROUP_SPOOL = "spool"
+
+
+def render_group_export(
+    header_rows: List[list],
+    row_slots: List[Tuple[int, dict]],
+    fields: list,
+    equipment_types: dict,
+    listing_type: str,
+    export_format: str
+) -> Tuple[str, List[int]]:
+    """
+    Build one template group's rows into a temp file and return (path, column widths).
+
+    Runs in an export fan-out worker process, which imports only this module
+    and export_rows, so it takes row slots, ExportField and ExportEquipmentType
+    tuples rather than ORM objects. export_format "spool" writes only the data
+    rows, as a spool for a workbook sheet, and returns their column widths;
+    any other format writes the finished export file.
+    """
+    data_rows = resolve_export_rows(row_slots, len(row_slots), fields, equipment_types, listing_type)
+    fd, path = tempfile.mkstemp(suffix=f".{export_format}", prefix="export_")
+    os.close(fd)
+    try:
+        if export_format == EXPORT_GROUP_SPOOL:
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                return path, spool_rows(f, header_rows, data_rows)
+        if export_format != "csv":
+            data_rows = SpooledRows(header_rows, data_rows)
+            write_xlsx_file(header_rows, data_rows, data_rows.widths, path=path)
+        else:
+            write_export_file(header_rows, data_rows, [], export_format, path)
+        return path, []
+    except Exception:
+        os.remove(path)
+        raise
@@ -0,0 +1,85 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from typing import Callable, Optional
+
+JOB_RETENTION_SECONDS = 6 * 60 * 60
+
+class Job:
+    """State of one background job, updated by the worker and read by status endpoints."""
+
+    def __init__(self, kind: str, params: Optional[dict] = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params or {}
+        self.status = "pending"
+        self.progress_done = 0
+        self.progress_total = 0
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def set_progress(self, done: int, total: int):
+        self.progress_done = done
+        self.progress_total = total
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+
+class JobRunner:
+    """
+    Runs jobs on a bounded thread pool and keeps their state in memory.
+
+    At most max_workers jobs run at once; further submissions wait in the
+    executor's queue. Finished jobs are forgotten after JOB_RETENTION_SECONDS,
+    calling on_expire so callers can clean up any artifacts.
+    """
+
+    def __init__(self, max_workers: int, name: str, on_expire: Optional[Callable[[Job], None]] = None):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._on_expire = on_expire
+
+    def submit(self, job: Job, fn: Callable, *args) -> Job:
+        """Queue fn(job, *args); its return value becomes job.result."""
+        self._expire_finished()
+        with self._lock:
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, fn, args)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job: Job, fn: Callable, args: tuple):
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            job.result = fn(job, *args)
+            job.status = "completed"
+        except HTTPException as e:
+            job.error = str(e.detail)
+            job.status = "failed"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+
+    def _expire_finished(self):
+        cutoff = time.time() - JOB_RETENTION_SECONDS
+        with self._lock:
+            expired = [job for job in self._jobs.values() if job.finished and job.finished_at < cutoff]
+            for job in expired:
+                del self._jobs[job.id]
+        if self._on_expire:
+            for job in expired:
+                self._on_expire(job)
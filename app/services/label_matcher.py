@@ -0,0 +1,89 @@
+from collections import defaultdict
+from typing import Any, Iterable, Optional, Tuple
+
+MAX_GRAM_LENGTH = 3
+
+
+class SubstringIndex:
+    """
+    Ordered set of keys answering "which key contains / is contained in this text".
+
+    Replaces linear "for key in keys: if query in key" scans while keeping their
+    result: when several keys match, the one given first wins. Every 1 to
+    MAX_GRAM_LENGTH character substring of every key is indexed to the ascending
+    list of key positions containing it. Short queries read their answer straight
+    from that table, and longer ones only verify keys from their rarest trigram's
+    list. Keys contained in a query are found by looking up each window of the
+    query whose length matches some key.
+    """
+
+    def __init__(self, items: Iterable[Tuple[str, Any]], case_sensitive: bool = True):
+        self.case_sensitive = case_sensitive
+        self._keys = []
+        self._values = []
+        self._first_position = {}
+        self._key_lengths = set()
+        self._grams = defaultdict(list)
+
+        for key, value in items:
+            key = self._normalize(key)
+            position = len(self._keys)
+            self._keys.append(key)
+            self._values.append(value)
+            # A repeated key can never beat its first occurrence
+            if key in self._first_position:
+                continue
+            self._first_position[key] = position
+            self._key_lengths.add(len(key))
+
+            grams = set()
+            for n in range(1, MAX_GRAM_LENGTH + 1):
+                for i in range(len(key) - n + 1):
+                    grams.add(key[i:i + n])
+            for gram in grams:
+                self._grams[gram].append(position)
+
+    def _normalize(self, text: str) -> str:
+        return text if self.case_sensitive else text.lower()
+
+    def _first_containing(self, query: str) -> Optional[int]:
+        if not query:
+            return 0 if self._keys else None
+        if len(query) <= MAX_GRAM_LENGTH:
+            positions = self._grams.get(query)
+            return positions[0] if positions else None
+
+        rarest = None
+        for i in range(len(query) - MAX_GRAM_LENGTH + 1):
+            positions = self._grams.get(query[i:i + MAX_GRAM_LENGTH])
+            if not positions:
+                return None
+            if rarest is None or len(positions) < len(rarest):
+                rarest = positions
+        for position in rarest:
+            if query in self._keys[position]:
+                return position
+        return None
+
+    def _first_contained(self, query: str) -> Optional[int]:
+        best = None
+        for length in self._key_lengths:
+            for i in range(len(query) - length + 1):
+                position = self._first_position.get(query[i:i + length])
+                if position is not None and (best is None or position < best):
+                    best = position
+        return best
+
+    def containing(self, query: str) -> Optional[Any]:
+        """Value of the first key that has query as a substring."""
+        position = self._first_containing(self._normalize(query))
+        return self._values[position] if position is not None else None
+
+    def overlapping(self, query: str) -> Optional[Any]:
+        """Value of the first key that contains query or is contained in it."""
+        query = self._normalize(query)
+        positions = [
+            p for p in (self._first_containing(query), self._first_contained(query))
+            if p is not None
+        ]
+        return self._values[min(positions)] if positions else None
@@ -0,0 +1,19 @@
+from typing import Optional
+
+
+def prefix_upper_bound(prefix: str) -> Optional[str]:
+    """Smallest string greater than every string starting with prefix, if one exists."""
+    while prefix and ord(prefix[-1]) == 0x10FFFF:
+        prefix = prefix[:-1]
+    if not prefix:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def prefix_range(column, prefix: str) -> list:
+    """Conditions matching column values that start with prefix, as a range seek an index can serve."""
+    conditions = [column >= prefix]
+    upper = prefix_upper_bound(prefix)
+    if upper is not None:
+        conditions.append(column < upper)
+    return conditions
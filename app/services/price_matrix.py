@@ -0,0 +1,113 @@
+import numpy as np
+from sqlalchemy.orm import Session
+from app.models.core import Model, Material
+from app.models.enums import Carrier
+from typing import Optional, List
+from app.services.pricing_service import LABOR_RATE_PER_HOUR, WASTE_PERCENTAGE
+from app.services.pricing_cache import pricing_cache
+
+class PriceMatrixService:
+    """
+    Prices every model in every material in one vectorized pass.
+
+    Uses the same formulas as PricingService.calculate_total (without colour
+    and option surcharges, which don't vary across the catalog), but loads
+    model dimensions and material columns into NumPy arrays so the whole
+    cross product is computed with array operations instead of N x M quotes.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def load_models(self, equipment_type_id: Optional[int] = None, series_id: Optional[int] = None) -> np.ndarray:
+        query = self.db.query(Model.id, Model.width, Model.depth, Model.height)
+        if equipment_type_id:
+            query = query.filter(Model.equipment_type_id == equipment_type_id)
+        if series_id:
+            query = query.filter(Model.series_id == series_id)
+        rows = query.order_by(Model.id).all()
+        return np.array(rows, dtype=np.float64).reshape(-1, 4)
+
+    def load_materials(self, material_ids: Optional[List[int]] = None) -> np.ndarray:
+        query = self.db.query(
+            Material.id,
+            Material.linear_yard_width,
+            Material.cost_per_linear_yard,
+            Material.weight_per_linear_yard,
+            Material.labor_time_minutes
+        )
+        if material_ids:
+            query = query.filter(Material.id.in_(material_ids))
+        rows = query.order_by(Material.id).all()
+        return np.array(rows, dtype=np.float64).reshape(-1, 5)
+
+    def build(
+        self,
+        equipment_type_id: Optional[int] = None,
+        series_id: Optional[int] = None,
+        material_ids: Optional[List[int]] = None,
+        carrier: Carrier = Carrier.USPS,
+        zone: str = "1",
+        quantity: int = 1
+    ) -> dict:
+        """
+        Return the model x material price matrix as flat, row-major columns.
+
+        Materials without a positive linear yard width can't be priced per
+        square inch; they are left out of the matrix and listed in
+        material_errors instead of turning their cells into inf/NaN.
+        """
+        models = self.load_models(equipment_type_id, series_id)
+        materials = self.load_materials(material_ids)
+
+        unpriceable = ~(materials[:, 1] > 0)
+        material_errors = [
+            {"material_id": int(material_id), "error": "linear_yard_width must be greater than zero"}
+            for material_id in materials[unpriceable, 0]
+        ]
+        materials = materials[~unpriceable]
+
+        model_ids = models[:, 0].astype(np.int64)
+        material_id_column = materials[:, 0].astype(np.int64)
+        width, depth, height = models[:, 1], models[:, 2], models[:, 3]
+        yard_area = materials[:, 1] * 36
+
+        area = 2 * (width * depth + width * height + depth * height)
+        waste_area = area * (1 + WASTE_PERCENTAGE)
+
+        material_cost = np.outer(waste_area, materials[:, 2] / yard_area)
+        weight = np.outer(waste_area, materials[:, 3] / yard_area)
+        labour_cost = np.broadcast_to((materials[:, 4] / 60) * LABOR_RATE_PER_HOUR, material_cost.shape)
+        shipping_index = pricing_cache.get(self.db).shipping_index(carrier, zone)
+        shipping_cost = shipping_index.lookup_many(weight * quantity)
+
+        unit_total = material_cost + labour_cost
+        total = unit_total * quantity + shipping_cost
+
+        material_count = len(material_id_column)
+        columns = {
+            "model_id": np.repeat(model_ids, material_count),
+            "material_id": np.tile(material_id_column, len(model_ids)),
+            "area": np.repeat(area, material_count),
+            "waste_area": np.repeat(waste_area, material_count),
+            "material_cost": material_cost,
+            "labour_cost": labour_cost,
+            "weight": weight,
+            "shipping_cost": shipping_cost,
+            "unit_total": unit_total,
+            "total": total,
+        }
+
+        return {
+            "carrier": carrier,
+            "zone": zone,
+            "quantity": quantity,
+            "row_count": len(model_ids) * material_count,
+            "model_ids": model_ids.tolist(),
+            "material_ids": material_id_column.tolist(),
+            "material_errors": material_errors,
+            "columns": {
+                name: (values.ravel().tolist() if values.dtype.kind == "i" else np.round(values, 2).ravel().tolist())
+                for name, values in columns.items()
+            }
+        }
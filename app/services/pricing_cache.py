@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import namedtuple
+from sqlalchemy.orm import Session
+from app.models.core import MaterialColourSurcharge, PricingOption, ShippingRate
+from app.services.shipping_index import ShippingRateIndex
+
+# Plain copies of shipping rate rows so the snapshot never touches a closed session
+ShippingBand = namedtuple("ShippingBand", ["id", "min_weight", "max_weight", "rate", "surcharge"])
+
+class PricingSnapshot:
+    """Immutable in-memory copy of the pricing reference tables."""
+
+    EMPTY_SHIPPING_INDEX = ShippingRateIndex([])
+
+    def __init__(self, version: int, option_prices: dict, colour_surcharges: dict, shipping_indexes: dict):
+        self.version = version
+        self.loaded_at = time.time()
+        self.option_prices = option_prices
+        self.colour_surcharges = colour_surcharges
+        self.shipping_indexes = shipping_indexes
+
+    def shipping_index(self, carrier, zone) -> ShippingRateIndex:
+        return self.shipping_indexes.get((carrier, zone), self.EMPTY_SHIPPING_INDEX)
+
+    @classmethod
+    def load(cls, db: Session, version: int) -> "PricingSnapshot":
+        option_prices = {option.name: option.price for option in db.query(PricingOption.name, PricingOption.price)}
+
+        colour_surcharges = {}
+        for row in db.query(
+            MaterialColourSurcharge.material_id,
+            MaterialColourSurcharge.colour,
+            MaterialColourSurcharge.surcharge
+        ).order_by(MaterialColourSurcharge.id):
+            colour_surcharges.setdefault((row.material_id, row.colour), row.surcharge)
+
+        shipping_rates = {}
+        for row in db.query(ShippingRate).order_by(ShippingRate.id):
+            band = ShippingBand(row.id, row.min_weight, row.max_weight, row.rate, row.surcharge or 0.0)
+            shipping_rates.setdefault((row.carrier, row.zone), []).append(band)
+        shipping_indexes = {key: ShippingRateIndex(bands) for key, bands in shipping_rates.items()}
+
+        return cls(version, option_prices, colour_surcharges, shipping_indexes)
+
+
+class PricingReferenceCache:
+    """
+    Versioned cache of PricingOption, MaterialColourSurcharge and ShippingRate.
+
+    Write handlers call invalidate() after committing; the next reader reloads
+    the snapshot. Readers that find a current snapshot don't touch the database.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = 0
+        self._snapshot = None
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def invalidate(self):
+        with self._lock:
+            self._version += 1
+
+    def get(self, db: Session) -> PricingSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self._version:
+            self.hits += 1
+            return snapshot
+
+        with self._lock:
+            self.misses += 1
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.version == self._version:
+                return snapshot
+            # A write landing mid-load bumps the version, so the next reader reloads again
+            snapshot = PricingSnapshot.load(db, self._version)
+            self._snapshot = snapshot
+            self.reloads += 1
+            return snapshot
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "version": self._version,
+            "snapshot_version": snapshot.version if snapshot else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "snapshot_age_seconds": round(time.time() - snapshot.loaded_at, 3) if snapshot else None
+        }
+
+
+pricing_cache = PricingReferenceCache()
@@ -1,15 +1,22 @@
 from sqlalchemy.orm import Session
-from app.models.core import Model, Material, MaterialColourSurcharge, PricingOption, ShippingRate
+from app.models.core import Model, Material
 from app.models.enums import Carrier
-from typing import Optional
+from typing import Optional, List, Callable
+from app.services.pricing_cache import pricing_cache, PricingSnapshot
 
 LABOR_RATE_PER_HOUR = 15.0
 WASTE_PERCENTAGE = 0.05
+OPTION_NAMES = ("handle_zipper", "two_in_one_pocket", "music_rest_zipper")
 
 class PricingService:
     def __init__(self, db: Session):
         self.db = db
     
+    @property
+    def reference(self) -> PricingSnapshot:
+        """Pricing options, colour surcharges and shipping rates from the shared snapshot."""
+        return pricing_cache.get(self.db)
+    
     def calculate_area(self, width: float, depth: float, height: float) -> float:
         return 2 * (width * depth + width * height + depth * height)
     
@@ -29,11 +36,7 @@ class PricingService:
     def calculate_colour_surcharge(self, material_id: int, colour: Optional[str]) -> float:
         if not colour:
             return 0.0
-        surcharge = self.db.query(MaterialColourSurcharge).filter(
-            MaterialColourSurcharge.material_id == material_id,
-            MaterialColourSurcharge.colour == colour
-        ).first()
-        return surcharge.surcharge if surcharge else 0.0
+        return self.reference.colour_surcharges.get((material_id, colour), 0.0)
     
     def calculate_labour_cost(self, material: Material) -> float:
         return (material.labor_time_minutes / 60) * LABOR_RATE_PER_HOUR
@@ -44,19 +47,14 @@ class PricingService:
         two_in_one_pocket: bool, 
         music_rest_zipper: bool
     ) -> float:
+        option_prices = self.reference.option_prices
         total = 0.0
         if handle_zipper:
-            option = self.db.query(PricingOption).filter(PricingOption.name == "handle_zipper").first()
-            if option:
-                total += option.price
+            total += option_prices.get("handle_zipper", 0.0)
         if two_in_one_pocket:
-            option = self.db.query(PricingOption).filter(PricingOption.name == "two_in_one_pocket").first()
-            if option:
-                total += option.price
+            total += option_prices.get("two_in_one_pocket", 0.0)
         if music_rest_zipper:
-            option = self.db.query(PricingOption).filter(PricingOption.name == "music_rest_zipper").first()
-            if option:
-                total += option.price
+            total += option_prices.get("music_rest_zipper", 0.0)
         return total
     
     def calculate_weight(self, material: Material, area_with_waste: float) -> float:
@@ -70,21 +68,7 @@ class PricingService:
         carrier: Carrier = Carrier.USPS, 
         zone: str = "1"
     ) -> float:
-        rate = self.db.query(ShippingRate).filter(
-            ShippingRate.carrier == carrier,
-            ShippingRate.zone == zone,
-            ShippingRate.min_weight <= weight,
-            ShippingRate.max_weight >= weight
-        ).first()
-        if rate:
-            return rate.rate + rate.surcharge
-        highest_rate = self.db.query(ShippingRate).filter(
-            ShippingRate.carrier == carrier,
-            ShippingRate.zone == zone
-        ).order_by(ShippingRate.max_weight.desc()).first()
-        if highest_rate:
-            return highest_rate.rate + highest_rate.surcharge
-        return 10.0
+        return self.reference.shipping_index(carrier, zone).lookup(weight)
     
     def calculate_total(
         self,
@@ -104,13 +88,30 @@ class PricingService:
         if not model or not material:
             raise ValueError("Model or Material not found")
         
+        return self.build_quote(
+            model,
+            material,
+            quantity=quantity,
+            colour_surcharge=self.calculate_colour_surcharge(material_id, colour),
+            option_surcharge=self.calculate_option_surcharge(handle_zipper, two_in_one_pocket, music_rest_zipper),
+            shipping_lookup=lambda weight: self.lookup_shipping_rate(weight, carrier, zone)
+        )
+    
+    def build_quote(
+        self,
+        model: Model,
+        material: Material,
+        quantity: int,
+        colour_surcharge: float,
+        option_surcharge: float,
+        shipping_lookup: Callable[[float], float]
+    ) -> dict:
+        """Compute a quote once the reference data for it has been resolved."""
         area, waste_area = self.calculate_area_with_waste(model.width, model.depth, model.height)
         material_cost = self.calculate_material_cost(material, waste_area)
-        colour_surcharge = self.calculate_colour_surcharge(material_id, colour)
         labour_cost = self.calculate_labour_cost(material)
-        option_surcharge = self.calculate_option_surcharge(handle_zipper, two_in_one_pocket, music_rest_zipper)
         weight = self.calculate_weight(material, waste_area)
-        shipping_cost = self.lookup_shipping_rate(weight * quantity, carrier, zone)
+        shipping_cost = shipping_lookup(weight * quantity)
         
         unit_total = material_cost + colour_surcharge + labour_cost + option_surcharge
         total = (unit_total * quantity) + shipping_cost
@@ -127,3 +128,49 @@ class PricingService:
             "unit_total": round(unit_total, 2),
             "total": round(total, 2)
         }
+    
+    def calculate_batch(self, items: List[dict]) -> List[dict]:
+        """
+        Price many quote requests in a fixed number of queries.
+        
+        Every referenced model and material is prefetched up front, reference
+        data comes from the shared pricing snapshot, and the quotes are computed
+        in memory. Results come back in request order; an item that can't be
+        priced gets an error instead of failing the whole batch.
+        """
+        model_ids = {item["model_id"] for item in items}
+        material_ids = {item["material_id"] for item in items}
+        
+        models = {m.id: m for m in self.db.query(Model).filter(Model.id.in_(model_ids))} if model_ids else {}
+        materials = {m.id: m for m in self.db.query(Material).filter(Material.id.in_(material_ids))} if material_ids else {}
+        reference = self.reference
+        
+        results = []
+        for index, item in enumerate(items):
+            model = models.get(item["model_id"])
+            material = materials.get(item["material_id"])
+            if not model or not material:
+                results.append({"index": index, "result": None, "error": "Model or Material not found"})
+                continue
+            
+            try:
+                colour = item.get("colour")
+                colour_surcharge = reference.colour_surcharges.get((material.id, colour), 0.0) if colour else 0.0
+                option_surcharge = sum(reference.option_prices.get(name, 0.0) for name in OPTION_NAMES if item.get(name))
+                shipping_index = reference.shipping_index(item.get("carrier"), item.get("zone"))
+                
+                result = self.build_quote(
+                    model,
+                    material,
+                    quantity=item.get("quantity", 1),
+                    colour_surcharge=colour_surcharge,
+                    option_surcharge=option_surcharge,
+                    shipping_lookup=shipping_index.lookup
+                )
+            except Exception as e:
+                # Bad reference data (e.g. a zero linear_yard_width) fails only this item
+                results.append({"index": index, "result": None, "error": str(e) or type(e).__name__})
+                continue
+            results.append({"index": index, "result": result, "error": None})
+        
+        return results
@@ -0,0 +1,77 @@
+import heapq
+from bisect import bisect_right
+import numpy as np
+from typing import Sequence
+
+DEFAULT_SHIPPING_RATE = 10.0
+
+class ShippingRateIndex:
+    """
+    Sorted band structure for one carrier/zone that answers lookups by binary search.
+
+    Bands are given in id order, which is the precedence the original range
+    query used when several bands cover the same weight. The distinct band
+    endpoints split the weight axis into elementary slots - each endpoint
+    itself and the open gap after it - and the winning band for every slot
+    is resolved once at build time. A lookup is then a bisect into the
+    endpoints. Weights no band covers fall back to the heaviest band, and
+    an index without bands returns DEFAULT_SHIPPING_RATE.
+    """
+
+    def __init__(self, bands: Sequence):
+        if bands:
+            heaviest = max(bands, key=lambda b: b.max_weight)
+            self.fallback = heaviest.rate + heaviest.surcharge
+        else:
+            self.fallback = DEFAULT_SHIPPING_RATE
+
+        # Inverted bands still count for the fallback above but never match a weight
+        bands = [b for b in bands if b.min_weight <= b.max_weight]
+        self.endpoints = sorted({b.min_weight for b in bands} | {b.max_weight for b in bands})
+
+        position = {weight: i for i, weight in enumerate(self.endpoints)}
+        slot_count = max(2 * len(self.endpoints) - 1, 0)
+        starts = [[] for _ in range(slot_count)]
+        for priority, band in enumerate(bands):
+            starts[2 * position[band.min_weight]].append(
+                (priority, 2 * position[band.max_weight], band.rate + band.surcharge)
+            )
+
+        # Sweep the slots keeping covering bands in a heap ordered by precedence
+        slot_prices = [self.fallback] * slot_count
+        active = []
+        for slot in range(slot_count):
+            for entry in starts[slot]:
+                heapq.heappush(active, entry)
+            while active and active[0][1] < slot:
+                heapq.heappop(active)
+            if active:
+                slot_prices[slot] = active[0][2]
+
+        self.slot_prices = slot_prices
+        self._endpoint_array = np.array(self.endpoints, dtype=np.float64)
+        self._slot_price_array = np.array(slot_prices, dtype=np.float64)
+
+    def lookup(self, weight: float) -> float:
+        i = bisect_right(self.endpoints, weight) - 1
+        if i < 0:
+            return self.fallback
+        if self.endpoints[i] == weight:
+            return self.slot_prices[2 * i]
+        if i == len(self.endpoints) - 1:
+            return self.fallback
+        return self.slot_prices[2 * i + 1]
+
+    def lookup_many(self, weights) -> np.ndarray:
+        """Vectorized lookup for an array of weights."""
+        weights = np.asarray(weights, dtype=np.float64)
+        if not self.endpoints:
+            return np.full(weights.shape, self.fallback)
+
+        i = np.searchsorted(self._endpoint_array, weights, side="right") - 1
+        clipped = np.clip(i, 0, len(self.endpoints) - 1)
+        exact = self._endpoint_array[clipped] == weights
+        slot = np.where(exact, 2 * i, 2 * i + 1)
+        valid = (i >= 0) & (slot < len(self.slot_prices))
+        prices = self._slot_price_array[np.clip(slot, 0, len(self.slot_prices) - 1)]
+        return np.where(valid, prices, self.fallback)
@@ -0,0 +1,281 @@
+import logging
+from functools import lru_cache
+from collections import defaultdict
+from itertools import count
+from typing import Callable, Iterable, Optional
+from sqlalchemy import select, update, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.core import Model, Series, Manufacturer
+from app.services.prefix_range import prefix_range
+from app.services.catalog_version import catalog_version
+
+logger = logging.getLogger(__name__)
+
+PARENT_SKU_LENGTH = 40
+SKU_UPDATE_BATCH_SIZE = 1000
+
+# MFGR(8)-SERIES(8)-MODEL(13) is 31 characters; the version ("V" + number) follows
+SKU_VERSION_START = 31
+SKU_SEGMENTS_LENGTH = 18  # MFGR(8)-SERIES(8)-
+
+
+@lru_cache(maxsize=8192)
+def process_name(name: str, max_len: int, pad_char: str = "X") -> str:
+    """
+    One SKU segment: camelCased, alphanumeric only, upper-cased, cut or padded to max_len.
+
+    Cached because the same manufacturer and series names recur on every one
+    of their models.
+    """
+    # Split by spaces and camelCase each word
+    words = name.split()
+    if len(words) > 1:
+        # CamelCase: capitalize first letter of each word
+        result = "".join(word.capitalize() for word in words)
+    else:
+        result = name.capitalize()
+
+    # Remove any non-alphanumeric characters
+    result = "".join(c for c in result if c.isalnum())
+
+    # Truncate to max length
+    result = result[:max_len].upper()
+
+    # Pad with pad_char if shorter than max_len
+    result = result.ljust(max_len, pad_char)
+
+    return result
+
+
+def generate_parent_sku(manufacturer_name: str, series_name: str, model_name: str, version: str = "V1") -> str:
+    """
+    Generate a 40-character parent SKU.
+    Format: MFGR(8)-SERIES(8)-MODEL(13)V1 + zeros
+    Multi-word names are concatenated and camelCased.
+    """
+    # Process each part
+    mfgr_part = process_name(manufacturer_name, 8)  # 8 chars
+    series_part = process_name(series_name, 8)      # 8 chars
+    model_part = process_name(model_name, 13)       # 13 chars
+
+    # Version fills at most the space left before the 40th character
+    version_part = version[:PARENT_SKU_LENGTH - SKU_VERSION_START].upper()
+
+    # Build SKU: MFGR-SERIES-MODEL+VERSION (8+1+8+1+13+2 = 33 for V1..V9)
+    sku = f"{mfgr_part}-{series_part}-{model_part}{version_part}"
+
+    # Pad with zeros to reach 40 characters
+    sku = sku.ljust(PARENT_SKU_LENGTH, "0")
+
+    return sku
+
+
+def sku_base(sku: str) -> str:
+    """Everything up to and including the "V" of the version: models that collide share it."""
+    return sku[:SKU_VERSION_START + 1]
+
+
+def sku_version(sku: Optional[str]) -> Optional[int]:
+    """Version number of a generated SKU, or None if the SKU does not follow the format."""
+    if not sku or len(sku) != PARENT_SKU_LENGTH or sku[SKU_VERSION_START] != "V":
+        return None
+    digits = sku[SKU_VERSION_START + 1:].rstrip("0")
+    return int(digits) if digits.isdigit() else None
+
+
+def free_versions(taken: Iterable[int]):
+    """
+    Version numbers not in taken, smallest first.
+
+    Numbers ending in 0 are skipped: with zero padding "V10" reads the same
+    as "V1", so they could never be told apart.
+    """
+    taken = set(taken)
+    return (n for n in count(1) if n % 10 and n not in taken)
+
+
+def is_parent_sku_conflict(error: IntegrityError) -> bool:
+    """Whether the unique index on models.parent_sku rejected the write, rather than a name constraint."""
+    return "parent_sku" in str(error.orig)
+
+
+class SkuService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def regenerate_all(self, progress: Optional[Callable[[int, int], None]] = None) -> dict:
+        """
+        Recompute every model's parent SKU and store the ones that changed.
+
+        Changed SKUs are written as executemany UPDATEs of SKU_UPDATE_BATCH_SIZE
+        rows and committed once at the end, together with a catalog version
+        bump when anything changed. progress is called with
+        (models written, models to write) after each batch.
+        """
+        scanned, changes = self._sku_changes()
+        logger.info("SKU regeneration: %d models scanned, %d SKUs changed", scanned, len(changes))
+
+        try:
+            self._write_skus(changes, progress)
+            if changes:
+                catalog_version.bump(self.db)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return {"scanned": scanned, "updated": len(changes)}
+
+    def refresh_for_manufacturer(self, manufacturer_id: int) -> int:
+        """
+        Recompute the SKUs of one manufacturer's models after its name changed.
+
+        Flushes pending changes so the new name is read back, writes the
+        changed SKUs in the caller's transaction and leaves the commit to the
+        caller. Returns the number of SKUs updated.
+        """
+        self.db.flush()
+        _, changes = self._sku_changes(Series.manufacturer_id == manufacturer_id)
+        self._write_skus(changes)
+        return len(changes)
+
+    def refresh_for_series(self, series_id: int) -> int:
+        """Like refresh_for_manufacturer, for one series' models after a rename or move."""
+        self.db.flush()
+        _, changes = self._sku_changes(Model.series_id == series_id)
+        self._write_skus(changes)
+        return len(changes)
+
+    def assign_parent_sku(
+        self,
+        manufacturer_name: str,
+        series_name: str,
+        model_name: str,
+        model_id: Optional[int] = None,
+        current_sku: Optional[str] = None
+    ) -> str:
+        """
+        Parent SKU for one model, with a version suffix that no other model uses.
+
+        Other models' SKUs sharing this model's base are found with one range
+        seek on the parent_sku index. A model keeps its current version while
+        that still matches its names; otherwise it gets the smallest free one,
+        so the first model with a given base is V1, the next V2, and so on.
+        """
+        base = sku_base(generate_parent_sku(manufacturer_name, series_name, model_name))
+        stmt = select(Model.parent_sku).where(*prefix_range(Model.parent_sku, base))
+        if model_id is not None:
+            stmt = stmt.where(Model.id != model_id)
+        taken = {sku_version(sku) for sku in self.db.execute(stmt).scalars()}
+        
+        if current_sku and sku_base(current_sku) == base:
+            version = sku_version(current_sku)
+            if version is not None and version not in taken:
+                return current_sku
+        version = next(free_versions(taken))
+        return generate_parent_sku(manufacturer_name, series_name, model_name, f"V{version}")
+
+    def _sku_changes(self, *criteria) -> tuple:
+        """
+        (models scanned, [{"id", "parent_sku"}] for models whose SKU is out of date).
+
+        Models are read together with their series and manufacturer names in
+        one joined query, narrowed by criteria; models whose series or
+        manufacturer is missing are skipped. Versions held by models outside
+        the scan are left alone, then models that share a base keep their
+        current version where they can and the rest, in id order, take the
+        smallest free one.
+        """
+        rows = self.db.execute(
+            select(Model.id, Model.name, Model.parent_sku, Series.name, Manufacturer.name)
+            .join(Series, Model.series_id == Series.id)
+            .join(Manufacturer, Series.manufacturer_id == Manufacturer.id)
+            .where(*criteria)
+            .order_by(Model.id)
+        ).all()
+        
+        groups = defaultdict(list)
+        for model_id, model_name, current_sku, series_name, manufacturer_name in rows:
+            names = (manufacturer_name, series_name, model_name)
+            groups[sku_base(generate_parent_sku(*names))].append((model_id, current_sku, names))
+        
+        taken = defaultdict(set)
+        for sku in self._skus_outside(rows, groups, bool(criteria)):
+            taken[sku_base(sku)].add(sku_version(sku))
+        
+        changes = []
+        for base, members in groups.items():
+            used = taken[base]
+            unresolved = []
+            for model_id, current_sku, names in members:
+                version = sku_version(current_sku)
+                if current_sku and sku_base(current_sku) == base and version is not None and version not in used:
+                    used.add(version)
+                else:
+                    unresolved.append((model_id, current_sku, names))
+            
+            versions = free_versions(used)
+            for model_id, current_sku, names in unresolved:
+                parent_sku = generate_parent_sku(*names, f"V{next(versions)}")
+                if parent_sku != current_sku:
+                    changes.append({"id": model_id, "parent_sku": parent_sku})
+        return len(rows), changes
+
+    def _skus_outside(self, rows: list, groups: dict, partial: bool) -> list:
+        """SKUs of models not in rows that could collide with the bases in groups."""
+        scanned_ids = {row[0] for row in rows}
+        if not partial:
+            stmt = select(Model.id, Model.parent_sku).where(Model.parent_sku.isnot(None))
+            return [sku for model_id, sku in self.db.execute(stmt) if model_id not in scanned_ids]
+        
+        # One range seek per manufacturer/series segment pair on the parent_sku index
+        skus = []
+        for segments in {base[:SKU_SEGMENTS_LENGTH] for base in groups}:
+            stmt = select(Model.id, Model.parent_sku).where(*prefix_range(Model.parent_sku, segments))
+            skus.extend(sku for model_id, sku in self.db.execute(stmt) if model_id not in scanned_ids)
+        return skus
+
+    def _write_skus(self, changes: list, progress: Optional[Callable[[int, int], None]] = None):
+        """
+        UPDATE parent_sku by primary key from {"id", "parent_sku"} dicts, in batches.
+
+        The changed rows are cleared first so that SKUs moving from one model
+        to another never trip the unique index halfway through.
+        """
+        if progress:
+            progress(0, len(changes))
+        for start in range(0, len(changes), SKU_UPDATE_BATCH_SIZE):
+            batch = changes[start:start + SKU_UPDATE_BATCH_SIZE]
+            self.db.execute(update(Model), [{"id": change["id"], "parent_sku": None} for change in batch])
+        for start in range(0, len(changes), SKU_UPDATE_BATCH_SIZE):
+            batch = changes[start:start + SKU_UPDATE_BATCH_SIZE]
+            self.db.execute(update(Model), batch)
+            done = start + len(batch)
+            logger.debug("SKU regeneration: %d/%d written", done, len(changes))
+            if progress:
+                progress(done, len(changes))
+
+    def find_collisions(self, limit: Optional[int] = None) -> list:
+        """
+        Groups of models whose names produce the same base SKU, in SKU order.
+
+        One pass over the parent_sku index: each SKU is counted against the
+        others with the same base by a window function.
+        """
+        base = func.substr(Model.parent_sku, 1, SKU_VERSION_START + 1)
+        shared = select(
+            Model.id, Model.name, Model.series_id, Model.parent_sku,
+            func.count().over(partition_by=base).label("group_size")
+        ).where(Model.parent_sku.isnot(None)).subquery()
+        stmt = select(shared.c.id, shared.c.name, shared.c.series_id, shared.c.parent_sku).where(
+            shared.c.group_size > 1
+        ).order_by(shared.c.parent_sku)
+        
+        groups = []
+        for model_id, name, series_id, parent_sku in self.db.execute(stmt):
+            if not groups or groups[-1]["base_sku"] != sku_base(parent_sku):
+                if limit is not None and len(groups) == limit:
+                    break
+                groups.append({"base_sku": sku_base(parent_sku), "models": []})
+            groups[-1]["models"].append({"id": model_id, "name": name, "series_id": series_id, "parent_sku": parent_sku})
+        return groups
@@ -0,0 +1,86 @@
+from io import BytesIO
+from typing import Any, Iterator, Optional, List
+from openpyxl import load_workbook
+
+TEMPLATE_HEADER_ROW_COUNT = 6
+
+
+def normalize_cell(value: Any) -> Any:
+    """Blank strings count as empty and whole-number floats read back as ints."""
+    if value == "":
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def cell_text(row: tuple, col_idx: int) -> Optional[str]:
+    """Stripped text of one cell, or None when the cell is missing or empty."""
+    if col_idx >= len(row):
+        return None
+    value = normalize_cell(row[col_idx])
+    return str(value).strip() if value is not None else None
+
+
+def cell_texts(row: tuple, start: int) -> List[str]:
+    """Stripped text of every non-empty cell from column start onwards."""
+    return [str(value).strip() for value in map(normalize_cell, row[start:]) if value is not None]
+
+
+class MissingSheetError(ValueError):
+    def __init__(self, sheet_name: str):
+        super().__init__(f"Worksheet named '{sheet_name}' not found")
+        self.sheet_name = sheet_name
+
+
+class TemplateWorkbook:
+    """
+    One read-only, streaming pass over an uploaded Amazon template.
+
+    The archive is opened once and each sheet's XML is only parsed when its
+    rows are iterated, so sheets the import never asks for are never read.
+    Rows come back as raw value tuples; nothing is materialized per sheet.
+    """
+
+    def __init__(self, contents: bytes):
+        self._workbook = load_workbook(BytesIO(contents), read_only=True, data_only=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._workbook.close()
+
+    def rows(self, sheet_name: str, min_row: int = 1) -> Iterator[tuple]:
+        if sheet_name not in self._workbook.sheetnames:
+            raise MissingSheetError(sheet_name)
+        return self._workbook[sheet_name].iter_rows(min_row=min_row, values_only=True)
+
+    def header_rows(self, sheet_name: str = "Template") -> List[List[Optional[str]]]:
+        """
+        First TEMPLATE_HEADER_ROW_COUNT rows as strings, padded to the sheet's used width.
+
+        The width is the rightmost non-empty cell over the whole sheet, so every
+        header row lines up with the widest row even when it ends early.
+        """
+        headers = []
+        width = 0
+        row_count = 0
+        for row_idx, row in enumerate(self.rows(sheet_name)):
+            values = [normalize_cell(value) for value in row]
+            while values and values[-1] is None:
+                values.pop()
+            if values:
+                width = max(width, len(values))
+                row_count = row_idx + 1
+            if row_idx < TEMPLATE_HEADER_ROW_COUNT:
+                headers.append(values)
+
+        # Blank rows after the last used row are not part of the sheet
+        return [
+            [str(value) if value is not None else None for value in row] + [None] * (width - len(row))
+            for row in headers[:row_count]
+        ]
@@ -1,107 +1,184 @@
-import pandas as pd
 import json
-from io import BytesIO
+import logging
+import threading
+import time
+from collections import Counter
+from sqlalchemy import insert, select, update, delete
 from sqlalchemy.orm import Session
-from fastapi import UploadFile
 from app.models.templates import AmazonProductType, ProductTypeKeyword, ProductTypeField, ProductTypeFieldValue
+from app.services.template_parser import TemplateWorkbook, MissingSheetError, cell_text, cell_texts
+from app.services.label_matcher import SubstringIndex
 
-class TemplateService:
-    def __init__(self, db: Session):
-        self.db = db
-    
-    async def import_amazon_template(self, file: UploadFile, product_code: str) -> dict:
-        """
-        Import Amazon template with this EXACT logic:
-        
-        STEP 1: DATA DEFINITIONS sheet - ONLY get:
-          - Group names (Column A when Column B is empty)
-          - Field names (Column B)
-          - Local Label names (Column C)
-          - Column D is just descriptions, NOT valid values!
-        
-        STEP 2: VALID VALUES sheet - Get selectable options:
-          - Column A = Group name (when Column B empty)
-          - Column B = "Local Label - [field_hint]" format
-          - Column C onwards = The actual valid values users can select
-        
-        STEP 3: DEFAULT VALUES sheet - Get defaults and additional values:
-          - Column A = Local Label Name
-          - Column B = Field Name
-          - Column C = Default value to pre-select
-          - Column D onwards = Additional values to ADD to valid values
-        
-        STEP 4: TEMPLATE sheet - Get field order for export
-        """
-        contents = await file.read()
-        excel_file = BytesIO(contents)
-        
-        existing = self.db.query(AmazonProductType).filter(
-            AmazonProductType.code == product_code
-        ).first()
-        
-        existing_field_settings = {}
-        if existing:
-            existing_fields = self.db.query(ProductTypeField).filter(
-                ProductTypeField.product_type_id == existing.id
-            ).all()
-            for field in existing_fields:
-                existing_field_settings[field.field_name] = {
-                    'required': field.required,
-                    'selected_value': field.selected_value,
-                    'custom_value': field.custom_value
-                }
-            
-            self.db.query(ProductTypeFieldValue).filter(
-                ProductTypeFieldValue.product_type_field_id.in_(
-                    self.db.query(ProductTypeField.id).filter(
-                        ProductTypeField.product_type_id == existing.id
-                    )
-                )
-            ).delete(synchronize_session=False)
-            self.db.query(ProductTypeField).filter(
-                ProductTypeField.product_type_id == existing.id
-            ).delete(synchronize_session=False)
-            self.db.query(ProductTypeKeyword).filter(
-                ProductTypeKeyword.product_type_id == existing.id
-            ).delete(synchronize_session=False)
-            self.db.commit()
-            product_type = existing
+logger = logging.getLogger(__name__)
+
+IMPORT_INSERT_BATCH_SIZE = 5000
+
+# SQLite allows one writer at a time, so every import in this process (the sync
+# endpoint, the batch endpoint and import jobs) takes this lock around its writes
+# rather than racing another import into "database is locked"
+_import_write_lock = threading.Lock()
+
+# Field columns a re-import takes from the template; required and selected_value stay user-owned
+TEMPLATE_FIELD_COLUMNS = ("display_name", "attribute_group", "order_index", "custom_value")
+
+
+def diff_multiset(existing: list, desired: list) -> tuple:
+    """
+    Compare stored (id, value) rows with the wanted values, duplicates included.
+
+    Returns the values to insert, in desired order, and the ids of stored rows
+    to delete. Rows whose value is still wanted are left as they are, so they
+    keep their place ahead of the inserted ones: stored order is insertion
+    (id) order, not the order of the latest import.
+    """
+    available = Counter(value for _, value in existing)
+    to_insert = []
+    for value in desired:
+        if available[value] > 0:
+            available[value] -= 1
         else:
-            product_type = AmazonProductType(
-                code=product_code,
-                name=product_code.replace("_", " ").title()
-            )
-            self.db.add(product_type)
-            self.db.commit()
-            self.db.refresh(product_type)
-        
-        fields_imported = 0
-        keywords_imported = 0
+            to_insert.append(value)
+
+    wanted = Counter(desired)
+    to_delete = []
+    for row_id, value in existing:
+        if wanted[value] > 0:
+            wanted[value] -= 1
+        else:
+            to_delete.append(row_id)
+    return to_insert, to_delete
+
+
+class PhaseTimer:
+    """Records wall-clock seconds spent in each named phase of an import."""
+
+    def __init__(self):
+        self.timings = {}
+        self._started = time.perf_counter()
+        self._mark = self._started
+
+    def lap(self, phase: str):
+        now = time.perf_counter()
+        self.timings[phase] = round(now - self._mark, 4)
+        self._mark = now
+
+    def finish(self) -> dict:
+        self.timings["total"] = round(time.perf_counter() - self._started, 4)
+        return self.timings
+
+
+class ImportDiagnostics:
+    """
+    Machine-readable report of one import: counts per step, rows that matched
+    no field, sheets the workbook lacks and steps that failed. Per-row detail
+    goes to the module logger at debug level instead.
+    """
+
+    def __init__(self):
+        self.steps = {}
+        self.unmatched_valid_value_labels = []
+        self.unmatched_default_values = []
+        self.missing_sheets = []
+        self.errors = []
+
+    def count(self, step: str, counter: str, amount: int = 1):
+        counts = self.steps.setdefault(step, {})
+        counts[counter] = counts.get(counter, 0) + amount
+
+    def error(self, step: str, exc: Exception):
+        # Not every template ships every sheet (Default Values is often absent)
+        if isinstance(exc, MissingSheetError):
+            logger.debug("Template import step %s skipped: %s", step, exc)
+            self.missing_sheets.append(exc.sheet_name)
+            return
+        logger.warning("Template import step %s failed: %s", step, exc)
+        self.errors.append({"step": step, "message": str(exc)})
+
+    def to_dict(self) -> dict:
+        return {
+            "steps": self.steps,
+            "unmatched_valid_value_labels": self.unmatched_valid_value_labels,
+            "unmatched_default_values": self.unmatched_default_values,
+            "missing_sheets": self.missing_sheets,
+            "errors": self.errors
+        }
+
+
+class ParsedTemplate:
+    """
+    Everything an import takes from a workbook, before touching the database.
+
+    Holds one entry per template column in `fields` (name, display name, group,
+    order, default value and the merged valid values) plus the keywords,
+    header rows, diagnostics and parse timings. Plain data, so it can be
+    built in a worker process and sent back to the caller.
+    """
+
+    def __init__(self):
+        self.fields = []
+        self.keywords = []
+        self.header_rows = None
+        self.valid_values_imported = 0
+        self.diagnostics = ImportDiagnostics()
+        self.timings = {}
+
+
+def parse_amazon_template(contents: bytes) -> ParsedTemplate:
+    """
+    Parse an Amazon template with this EXACT logic:
+    
+    STEP 1: DATA DEFINITIONS sheet - ONLY get:
+      - Group names (Column A when Column B is empty)
+      - Field names (Column B)
+      - Local Label names (Column C)
+      - Column D is just descriptions, NOT valid values!
+    
+    STEP 2: VALID VALUES sheet - Get selectable options:
+      - Column A = Group name (when Column B empty)
+      - Column B = "Local Label - [field_hint]" format
+      - Column C onwards = The actual valid values users can select
+    
+    STEP 3: DEFAULT VALUES sheet - Get defaults and additional values:
+      - Column A = Local Label Name
+      - Column B = Field Name
+      - Column C = Default value to pre-select
+      - Column D onwards = Additional values to ADD to valid values
+    
+    STEP 4: TEMPLATE sheet - Get field order for export
+    
+    The workbook is opened once in read-only mode and each sheet is streamed
+    as raw row tuples. Does no database work.
+    """
+    timer = PhaseTimer()
+    parsed = ParsedTemplate()
+    diagnostics = parsed.diagnostics
+    
+    try:
+        workbook = TemplateWorkbook(contents)
+    except Exception as e:
+        raise ValueError(f"Could not read workbook: {e}")
+    timer.lap("open_workbook")
+    
+    with workbook:
         valid_values_imported = 0
         
         field_definitions = {}
         local_label_to_field = {}
         
-        print("=" * 60)
-        print("STEP 1: Parsing DATA DEFINITIONS sheet")
-        print("=" * 60)
+        logger.debug("STEP 1: Parsing DATA DEFINITIONS sheet")
         
         try:
-            dd_df = pd.read_excel(excel_file, sheet_name="Data Definitions", header=None)
-            excel_file.seek(0)
-            
             current_group = None
             
-            for row_idx in range(2, len(dd_df)):
-                row = dd_df.iloc[row_idx]
-                
-                col_a = str(row.iloc[0]).strip() if pd.notna(row.iloc[0]) else None
-                col_b = str(row.iloc[1]).strip() if len(row) > 1 and pd.notna(row.iloc[1]) else None
-                col_c = str(row.iloc[2]).strip() if len(row) > 2 and pd.notna(row.iloc[2]) else None
+            for row in workbook.rows("Data Definitions", min_row=3):
+                col_a = cell_text(row, 0)
+                col_b = cell_text(row, 1)
+                col_c = cell_text(row, 2)
                 
                 if col_a and not col_b:
                     current_group = col_a
-                    print(f"  GROUP: {current_group}")
+                    diagnostics.count("data_definitions", "groups")
+                    logger.debug("  GROUP: %s", current_group)
                     continue
                 
                 if col_b:
@@ -116,34 +193,35 @@ class TemplateService:
                     if local_label:
                         local_label_to_field[local_label] = field_name
                     
-                    print(f"    Field: {field_name[:40]}... | Label: {local_label}")
+                    logger.debug("    Field: %s | Label: %s", field_name, local_label)
             
-            print(f"  TOTAL: {len(field_definitions)} fields from Data Definitions")
+            diagnostics.count("data_definitions", "fields", len(field_definitions))
+            diagnostics.count("data_definitions", "local_labels", len(local_label_to_field))
             
         except Exception as e:
-            print(f"  ERROR: {e}")
+            diagnostics.error("data_definitions", e)
+        
+        # Fallback matchers, built once: field names by hint, local labels case-insensitively
+        field_hint_index = SubstringIndex((fn, fn) for fn in field_definitions)
+        local_label_index = SubstringIndex(local_label_to_field.items(), case_sensitive=False)
+        timer.lap("parse_data_definitions")
         
         valid_values_by_field = {}
+        keyword_values = []
         
-        print("=" * 60)
-        print("STEP 2: Parsing VALID VALUES sheet")
-        print("=" * 60)
+        logger.debug("STEP 2: Parsing VALID VALUES sheet")
         
         try:
-            vv_df = pd.read_excel(excel_file, sheet_name="Valid Values", header=None)
-            excel_file.seek(0)
-            
             current_vv_group = None
             
-            for row_idx in range(len(vv_df)):
-                row = vv_df.iloc[row_idx]
-                
-                col_a = str(row.iloc[0]).strip() if pd.notna(row.iloc[0]) else None
-                col_b = str(row.iloc[1]).strip() if len(row) > 1 and pd.notna(row.iloc[1]) else None
+            for row in workbook.rows("Valid Values"):
+                col_a = cell_text(row, 0)
+                col_b = cell_text(row, 1)
                 
                 if col_a and not col_b:
                     current_vv_group = col_a
-                    print(f"  GROUP: {current_vv_group}")
+                    diagnostics.count("valid_values", "groups")
+                    logger.debug("  GROUP: %s", current_vv_group)
                     continue
                 
                 if col_b:
@@ -158,7 +236,7 @@ class TemplateService:
                     else:
                         local_label_part = col_b
                     
-                    values = [str(v).strip() for v in row.iloc[2:] if pd.notna(v)]
+                    values = cell_texts(row, 2)
                     
                     matched_field = None
                     
@@ -166,79 +244,57 @@ class TemplateService:
                         matched_field = local_label_to_field[local_label_part]
                     
                     if not matched_field and field_hint:
-                        for fn in field_definitions.keys():
-                            if field_hint in fn:
-                                matched_field = fn
-                                break
+                        matched_field = field_hint_index.containing(field_hint)
                     
                     if not matched_field and local_label_part:
-                        for label, fn in local_label_to_field.items():
-                            if local_label_part.lower() in label.lower() or label.lower() in local_label_part.lower():
-                                matched_field = fn
-                                break
+                        matched_field = local_label_index.overlapping(local_label_part)
                     
                     if matched_field:
                         if matched_field not in valid_values_by_field:
                             valid_values_by_field[matched_field] = []
                         valid_values_by_field[matched_field].extend(values)
                         valid_values_imported += len(values)
-                        print(f"    Matched '{local_label_part}' -> {len(values)} values")
+                        diagnostics.count("valid_values", "rows_matched")
+                        logger.debug("    Matched '%s' -> %d values", local_label_part, len(values))
                         
                         if local_label_part == "Item Type Keyword":
-                            for value in values:
-                                kw = ProductTypeKeyword(
-                                    product_type_id=product_type.id,
-                                    keyword=value
-                                )
-                                self.db.add(kw)
-                                keywords_imported += 1
+                            keyword_values.extend(values)
                     else:
-                        print(f"    NO MATCH: {local_label_part}")
+                        diagnostics.count("valid_values", "rows_unmatched")
+                        diagnostics.unmatched_valid_value_labels.append(col_b)
+                        logger.debug("    NO MATCH: %s", local_label_part)
             
-            self.db.commit()
-            print(f"  TOTAL: {valid_values_imported} valid values")
+            diagnostics.count("valid_values", "values", valid_values_imported)
+            diagnostics.count("valid_values", "keywords", len(keyword_values))
             
         except Exception as e:
-            print(f"  ERROR: {e}")
+            diagnostics.error("valid_values", e)
+        timer.lap("parse_valid_values")
         
         template_field_order = {}
         
-        print("=" * 60)
-        print("STEP 3: Parsing TEMPLATE sheet")
-        print("=" * 60)
+        logger.debug("STEP 3: Parsing TEMPLATE sheet")
         
         try:
-            template_df = pd.read_excel(excel_file, sheet_name="Template", header=None)
-            excel_file.seek(0)
-            
-            header_rows = []
-            for i in range(min(6, len(template_df))):
-                row_data = []
-                for val in template_df.iloc[i]:
-                    if pd.isna(val):
-                        row_data.append(None)
-                    else:
-                        row_data.append(str(val))
-                header_rows.append(row_data)
-            
-            product_type.header_rows = header_rows
+            header_rows = workbook.header_rows("Template")
+            parsed.header_rows = header_rows
             
-            row5_field_names = template_df.iloc[4].tolist() if len(template_df) > 4 else []
-            row4_display_names = template_df.iloc[3].tolist() if len(template_df) > 3 else []
-            row3_groups = template_df.iloc[2].tolist() if len(template_df) > 2 else []
+            row5_field_names = header_rows[4] if len(header_rows) > 4 else []
+            row4_display_names = header_rows[3] if len(header_rows) > 3 else []
+            row3_groups = header_rows[2] if len(header_rows) > 2 else []
             
             current_group = None
             for idx, field_name in enumerate(row5_field_names):
-                if pd.isna(field_name):
+                if field_name is None:
                     continue
                 
-                field_name_str = str(field_name).strip()
+                field_name_str = field_name.strip()
                 
-                group_from_template = str(row3_groups[idx]).strip() if idx < len(row3_groups) and pd.notna(row3_groups[idx]) else None
+                group_from_template = cell_text(row3_groups, idx)
                 if group_from_template:
                     current_group = group_from_template
                 
-                display_name = str(row4_display_names[idx]).strip() if idx < len(row4_display_names) and pd.notna(row4_display_names[idx]) else None
+                display_name = cell_text(row4_display_names, idx)
                 
                 template_field_order[field_name_str] = {
                     "order_index": idx,
@@ -246,31 +302,31 @@ class TemplateService:
                     "group_from_template": current_group
                 }
             
-            self.db.commit()
-            print(f"  TOTAL: {len(template_field_order)} fields in template")
+            diagnostics.count("template", "header_rows", len(header_rows))
+            diagnostics.count("template", "fields", len(template_field_order))
             
         except Exception as e:
-            print(f"  ERROR: {e}")
+            diagnostics.error("template", e)
+        timer.lap("parse_template")
         
-        all_known_fields = set(field_definitions.keys()) | set(template_field_order.keys())
+        # Data Definitions order first, then fields only present in the template,
+        # so the first partial match for a Default Values row is deterministic
+        known_field_order = list(field_definitions) + [
+            fn for fn in template_field_order if fn not in field_definitions
+        ]
+        all_known_fields = set(known_field_order)
+        known_field_index = SubstringIndex((fn, fn) for fn in known_field_order)
         
         default_values_by_field = {}
         other_values_by_field = {}
         
-        print("=" * 60)
-        print("STEP 4: Parsing DEFAULT VALUES sheet")
-        print("=" * 60)
+        logger.debug("STEP 4: Parsing DEFAULT VALUES sheet")
         
         try:
-            dv_df = pd.read_excel(excel_file, sheet_name="Default Values", header=None)
-            excel_file.seek(0)
-            
-            for row_idx in range(1, len(dv_df)):
-                row = dv_df.iloc[row_idx]
-                
-                col_a_local_label = str(row.iloc[0]).strip() if pd.notna(row.iloc[0]) else None
-                col_b_field_name = str(row.iloc[1]).strip() if len(row) > 1 and pd.notna(row.iloc[1]) else None
-                col_c_default = str(row.iloc[2]).strip() if len(row) > 2 and pd.notna(row.iloc[2]) else None
+            for row in workbook.rows("Default Values", min_row=2):
+                col_a_local_label = cell_text(row, 0)
+                col_b_field_name = cell_text(row, 1)
+                col_c_default = cell_text(row, 2)
                 
                 if not col_a_local_label and not col_b_field_name:
                     continue
@@ -283,46 +339,157 @@ class TemplateService:
                     matched_field = local_label_to_field[col_a_local_label]
                 
                 if not matched_field and col_b_field_name:
-                    for fn in all_known_fields:
-                        if col_b_field_name in fn or fn in col_b_field_name:
-                            matched_field = fn
-                            break
+                    matched_field = known_field_index.overlapping(col_b_field_name)
                 
                 if matched_field:
                     if col_c_default:
                         default_values_by_field[matched_field] = col_c_default
-                        print(f"    Default: {col_a_local_label} = {col_c_default[:30]}...")
+                        logger.debug("    Default: %s = %s", col_a_local_label, col_c_default)
                     
-                    other_values = [str(v).strip() for v in row.iloc[3:] if pd.notna(v)]
+                    other_values = cell_texts(row, 3)
                     if other_values:
                         if matched_field not in other_values_by_field:
                             other_values_by_field[matched_field] = []
                         other_values_by_field[matched_field].extend(other_values)
-                        print(f"    Other values: {col_a_local_label} +{len(other_values)}")
+                        logger.debug("    Other values: %s +%d", col_a_local_label, len(other_values))
+                    diagnostics.count("default_values", "rows_matched")
                 else:
+                    diagnostics.count("default_values", "rows_unmatched")
+                    diagnostics.unmatched_default_values.append({
+                        "local_label": col_a_local_label,
+                        "field_name": col_b_field_name
+                    })
                     if col_b_field_name:
-                        print(f"    NO MATCH: {col_a_local_label} | {col_b_field_name[:40]}...")
+                        logger.debug("    NO MATCH: %s | %s", col_a_local_label, col_b_field_name)
             
-            print(f"  TOTAL: {len(default_values_by_field)} defaults, {len(other_values_by_field)} with other values")
+            diagnostics.count("default_values", "defaults", len(default_values_by_field))
+            diagnostics.count("default_values", "fields_with_other_values", len(other_values_by_field))
             
         except Exception as e:
-            print(f"  Default Values sheet: {e}")
+            diagnostics.error("default_values", e)
+        timer.lap("parse_default_values")
+    
+    for field_name, template_info in template_field_order.items():
+        dd_info = field_definitions.get(field_name, {})
+        default_value = default_values_by_field.get(field_name)
         
-        print("=" * 60)
-        print("STEP 5: Creating database records")
-        print("=" * 60)
+        all_values = []
+        if field_name in valid_values_by_field:
+            all_values.extend(valid_values_by_field[field_name])
+        if field_name in other_values_by_field:
+            for ov in other_values_by_field[field_name]:
+                if ov not in all_values:
+                    all_values.append(ov)
+        if default_value and default_value not in all_values:
+            all_values.insert(0, default_value)
         
-        field_name_to_db = {}
+        parsed.fields.append({
+            "field_name": field_name,
+            "display_name": template_info.get("display_name") or dd_info.get("local_label"),
+            "attribute_group": dd_info.get("group_name") or template_info.get("group_from_template"),
+            "order_index": template_info["order_index"],
+            "default_value": default_value,
+            "values": all_values
+        })
+    
+    parsed.keywords = keyword_values
+    parsed.valid_values_imported = valid_values_imported
+    timer.lap("merge_fields")
+    parsed.timings = timer.finish()
+    return parsed
+
+
+class TemplateService:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def import_amazon_template(self, contents: bytes, product_code: str) -> dict:
+        """
+        Parse an Amazon template workbook (see parse_amazon_template) and store it.
         
-        for field_name, template_info in template_field_order.items():
-            dd_info = field_definitions.get(field_name, {})
-            
-            group_name = dd_info.get("group_name") or template_info.get("group_from_template")
-            local_label = dd_info.get("local_label")
-            display_name = template_info.get("display_name") or local_label
-            default_value = default_values_by_field.get(field_name)
+        Parsing and writes are synchronous; call this from a worker thread,
+        never directly on the event loop.
+        """
+        return self.import_parsed_template(parse_amazon_template(contents), product_code)
+    
+    def import_parsed_template(self, parsed: ParsedTemplate, product_code: str) -> dict:
+        """
+        Store a parsed template under product_code.
+        
+        Re-importing an existing product code diffs the parsed template against
+        the stored rows and only inserts, updates or deletes what changed, so
+        field ids survive. Fields follow the new template's order through
+        order_index; valid values and keywords that survive keep their
+        original position and new ones are appended (see diff_multiset).
+        Everything is committed in one transaction, so a failed import leaves
+        the previous version intact. Imports are written one at a time;
+        parsing needs no lock and can run concurrently.
+        """
+        timer = PhaseTimer()
+        with _import_write_lock:
+            timer.lap("wait_for_writer")
+            try:
+                result = self._write_parsed_template(parsed, product_code, timer)
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            timer.lap("commit")
+        
+        write_timings = timer.finish()
+        result["timings"] = {
+            **{phase: seconds for phase, seconds in parsed.timings.items() if phase != "total"},
+            **{phase: seconds for phase, seconds in write_timings.items() if phase != "total"},
+            "total": round(parsed.timings.get("total", 0) + write_timings["total"], 4)
+        }
+        return result
+    
+    def _write_parsed_template(self, parsed: ParsedTemplate, product_code: str, timer: PhaseTimer) -> dict:
+        existing = self.db.query(AmazonProductType).filter(
+            AmazonProductType.code == product_code
+        ).first()
+        
+        existing_fields = {}
+        duplicate_field_ids = []
+        if existing:
+            for field in self.db.execute(
+                select(
+                    ProductTypeField.id, ProductTypeField.field_name,
+                    ProductTypeField.required, ProductTypeField.selected_value,
+                    *(getattr(ProductTypeField, c) for c in TEMPLATE_FIELD_COLUMNS)
+                ).where(
+                    ProductTypeField.product_type_id == existing.id
+                ).order_by(ProductTypeField.id)
+            ):
+                if field.field_name in existing_fields:
+                    duplicate_field_ids.append(field.id)
+                else:
+                    existing_fields[field.field_name] = field
+            product_type = existing
+        else:
+            product_type = AmazonProductType(
+                code=product_code,
+                name=product_code.replace("_", " ").title()
+            )
+            self.db.add(product_type)
+            self.db.flush()
+        timer.lap("prepare_product_type")
+        
+        header_rows_changed = False
+        if parsed.header_rows is not None and product_type.header_rows != parsed.header_rows:
+            product_type.header_rows = parsed.header_rows
+            header_rows_changed = True
+        
+        logger.debug("STEP 5: Writing database records")
+        
+        field_rows = []
+        values_by_field_name = {}
+        
+        for field in parsed.fields:
+            field_name = field["field_name"]
+            default_value = field["default_value"]
             
-            prev_settings = existing_field_settings.get(field_name, {})
+            prev_settings = existing_fields[field_name]._asdict() if field_name in existing_fields else {}
             
             # Always update custom_value with new default from template
             # This ensures re-uploaded templates update defaults properly
@@ -331,52 +498,208 @@ class TemplateService:
             else:
                 custom_value = prev_settings.get('custom_value')
             
-            field = ProductTypeField(
-                product_type_id=product_type.id,
-                field_name=field_name,
-                display_name=display_name,
-                attribute_group=group_name,
-                order_index=template_info["order_index"],
-                required=prev_settings.get('required', False),
-                selected_value=prev_settings.get('selected_value'),
-                custom_value=custom_value
-            )
-            self.db.add(field)
-            self.db.flush()
-            field_name_to_db[field_name] = field
-            fields_imported += 1
-            
-            all_values = []
-            if field_name in valid_values_by_field:
-                all_values.extend(valid_values_by_field[field_name])
-            if field_name in other_values_by_field:
-                for ov in other_values_by_field[field_name]:
-                    if ov not in all_values:
-                        all_values.append(ov)
-            if default_value and default_value not in all_values:
-                all_values.insert(0, default_value)
-            
-            for value in all_values:
-                field_value = ProductTypeFieldValue(
-                    product_type_field_id=field.id,
-                    value=value
-                )
-                self.db.add(field_value)
+            field_rows.append({
+                "product_type_id": product_type.id,
+                "field_name": field_name,
+                "display_name": field["display_name"],
+                "attribute_group": field["attribute_group"],
+                "order_index": field["order_index"],
+                "required": prev_settings.get('required', False),
+                "selected_value": prev_settings.get('selected_value'),
+                "custom_value": custom_value
+            })
+            values_by_field_name[field_name] = field["values"]
+        
+        changes = {"created": not existing, "header_rows_changed": header_rows_changed}
         
-        self.db.commit()
+        changes.update(self._apply_field_changes(existing_fields, duplicate_field_ids, field_rows))
+        timer.lap("write_fields")
         
-        print(f"  Created {fields_imported} fields")
-        print("=" * 60)
-        print(f"DONE: {fields_imported} fields, {keywords_imported} keywords, {valid_values_imported} valid values")
-        print("=" * 60)
+        value_changes = self._apply_value_changes(product_type, values_by_field_name)
+        changes["values_added"] = value_changes["values_added"]
+        changes["values_removed"] += value_changes["values_removed"]
+        timer.lap("write_values")
+        
+        changes.update(self._apply_keyword_changes(product_type, parsed.keywords))
+        timer.lap("write_keywords")
+        
+        fields_imported = len(field_rows)
+        keywords_imported = len(parsed.keywords)
+        diagnostics = parsed.diagnostics
+        
+        logger.info(
+            "Imported template %s: %d fields, %d keywords, %d valid values, %d unmatched labels",
+            product_code, fields_imported, keywords_imported, parsed.valid_values_imported,
+            len(diagnostics.unmatched_valid_value_labels) + len(diagnostics.unmatched_default_values)
+        )
         
         return {
             "product_code": product_code,
             "fields_imported": fields_imported,
             "keywords_imported": keywords_imported,
-            "valid_values_imported": valid_values_imported
+            "valid_values_imported": parsed.valid_values_imported,
+            "changes": changes,
+            "diagnostics": diagnostics.to_dict()
+        }
+    
+    def _apply_field_changes(self, existing_fields: dict, duplicate_field_ids: list, field_rows: list) -> dict:
+        """Insert new fields, update changed ones in place and delete fields the template dropped."""
+        remaining = dict(existing_fields)
+        new_rows = []
+        updated_rows = []
+        for row in field_rows:
+            current = remaining.pop(row["field_name"], None)
+            if current is None:
+                new_rows.append(row)
+            elif any(getattr(current, c) != row[c] for c in TEMPLATE_FIELD_COLUMNS):
+                updated_rows.append({"id": current.id, **{c: row[c] for c in TEMPLATE_FIELD_COLUMNS}})
+        removed_ids = [field.id for field in remaining.values()] + duplicate_field_ids
+        
+        if new_rows:
+            self.db.execute(insert(ProductTypeField), new_rows)
+        if updated_rows:
+            self.db.execute(update(ProductTypeField), updated_rows)
+        
+        values_removed = 0
+        for start in range(0, len(removed_ids), IMPORT_INSERT_BATCH_SIZE):
+            chunk = removed_ids[start:start + IMPORT_INSERT_BATCH_SIZE]
+            values_removed += self.db.execute(
+                delete(ProductTypeFieldValue).where(ProductTypeFieldValue.product_type_field_id.in_(chunk))
+            ).rowcount
+            self.db.execute(delete(ProductTypeField).where(ProductTypeField.id.in_(chunk)))
+        
+        return {
+            "fields_added": len(new_rows),
+            "fields_updated": len(updated_rows),
+            "fields_removed": len(removed_ids),
+            "values_removed": values_removed
         }
     
+    def _apply_value_changes(self, product_type: AmazonProductType, values_by_field_name: dict) -> dict:
+        """Bring each field's valid values in line with the template, keeping rows that still apply."""
+        # Field names are unique within a template, so ids of fields added by the
+        # executemany can be read back with one select instead of a flush per row
+        field_ids = dict(self.db.execute(
+            select(ProductTypeField.field_name, ProductTypeField.id).where(
+                ProductTypeField.product_type_id == product_type.id
+            )
+        ).all())
+        
+        stored_values = {}
+        for value_id, field_id, value in self.db.execute(
+            select(
+                ProductTypeFieldValue.id, ProductTypeFieldValue.product_type_field_id, ProductTypeFieldValue.value
+            ).join(
+                ProductTypeField, ProductTypeField.id == ProductTypeFieldValue.product_type_field_id
+            ).where(
+                ProductTypeField.product_type_id == product_type.id
+            ).order_by(ProductTypeFieldValue.id)
+        ):
+            stored_values.setdefault(field_id, []).append((value_id, value))
+        
+        value_rows = []
+        delete_ids = []
+        for field_name, values in values_by_field_name.items():
+            field_id = field_ids[field_name]
+            to_insert, to_delete = diff_multiset(stored_values.get(field_id, []), values)
+            value_rows.extend({"product_type_field_id": field_id, "value": value} for value in to_insert)
+            delete_ids.extend(to_delete)
+        
+        self._bulk_delete(ProductTypeFieldValue, delete_ids)
+        self._bulk_insert(ProductTypeFieldValue, value_rows)
+        return {"values_added": len(value_rows), "values_removed": len(delete_ids)}
+    
+    def _apply_keyword_changes(self, product_type: AmazonProductType, keyword_values: list) -> dict:
+        stored_keywords = self.db.execute(
+            select(ProductTypeKeyword.id, ProductTypeKeyword.keyword).where(
+                ProductTypeKeyword.product_type_id == product_type.id
+            ).order_by(ProductTypeKeyword.id)
+        ).all()
+        to_insert, to_delete = diff_multiset(stored_keywords, keyword_values)
+        self._bulk_delete(ProductTypeKeyword, to_delete)
+        self._bulk_insert(ProductTypeKeyword, [
+            {"product_type_id": product_type.id, "keyword": keyword}
+            for keyword in to_insert
+        ])
+        return {"keywords_added": len(to_insert), "keywords_removed": len(to_delete)}
+    
+    def _bulk_delete(self, model, ids: list):
+        """Delete rows by primary key, IMPORT_INSERT_BATCH_SIZE ids per statement."""
+        for start in range(0, len(ids), IMPORT_INSERT_BATCH_SIZE):
+            self.db.execute(delete(model).where(model.id.in_(ids[start:start + IMPORT_INSERT_BATCH_SIZE])))
+    
+    def _bulk_insert(self, model, rows: list):
+        """Insert plain row dicts with core executemany, IMPORT_INSERT_BATCH_SIZE rows per statement."""
+        for start in range(0, len(rows), IMPORT_INSERT_BATCH_SIZE):
+            self.db.execute(insert(model), rows[start:start + IMPORT_INSERT_BATCH_SIZE])
+    
+    def update_fields(self, updates: list) -> list:
+        """
+        Apply required/selected_value changes to many fields in one transaction.
+        
+        updates are objects with field_id, required and selected_value, where
+        None leaves a setting alone and "" clears selected_value. A non-empty
+        selected_value must be one of the field's valid values when the field
+        has any; failing updates are reported and skipped while the rest are
+        applied. Fields and the valid values being checked are read in bulk,
+        and everything is committed once. Returns one result dict per update.
+        """
+        field_ids = {u.field_id for u in updates}
+        fields = {
+            field.id: field for field in self.db.execute(
+                select(ProductTypeField).where(ProductTypeField.id.in_(field_ids))
+            ).scalars()
+        }
+        
+        checked = {u.field_id for u in updates if u.selected_value and u.field_id in fields}
+        checked_values = {u.selected_value for u in updates if u.selected_value and u.field_id in fields}
+        fields_with_values = set(self.db.execute(
+            select(ProductTypeFieldValue.product_type_field_id)
+            .where(ProductTypeFieldValue.product_type_field_id.in_(checked))
+            .distinct()
+        ).scalars()) if checked else set()
+        valid_pairs = set(self.db.execute(
+            select(ProductTypeFieldValue.product_type_field_id, ProductTypeFieldValue.value).where(
+                ProductTypeFieldValue.product_type_field_id.in_(fields_with_values),
+                ProductTypeFieldValue.value.in_(checked_values)
+            )
+        ).tuples()) if fields_with_values else set()
+        
+        results = []
+        for u in updates:
+            field = fields.get(u.field_id)
+            if field is None:
+                results.append({"field_id": u.field_id, "status": "failed", "error": "Field not found", "field": None})
+                continue
+            if u.selected_value and field.id in fields_with_values and (field.id, u.selected_value) not in valid_pairs:
+                results.append({
+                    "field_id": u.field_id,
+                    "status": "failed",
+                    "error": f"'{u.selected_value}' is not a valid value for {field.field_name}",
+                    "field": None
+                })
+                continue
+            
+            if u.required is not None:
+                field.required = u.required
+            if u.selected_value is not None:
+                field.selected_value = u.selected_value if u.selected_value != "" else None
+            results.append({"field_id": u.field_id, "status": "updated", "error": None, "field": field})
+        
+        try:
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        # Reload the committed fields in one query instead of one refresh each
+        updated_ids = [r["field_id"] for r in results if r["status"] == "updated"]
+        for start in range(0, len(updated_ids), IMPORT_INSERT_BATCH_SIZE):
+            self.db.execute(
+                select(ProductTypeField).where(ProductTypeField.id.in_(updated_ids[start:start + IMPORT_INSERT_BATCH_SIZE]))
+            ).scalars().all()
+        return results
+    
     def get_header_rows(self, product_code: str) -> list:
         product_type = self.db.query(AmazonProductType).filter(
             AmazonProductType.code == product_code
@@ -0,0 +1,181 @@
+"""
+Per-cell cost of export value resolution: the original per-cell get_field_value
+against the compiled resolvers from compile_field_resolver.
+
+    python benchmarks/bench_export_resolvers.py [--fields 300] [--models 2000]
+
+No database is needed; fields and models are plain stand-in objects.
+"""
+import argparse
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.export_rows import (  # noqa: E402
+    build_row_slots, compile_field_resolver, is_image_url_field, normalize_for_url
+)
+
+
+def substitute_placeholders(value, model, series, manufacturer, equipment_type, is_image_url=False):
+    """Placeholder substitution as export did it per cell before resolvers were compiled."""
+    result = value
+    mfr_name = manufacturer.name if manufacturer else ''
+    series_name = series.name if series else ''
+    model_name = model.name if model else ''
+    equip_type = equipment_type.name if equipment_type else ''
+
+    if is_image_url:
+        mfr_name_norm = normalize_for_url(mfr_name)
+        series_name_norm = normalize_for_url(series_name)
+        model_name_norm = normalize_for_url(model_name)
+
+        result = result.replace('[Manufacturer_Name]', mfr_name_norm)
+        result = result.replace('[Series_Name]', series_name_norm)
+        result = result.replace('[Model_Name]', model_name_norm)
+        result = result.replace('[MANUFACTURER_NAME]', mfr_name_norm)
+        result = result.replace('[SERIES_NAME]', series_name_norm)
+        result = result.replace('[MODEL_NAME]', model_name_norm)
+    else:
+        result = result.replace('[MANUFACTURER_NAME]', mfr_name)
+        result = result.replace('[SERIES_NAME]', series_name)
+        result = result.replace('[MODEL_NAME]', model_name)
+        result = result.replace('[Manufacturer_Name]', mfr_name)
+        result = result.replace('[Series_Name]', series_name)
+        result = result.replace('[Model_Name]', model_name)
+
+    result = result.replace('[EQUIPMENT_TYPE]', equip_type)
+    result = result.replace('[Equipment_Type]', equip_type)
+
+    return result
+
+
+def get_field_value(field, model, series, manufacturer, equipment_type=None, listing_type="individual"):
+    """Field value as export computed it per cell before resolvers were compiled."""
+    field_name_lower = field.field_name.lower()
+    is_image_field = is_image_url_field(field.field_name)
+
+    if 'contribution_sku' in field_name_lower and listing_type == 'individual':
+        return model.parent_sku if model.parent_sku else None
+
+    if field.required:
+        if field.custom_value:
+            return substitute_placeholders(field.custom_value, model, series, manufacturer, equipment_type, is_image_url=is_image_field)
+
+        if field.selected_value:
+            return field.selected_value
+
+        if 'item_name' in field_name_lower or 'product_name' in field_name_lower or 'title' in field_name_lower:
+            mfr_name = manufacturer.name if manufacturer else ''
+            series_name = series.name if series else ''
+            return f"{mfr_name} {series_name} {model.name} Cover"
+
+        if 'brand' in field_name_lower or 'brand_name' in field_name_lower:
+            return manufacturer.name if manufacturer else None
+
+        if 'model' in field_name_lower or 'model_number' in field_name_lower or 'model_name' in field_name_lower:
+            return model.name
+
+        if 'manufacturer' in field_name_lower:
+            return manufacturer.name if manufacturer else None
+
+    return None
+
+
+FIELD_KINDS = [
+    dict(field_name="item_name", required=True),
+    dict(field_name="brand_name", required=True),
+    dict(field_name="model_number", required=True),
+    dict(field_name="manufacturer", required=True),
+    dict(field_name="contribution_sku#1.value", required=True),
+    dict(field_name="condition_type", required=True, selected_value="New"),
+    dict(field_name="product_description", required=True,
+         custom_value="Custom cover for the [MANUFACTURER_NAME] [SERIES_NAME] [MODEL_NAME] [EQUIPMENT_TYPE]"),
+    dict(field_name="main_product_image_locator#1.media_location", required=True,
+         custom_value="https://img.example.com/[Manufacturer_Name]/[Series_Name]/[Model_Name]_001.jpg"),
+    dict(field_name="other_product_image_locator_1#1.media_location", required=True,
+         custom_value="https://img.example.com/[Manufacturer_Name]/[Series_Name]/[Model_Name]_002.jpg"),
+    dict(field_name="bullet_point#1.value", required=False),
+]
+
+
+def make_fields(count):
+    fields = []
+    for i in range(count):
+        kind = FIELD_KINDS[i % len(FIELD_KINDS)]
+        fields.append(SimpleNamespace(
+            field_name=kind["field_name"],
+            required=kind["required"],
+            selected_value=kind.get("selected_value"),
+            custom_value=kind.get("custom_value"),
+        ))
+    return fields
+
+
+def make_models(count):
+    manufacturers = [SimpleNamespace(name=f"Manufacturer {i} USA") for i in range(20)]
+    series = [SimpleNamespace(name=f"Series-{i} Deluxe", manufacturer=manufacturers[i % 20]) for i in range(100)]
+    return [
+        SimpleNamespace(name=f"Model {i} Reverb", parent_sku=f"MFRSERMOD{i:04d}V1", series=series[i % 100])
+        for i in range(count)
+    ]
+
+
+def rows_per_cell(fields, models, equipment_type, listing_type):
+    rows = []
+    for model in models:
+        series = model.series
+        manufacturer = series.manufacturer
+        rows.append([get_field_value(f, model, series, manufacturer, equipment_type, listing_type) for f in fields])
+    return rows
+
+
+def rows_compiled(fields, models, equipment_type, listing_type):
+    resolvers = [compile_field_resolver(f, equipment_type, listing_type) for f in fields]
+    rows = []
+    for model in models:
+        series = model.series
+        slots = build_row_slots(model, series, series.manufacturer)
+        rows.append([resolve(slots) for resolve in resolvers])
+    return rows
+
+
+def best_of(repeat, func, *args):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fields", type=int, default=300)
+    parser.add_argument("--models", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    fields = make_fields(args.fields)
+    models = make_models(args.models)
+    equipment_type = SimpleNamespace(name="Guitar Amplifier")
+    cells = args.fields * args.models
+
+    for listing_type in ("individual", "parent_child"):
+        per_cell_time, expected = best_of(args.repeat, rows_per_cell, fields, models, equipment_type, listing_type)
+        compiled_time, actual = best_of(args.repeat, rows_compiled, fields, models, equipment_type, listing_type)
+        if actual != expected:
+            raise SystemExit(f"compiled resolvers disagree with get_field_value ({listing_type})")
+
+        print(f"{listing_type}: {args.fields} fields x {args.models} models, best of {args.repeat}")
+        print(f"  get_field_value per cell: {per_cell_time / cells * 1e9:7.0f} ns/cell")
+        print(f"  compiled resolvers:       {compiled_time / cells * 1e9:7.0f} ns/cell")
+        print(f"  speedup:                  {per_cell_time / compiled_time:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
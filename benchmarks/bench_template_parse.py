@@ -0,0 +1,105 @@
+"""
+Template workbook parsing: four pd.read_excel calls walked with iloc (the
+importer before the streaming parser) against one read-only streaming pass.
+
+    python benchmarks/bench_template_parse.py [workbook.xlsx] [--runs 5]
+
+pandas is no longer a dependency of the app; without it only the streaming
+side is measured.
+"""
+import argparse
+import glob
+import importlib.util
+import io
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.services.template_parser import MissingSheetError, TemplateWorkbook, cell_text, cell_texts  # noqa: E402
+from app.services.template_service import parse_amazon_template  # noqa: E402
+
+SHEETS = ("Data Definitions", "Valid Values", "Template", "Default Values")
+
+
+def walk_pandas(contents):
+    """Read each sheet into a DataFrame and walk its rows cell by cell, as the old importer did."""
+    import pandas as pd
+
+    excel_file = io.BytesIO(contents)
+    cells = 0
+    for sheet_name in SHEETS:
+        try:
+            df = pd.read_excel(excel_file, sheet_name=sheet_name, header=None)
+        except ValueError:
+            continue
+        for row_idx in range(len(df)):
+            row = df.iloc[row_idx]
+            for col_idx in range(min(3, len(row))):
+                if pd.notna(row.iloc[col_idx]):
+                    cells += 1
+            cells += sum(1 for v in row.iloc[3:] if pd.notna(v))
+    return cells
+
+
+def walk_streaming(contents):
+    """Stream the same four sheets as raw row tuples through the template parser helpers."""
+    cells = 0
+    with TemplateWorkbook(contents) as workbook:
+        for sheet_name in SHEETS:
+            try:
+                rows = workbook.rows(sheet_name)
+            except MissingSheetError:
+                continue
+            for row in rows:
+                for col_idx in range(3):
+                    if cell_text(row, col_idx) is not None:
+                        cells += 1
+                cells += len(cell_texts(row, 3))
+    return cells
+
+
+def measure(func, contents, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(contents)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(contents)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak
+
+
+def main():
+    samples = sorted(glob.glob(os.path.join(ROOT, "attached_assets", "CARRIER_BAG_CASE*.xlsx")))
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("workbook", nargs="?", default=samples[0] if samples else None)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    if not args.workbook:
+        parser.error("no workbook given and no CARRIER_BAG_CASE sample found in attached_assets/")
+
+    with open(args.workbook, "rb") as f:
+        contents = f.read()
+
+    candidates = [("read-only streaming", walk_streaming), ("parse_amazon_template", parse_amazon_template)]
+    if importlib.util.find_spec("pandas"):
+        candidates.insert(0, ("pd.read_excel x4 + iloc walk", walk_pandas))
+    else:
+        print("pandas is not installed; skipping the pd.read_excel baseline")
+
+    print(f"{os.path.basename(args.workbook)}, median of {args.runs} runs")
+    for label, func in candidates:
+        median, peak = measure(func, contents, args.runs)
+        print(f"  {label:<30} {median * 1000:7.0f} ms  {peak / 1e6:6.1f} MB traced peak")
+
+
+if __name__ == "__main__":
+    main()
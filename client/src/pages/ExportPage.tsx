@@ -10,7 +10,7 @@ import PreviewIcon from '@mui/icons-material/Preview'
 import CloseIcon from '@mui/icons-material/Close'
 import DownloadIcon from '@mui/icons-material/Download'
 import { manufacturersApi, seriesApi, modelsApi, templatesApi, exportApi } from '../services/api'
-import type { Manufacturer, Series, Model, AmazonProductType } from '../types'
+import type { Manufacturer, Series, Model, AmazonProductTypeSummary } from '../types'
 
 interface ExportPreviewData {
   headers: (string | null)[][]
@@ -31,7 +31,7 @@ export default function ExportPage() {
   const [manufacturers, setManufacturers] = useState<Manufacturer[]>([])
   const [allSeries, setAllSeries] = useState<Series[]>([])
   const [allModels, setAllModels] = useState<Model[]>([])
-  const [templates, setTemplates] = useState<AmazonProductType[]>([])
+  const [templates, setTemplates] = useState<AmazonProductTypeSummary[]>([])
   const [equipmentTypeLinks, setEquipmentTypeLinks] = useState<{equipment_type_id: number, product_type_id: number}[]>([])
   
   const [selectedManufacturer, setSelectedManufacturer] = useState<number | ''>('')
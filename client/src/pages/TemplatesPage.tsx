@@ -17,7 +17,7 @@ import AddIcon from '@mui/icons-material/Add'
 import PreviewIcon from '@mui/icons-material/Preview'
 import CloseIcon from '@mui/icons-material/Close'
 import { templatesApi, equipmentTypesApi, type EquipmentTypeProductTypeLink } from '../services/api'
-import type { AmazonProductType, EquipmentType, ProductTypeField } from '../types'
+import type { AmazonProductType, AmazonProductTypeSummary, EquipmentType, ProductTypeField } from '../types'
 import FieldDetailsDialog from '../components/FieldDetailsDialog'
 
 const rowStyles: Record<number, React.CSSProperties> = {
@@ -131,7 +131,7 @@ interface PendingUpload {
 }
 
 export default function TemplatesPage() {
-  const [templates, setTemplates] = useState<AmazonProductType[]>([])
+  const [templates, setTemplates] = useState<AmazonProductTypeSummary[]>([])
   const [selectedTemplate, setSelectedTemplate] = useState<AmazonProductType | null>(null)
   const [productCode, setProductCode] = useState('')
   const [selectedExistingCode, setSelectedExistingCode] = useState('')
@@ -493,7 +493,7 @@ export default function TemplatesPage() {
                         sx={{ cursor: 'pointer' }}
                       >
                         <TableCell>{template.code}</TableCell>
-                        <TableCell>{template.fields?.length || 0}</TableCell>
+                        <TableCell>{template.field_count}</TableCell>
                         <TableCell>
                           <IconButton 
                             size="small" 
@@ -590,13 +590,14 @@ export default function TemplatesPage() {
                     
                     const handleToggleGroupRequired = async (groupName: string, setRequired: boolean) => {
                       const groupFields = groupedFields![groupName] || []
-                      for (const field of groupFields) {
-                        if (field.required !== setRequired) {
-                          try {
-                            await templatesApi.updateField(field.id, { required: setRequired })
-                          } catch (err) {
-                            console.error('Failed to update field', err)
-                          }
+                      const updates = groupFields
+                        .filter(field => field.required !== setRequired)
+                        .map(field => ({ field_id: field.id, required: setRequired }))
+                      if (updates.length > 0) {
+                        try {
+                          await templatesApi.updateFields(updates)
+                        } catch (err) {
+                          console.error('Failed to update fields', err)
                         }
                       }
                       const updatedFields = selectedTemplate.fields.map(f => {
@@ -604,9 +605,6 @@ export default function TemplatesPage() {
                         return inGroup ? { ...f, required: setRequired } : f
                       })
                       setSelectedTemplate({ ...selectedTemplate, fields: updatedFields })
-                      setTemplates(templates.map(t => 
-                        t.id === selectedTemplate.id ? { ...t, fields: updatedFields } : t
-                      ))
                     }
                     
                     return groups.map((groupName) => {
@@ -686,11 +684,6 @@ export default function TemplatesPage() {
                                               f.id === field.id ? updatedField : f
                                             )
                                           })
-                                          setTemplates(templates.map(t => 
-                                            t.id === selectedTemplate.id 
-                                              ? { ...t, fields: t.fields.map(f => f.id === field.id ? updatedField : f) }
-                                              : t
-                                          ))
                                         } catch (err) {
                                           console.error('Failed to update required status', err)
                                         }
@@ -766,11 +759,6 @@ export default function TemplatesPage() {
                 f.id === updatedField.id ? updatedField : f
               )
             })
-            setTemplates(templates.map(t => 
-              t.id === selectedTemplate.id 
-                ? { ...t, fields: t.fields.map(f => f.id === updatedField.id ? updatedField : f) }
-                : t
-            ))
             setSelectedField(updatedField)
           }}
         />
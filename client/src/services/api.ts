@@ -1,7 +1,7 @@
 import axios from 'axios'
 import type {
   Manufacturer, Series, EquipmentType, Model, Material,
-  Customer, Order, PricingOption, PricingResult, AmazonProductType,
+  Customer, Order, PricingOption, PricingResult, AmazonProductType, AmazonProductTypeSummary,
   EnumValue, ProductTypeField, ProductTypeFieldValue, DesignOption
 } from '../types'
 
@@ -43,8 +43,21 @@ export const designOptionsApi = {
   delete: (id: number) => api.delete(`/design-options/${id}`),
 }
 
+export interface ModelPageParams {
+  limit: number
+  cursor?: string
+  series_id?: number
+  manufacturer_id?: number
+  equipment_type_id?: number
+  name_prefix?: string
+  sort?: 'id' | '-id' | 'name' | '-name'
+  fields?: string
+}
+
 export const modelsApi = {
   list: (seriesId?: number) => api.get<Model[]>('/models', { params: { series_id: seriesId } }).then(r => r.data),
+  page: (params: ModelPageParams) =>
+    api.get<Model[]>('/models', { params }).then(r => ({ items: r.data, nextCursor: r.headers['x-next-cursor'] as string | undefined })),
   get: (id: number) => api.get<Model>(`/models/${id}`).then(r => r.data),
   create: (data: Partial<Model>) => api.post<Model>('/models', data).then(r => r.data),
   update: (id: number, data: Partial<Model>) => api.put<Model>(`/models/${id}`, data).then(r => r.data),
@@ -100,8 +113,14 @@ export interface EquipmentTypeProductTypeLink {
   product_type_id: number
 }
 
+export interface ProductTypeFieldBulkUpdateResponse {
+  updated: number
+  failed: number
+  results: { field_id: number; status: 'updated' | 'failed'; error?: string; field?: Omit<ProductTypeField, 'valid_values'> }[]
+}
+
 export const templatesApi = {
-  list: () => api.get<AmazonProductType[]>('/templates').then(r => r.data),
+  list: () => api.get<AmazonProductTypeSummary[]>('/templates', { params: { mode: 'summary' } }).then(r => r.data),
   get: (code: string) => api.get<AmazonProductType>(`/templates/${code}`).then(r => r.data),
   import: (file: File, productCode: string) => {
     const formData = new FormData()
@@ -116,6 +135,10 @@ export const templatesApi = {
   deleteEquipmentTypeLink: (linkId: number) => api.delete(`/templates/equipment-type-links/${linkId}`),
   updateField: (fieldId: number, data: { required?: boolean; selected_value?: string }) => 
     api.patch<ProductTypeField>(`/templates/fields/${fieldId}`, data).then(r => r.data),
+  updateFields: (updates: { field_id: number; required?: boolean; selected_value?: string }[]) =>
+    api.patch<ProductTypeFieldBulkUpdateResponse>('/templates/fields', { updates }).then(r => r.data),
+  searchFieldValues: (fieldId: number, q: string, mode: 'prefix' | 'contains' = 'contains', limit = 50) =>
+    api.get<ProductTypeFieldValue[]>(`/templates/fields/${fieldId}/values`, { params: { q, mode, limit } }).then(r => r.data),
   addFieldValue: (fieldId: number, value: string) => 
     api.post<ProductTypeFieldValue>(`/templates/fields/${fieldId}/values`, { value }).then(r => r.data),
   deleteFieldValue: (fieldId: number, valueId: number) => 
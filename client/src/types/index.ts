@@ -134,6 +134,15 @@ export interface AmazonProductType {
   fields: ProductTypeField[]
 }
 
+export interface AmazonProductTypeSummary {
+  id: number
+  code: string
+  name?: string
+  description?: string
+  field_count: number
+  keyword_count: number
+}
+
 export interface EnumValue {
   value: string
   name: string
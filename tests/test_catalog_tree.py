@@ -0,0 +1,35 @@
+from app.api import catalog, manufacturers, series
+
+
+def test_catalog_etag_follows_writes_made_through_any_worker(make_client):
+    # Two separately built apps stand in for two worker processes sharing one database
+    worker_a = make_client(catalog.router, manufacturers.router, series.router)
+    worker_b = make_client(catalog.router, manufacturers.router, series.router)
+
+    manufacturer = worker_a.post("/manufacturers", json={"name": "Fender"}).json()
+    worker_a.post("/series", json={"name": "Hot Rod", "manufacturer_id": manufacturer["id"]})
+
+    first = worker_b.get("/catalog/tree", params={"depth": 2})
+    etag = first.headers["ETag"]
+    assert first.json() == [{"id": manufacturer["id"], "name": "Fender", "series": [
+        {"id": 1, "name": "Hot Rod"}
+    ]}]
+    assert worker_a.get("/catalog/tree", params={"depth": 2}).headers["ETag"] == etag
+    assert worker_b.get("/catalog/tree", params={"depth": 2}, headers={"If-None-Match": etag}).status_code == 304
+
+    worker_a.put(f"/manufacturers/{manufacturer['id']}", json={"name": "Fender USA"})
+
+    refreshed = worker_b.get("/catalog/tree", params={"depth": 2}, headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+    assert refreshed.json()[0]["name"] == "Fender USA"
+
+
+def test_catalog_etag_is_unchanged_by_a_failed_write(make_client):
+    client = make_client(catalog.router, manufacturers.router)
+    client.post("/manufacturers", json={"name": "Fender"})
+    etag = client.get("/catalog/tree").headers["ETag"]
+
+    assert client.post("/manufacturers", json={"name": "Fender"}).status_code == 400
+
+    assert client.get("/catalog/tree", headers={"If-None-Match": etag}).status_code == 304
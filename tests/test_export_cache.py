@@ -0,0 +1,23 @@
+from app.services.export_cache import ExportArtifactCache, iter_file
+
+
+def render(tmp_path, name, size):
+    path = tmp_path / name
+    path.write_bytes(b"x" * size)
+    return str(path)
+
+
+def test_served_entry_stays_readable_after_eviction(tmp_path):
+    cache = ExportArtifactCache(directory=str(tmp_path / "cache"), max_bytes=150)
+    cache.put("first", "csv", render(tmp_path, "first.csv", 100)).close()
+
+    served = cache.get("first", "csv")
+    # Pushes the directory past max_bytes, evicting "first" while it is still being sent
+    cache.put("second", "csv", render(tmp_path, "second.csv", 100)).close()
+
+    assert cache.get("first", "csv") is None
+    assert b"".join(iter_file(served)) == b"x" * 100
+    assert served.closed
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,97 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app.api import export
+from app.models.core import Manufacturer, Series, Model, EquipmentType
+from app.models.templates import AmazonProductType, ProductTypeField, EquipmentTypeProductType
+from app.services.export_cache import ExportArtifactCache
+
+MODEL_COUNT = 40
+
+
+@pytest.fixture
+def model_ids(session_factory):
+    """MODEL_COUNT models of one equipment type, spread over several series and manufacturers."""
+    db = session_factory()
+    equipment_type = EquipmentType(name="Guitar Amplifier")
+    product_type = AmazonProductType(code="CARRIER_BAG_CASE", header_rows=[["item_name", "brand_name"]])
+    db.add_all([equipment_type, product_type])
+    db.flush()
+    db.add(EquipmentTypeProductType(equipment_type_id=equipment_type.id, product_type_id=product_type.id))
+    db.add_all([
+        ProductTypeField(product_type_id=product_type.id, field_name="item_name", required=True, order_index=0),
+        ProductTypeField(product_type_id=product_type.id, field_name="brand_name", required=True, order_index=1),
+        ProductTypeField(
+            product_type_id=product_type.id, field_name="main_product_image_locator", required=True,
+            order_index=2, custom_value="https://img.example.com/[MANUFACTURER_NAME]/[MODEL_NAME].jpg"
+        ),
+    ])
+
+    series = []
+    for i in range(4):
+        manufacturer = Manufacturer(name=f"Manufacturer {i}")
+        db.add(manufacturer)
+        db.flush()
+        series.append(Series(name=f"Series {i}", manufacturer_id=manufacturer.id))
+    db.add_all(series)
+    db.flush()
+
+    models = [
+        Model(
+            name=f"Model {i}", series_id=series[i % len(series)].id, equipment_type_id=equipment_type.id,
+            width=10, depth=5, height=8, parent_sku=f"SKU{i:04d}"
+        )
+        for i in range(MODEL_COUNT)
+    ]
+    db.add_all(models)
+    db.commit()
+    ids = [m.id for m in models]
+    db.close()
+    return ids
+
+
+@pytest.fixture
+def client(make_client, tmp_path, monkeypatch):
+    monkeypatch.setattr(export, "export_cache", ExportArtifactCache(directory=str(tmp_path)))
+    return make_client(export.router)
+
+
+@contextmanager
+def count_queries(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.mark.parametrize("path", ["/export/preview", "/export/download/csv"])
+def test_export_query_count_does_not_grow_with_models(engine, client, model_ids, path):
+    counts = []
+    for ids in (model_ids[:2], model_ids):
+        with count_queries(engine) as statements:
+            response = client.post(path, json={"model_ids": ids})
+        assert response.status_code == 200
+        counts.append(len(statements))
+
+    assert counts[0] == counts[1]
+
+
+def test_preview_reads_eager_loaded_series_and_manufacturers(client, model_ids):
+    response = client.post("/export/preview", json={"model_ids": model_ids})
+
+    assert response.status_code == 200
+    rows = response.json()["rows"]
+    assert len(rows) == MODEL_COUNT
+    assert rows[1]["data"] == [
+        "Manufacturer 1 Series 1 Model 1 Cover",
+        "Manufacturer 1",
+        "https://img.example.com/Manufacturer1/Model1.jpg",
+    ]
@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from app.services.label_matcher import SubstringIndex
+
+
+def brute_containing(items, query, case_sensitive=True):
+    """The scan the index replaced: value of the first key that has query as a substring."""
+    fold = (lambda s: s) if case_sensitive else str.lower
+    for key, value in items:
+        if fold(query) in fold(key):
+            return value
+    return None
+
+
+def brute_overlapping(items, query, case_sensitive=True):
+    """Value of the first key that contains query or is contained in it."""
+    fold = (lambda s: s) if case_sensitive else str.lower
+    for key, value in items:
+        if fold(query) in fold(key) or fold(key) in fold(query):
+            return value
+    return None
+
+
+def assert_parity(items, queries, case_sensitive=True):
+    index = SubstringIndex(items, case_sensitive=case_sensitive)
+    for query in queries:
+        assert index.containing(query) == brute_containing(items, query, case_sensitive), query
+        assert index.overlapping(query) == brute_overlapping(items, query, case_sensitive), query
+
+
+LABELS = [
+    ("item_name", 0), ("brand_name", 1), ("item_type_name", 2), ("color", 3),
+    ("color_map", 4), ("size", 5), ("is", 6), ("item_name", 7), ("a", 8),
+]
+
+
+def test_short_queries_and_short_keys():
+    assert_parity(LABELS, ["", "a", "i", "is", "_", "na", "ze", "x", "ol", "co", "map"])
+    index = SubstringIndex(LABELS)
+    assert index.containing("is") == 6
+    assert index.overlapping("si") == 5
+
+
+def test_overlapping_labels_and_first_key_wins():
+    queries = [
+        "item_name", "name", "item", "color_map_v2", "the color", "brand_name_text",
+        "type", "item_type", "sizes", "this", "nothing", "colormap",
+    ]
+    assert_parity(LABELS, queries)
+    # "item_name" (0) contains the query before "item_type_name" (2) does
+    assert SubstringIndex(LABELS).containing("item") == 0
+    # The query contains both "color" (3) and "color_map" (4); the earlier key wins
+    assert SubstringIndex(LABELS).overlapping("color_map_v2") == 3
+
+
+def test_duplicate_keys_resolve_to_their_first_occurrence():
+    items = [("Color", "first"), ("Size", "size"), ("color", "lower"), ("Color", "second")]
+    assert_parity(items, ["Color", "olo", "My Color Name", "Co"])
+    assert_parity(items, ["COLOR", "olo", "my color name", "co", "SIZE"], case_sensitive=False)
+    assert SubstringIndex(items).containing("Color") == "first"
+    assert SubstringIndex(items, case_sensitive=False).overlapping("COLOR") == "first"
+
+
+def test_empty_index_and_empty_key():
+    assert_parity([], ["", "a", "abc"])
+    assert_parity([("abc", 1), ("", 2)], ["", "b", "abcd", "zzzz"])
+
+
+@pytest.mark.parametrize("case_sensitive", [True, False])
+def test_random_labels_match_the_linear_scan(case_sensitive):
+    rng = random.Random(1303)
+    alphabet = "abAB_ "
+    for _ in range(200):
+        items = [
+            ("".join(rng.choice(alphabet) for _ in range(rng.randint(1, 7))), i)
+            for i in range(rng.randint(1, 12))
+        ]
+        queries = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 9))) for _ in range(20)]
+        queries += [key for key, _ in items] + [key[1:-1] for key, _ in items]
+        assert_parity(items, queries, case_sensitive)
@@ -0,0 +1,88 @@
+import pytest
+
+from app.api import models
+from app.models.core import EquipmentType, Manufacturer, Model, Series
+
+# Names repeat so pages have to break ties on id
+NAMES = ["Twin", "Deluxe", "Twin", "Champ", "Deluxe", "Twin", "Champ", "Deluxe", "Twin"]
+
+
+@pytest.fixture
+def client(db, make_client):
+    manufacturer = Manufacturer(name="Fender")
+    equipment_type = EquipmentType(name="Guitar Amplifier")
+    db.add_all([manufacturer, equipment_type])
+    db.flush()
+    # Model names are unique per series, so each model gets its own series
+    series = [Series(name=f"Series {i}", manufacturer_id=manufacturer.id) for i in range(len(NAMES))]
+    db.add_all(series)
+    db.flush()
+    db.add_all([
+        Model(
+            name=name, series_id=series[i].id, equipment_type_id=equipment_type.id,
+            width=10 + i, depth=5, height=8, parent_sku=f"SKU{i:04d}"
+        )
+        for i, name in enumerate(NAMES)
+    ])
+    db.commit()
+    return make_client(models.router)
+
+
+def collect_pages(client, **params):
+    pages = []
+    cursor = None
+    while True:
+        response = client.get("/models", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+
+
+def expected_order(sort):
+    rows = [(name, model_id) for model_id, name in enumerate(NAMES, start=1)]
+    descending = sort.startswith("-")
+    if sort.lstrip("-") == "id":
+        return sorted((model_id for _, model_id in rows), reverse=descending)
+    return [model_id for _, model_id in sorted(rows, reverse=descending)]
+
+
+@pytest.mark.parametrize("sort", ["id", "-id", "name", "-name"])
+def test_pages_cover_every_model_once_in_sort_order(client, sort):
+    pages = collect_pages(client, sort=sort, limit=2)
+
+    assert [len(page) for page in pages] == [2, 2, 2, 2, 1]
+    assert [row["id"] for page in pages for row in page] == expected_order(sort)
+
+
+def test_unpaged_list_matches_the_paged_one(client):
+    unpaged = client.get("/models", params={"sort": "-name"})
+
+    assert "X-Next-Cursor" not in unpaged.headers
+    assert [row["id"] for row in unpaged.json()] == expected_order("-name")
+
+
+def test_fields_projection_returns_only_the_requested_columns(client):
+    pages = collect_pages(client, sort="name", limit=4, fields="name,parent_sku")
+
+    rows = [row for page in pages for row in page]
+    assert all(set(row) == {"id", "name", "parent_sku"} for row in rows)
+    assert rows[0] == {"id": 4, "name": "Champ", "parent_sku": "SKU0003"}
+    assert client.get("/models", params={"fields": "name,secret"}).status_code == 400
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "bnVsbA==", "W10=", "eyJpZCI6IDF9"])
+def test_malformed_cursor_is_rejected(client, cursor):
+    response = client.get("/models", params={"sort": "name", "limit": 2, "cursor": cursor})
+
+    assert response.status_code == 400
+
+
+def test_cursor_from_another_sort_is_rejected(client):
+    cursor = client.get("/models", params={"sort": "name", "limit": 2}).headers["X-Next-Cursor"]
+
+    response = client.get("/models", params={"sort": "id", "limit": 2, "cursor": cursor})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cursor does not match sort"
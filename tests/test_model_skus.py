@@ -0,0 +1,89 @@
+import pytest
+
+from app.api import manufacturers, models, series
+from app.models.core import EquipmentType, Model
+from app.services.sku_service import SkuService, generate_parent_sku
+
+
+@pytest.fixture
+def client(db, make_client):
+    db.add(EquipmentType(name="Guitar Amplifier"))
+    db.commit()
+    return make_client(manufacturers.router, series.router, models.router)
+
+
+@pytest.fixture
+def series_id(client):
+    manufacturer = client.post("/manufacturers", json={"name": "Fender"}).json()
+    return client.post("/series", json={"name": "Hot Rod", "manufacturer_id": manufacturer["id"]}).json()["id"]
+
+
+def create_model(client, series_id, name):
+    return client.post("/models", json={
+        "name": name, "series_id": series_id, "equipment_type_id": 1, "width": 24, "depth": 10, "height": 18
+    })
+
+
+def test_colliding_names_get_increasing_versions_skipping_multiples_of_ten(client, series_id):
+    # Model names are cut to 13 characters, so these all share one base SKU
+    skus = [create_model(client, series_id, f"Deluxe Reverb Amp {i}").json()["parent_sku"] for i in range(10)]
+
+    assert skus[:2] == ["FENDERXX-HOTRODXX-DELUXEREVERBAV10000000", "FENDERXX-HOTRODXX-DELUXEREVERBAV20000000"]
+    # V10 would read the same as V1 once zero-padded, so the tenth model gets V11
+    assert skus[9] == "FENDERXX-HOTRODXX-DELUXEREVERBAV11000000"
+    assert len(set(skus)) == 10
+
+
+def test_renames_cascade_into_parent_skus(client, series_id):
+    model = create_model(client, series_id, "Deluxe").json()
+    manufacturer_id = client.get(f"/series/{series_id}").json()["manufacturer_id"]
+
+    client.put(f"/manufacturers/{manufacturer_id}", json={"name": "Fender USA"})
+    assert client.get(f"/models/{model['id']}").json()["parent_sku"] == generate_parent_sku("Fender USA", "Hot Rod", "Deluxe")
+
+    client.put(f"/series/{series_id}", json={"name": "Blues", "manufacturer_id": manufacturer_id})
+    assert client.get(f"/models/{model['id']}").json()["parent_sku"] == generate_parent_sku("Fender USA", "Blues", "Deluxe")
+
+    renamed = client.put(f"/models/{model['id']}", json={
+        "name": "Twin", "series_id": series_id, "equipment_type_id": 1, "width": 24, "depth": 10, "height": 18
+    })
+    assert renamed.json()["parent_sku"] == generate_parent_sku("Fender USA", "Blues", "Twin")
+
+
+def test_sku_taken_by_a_concurrent_write_is_picked_again(client, series_id, session_factory, monkeypatch):
+    assign_parent_sku = SkuService.assign_parent_sku
+    calls = []
+
+    def assign_racing_another_writer(self, *args, **kwargs):
+        sku = assign_parent_sku(self, *args, **kwargs)
+        if not calls:
+            # Another request commits a model with the same SKU between the pick and our commit
+            other = session_factory()
+            other.add(Model(
+                name="Deluxe Reverb Amp B", series_id=series_id, equipment_type_id=1,
+                width=24, depth=10, height=18, parent_sku=sku
+            ))
+            other.commit()
+            other.close()
+        calls.append(sku)
+        return sku
+
+    monkeypatch.setattr(SkuService, "assign_parent_sku", assign_racing_another_writer)
+    response = create_model(client, series_id, "Deluxe Reverb Amp A")
+
+    assert response.status_code == 200
+    assert calls == [generate_parent_sku("Fender", "Hot Rod", "Deluxe Reverb Amp", f"V{n}") for n in (1, 2)]
+    assert response.json()["parent_sku"] == calls[-1]
+
+
+def test_sku_and_name_conflicts_are_reported_separately(client, series_id, monkeypatch):
+    taken = create_model(client, series_id, "Deluxe").json()["parent_sku"]
+
+    duplicate = create_model(client, series_id, "Deluxe")
+    assert duplicate.status_code == 400
+    assert duplicate.json()["detail"] == "Model with this name already exists in this series"
+
+    monkeypatch.setattr(SkuService, "assign_parent_sku", lambda self, *args, **kwargs: taken)
+    conflict = create_model(client, series_id, "Twin")
+    assert conflict.status_code == 409
+    assert "Parent SKU" in conflict.json()["detail"]
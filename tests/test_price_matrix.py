@@ -0,0 +1,54 @@
+import pytest
+
+from app.api import pricing
+from app.models.core import Manufacturer, Series, Model, EquipmentType, Material, ShippingRate
+from app.models.enums import Carrier
+from app.services.pricing_cache import pricing_cache
+from app.services.pricing_service import PricingService
+
+
+@pytest.fixture(autouse=True)
+def fresh_pricing_cache():
+    pricing_cache.invalidate()
+    yield
+    pricing_cache.invalidate()
+
+
+def test_matrix_reports_zero_width_materials_instead_of_failing(db, make_client):
+    manufacturer = Manufacturer(name="Fender")
+    equipment_type = EquipmentType(name="Guitar Amplifier")
+    db.add_all([manufacturer, equipment_type])
+    db.flush()
+    series = Series(name="Hot Rod", manufacturer_id=manufacturer.id)
+    db.add(series)
+    db.flush()
+    models = [
+        Model(name=f"Deluxe {i}", series_id=series.id, equipment_type_id=equipment_type.id, width=24 + i, depth=10, height=18)
+        for i in range(2)
+    ]
+    materials = [
+        Material(
+            name=name, base_color="Black", linear_yard_width=width,
+            cost_per_linear_yard=12.0, weight_per_linear_yard=16.0, labor_time_minutes=30
+        )
+        for name, width in (("Vinyl", 54), ("Broken", 0), ("Canvas", 60))
+    ]
+    db.add_all(models + materials)
+    db.add(ShippingRate(carrier=Carrier.USPS, zone="1", min_weight=0, max_weight=1000, rate=9.5))
+    db.commit()
+    vinyl, broken, canvas = materials
+
+    response = make_client(pricing.router).get("/pricing/matrix")
+
+    assert response.status_code == 200
+    matrix = response.json()
+    assert matrix["material_ids"] == [vinyl.id, canvas.id]
+    assert matrix["material_errors"] == [
+        {"material_id": broken.id, "error": "linear_yard_width must be greater than zero"}
+    ]
+    assert matrix["row_count"] == 4
+    assert matrix["columns"]["material_id"] == [vinyl.id, canvas.id, vinyl.id, canvas.id]
+
+    service = PricingService(db)
+    expected_totals = [service.calculate_total(m.id, material.id)["total"] for m in models for material in (vinyl, canvas)]
+    assert matrix["columns"]["total"] == pytest.approx(expected_totals, abs=0.011)
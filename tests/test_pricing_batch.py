@@ -0,0 +1,52 @@
+import pytest
+from app.models.core import Manufacturer, Series, Model, EquipmentType, Material, ShippingRate
+from app.models.enums import Carrier
+from app.services.pricing_cache import pricing_cache
+from app.services.pricing_service import PricingService
+
+
+@pytest.fixture(autouse=True)
+def fresh_pricing_cache():
+    pricing_cache.invalidate()
+    yield
+    pricing_cache.invalidate()
+
+
+def add_material(db, name, linear_yard_width):
+    material = Material(
+        name=name, base_color="Black", linear_yard_width=linear_yard_width,
+        cost_per_linear_yard=12.0, weight_per_linear_yard=16.0, labor_time_minutes=30
+    )
+    db.add(material)
+    db.flush()
+    return material
+
+
+def test_calculate_batch_reports_item_errors_without_failing_the_batch(db):
+    manufacturer = Manufacturer(name="Fender")
+    equipment_type = EquipmentType(name="Guitar Amplifier")
+    db.add_all([manufacturer, equipment_type])
+    db.flush()
+    series = Series(name="Hot Rod", manufacturer_id=manufacturer.id)
+    db.add(series)
+    db.flush()
+    model = Model(name="Deluxe", series_id=series.id, equipment_type_id=equipment_type.id, width=24, depth=10, height=18)
+    db.add(model)
+    db.add(ShippingRate(carrier=Carrier.USPS, zone="1", min_weight=0, max_weight=1000, rate=9.5))
+    vinyl = add_material(db, "Vinyl", 54)
+    broken = add_material(db, "Broken", 0)
+    db.commit()
+
+    items = [
+        {"model_id": model.id, "material_id": vinyl.id, "carrier": Carrier.USPS, "zone": "1"},
+        {"model_id": model.id, "material_id": broken.id, "carrier": Carrier.USPS, "zone": "1"},
+        {"model_id": model.id, "material_id": 9999, "carrier": Carrier.USPS, "zone": "1"},
+    ]
+    results = PricingService(db).calculate_batch(items)
+
+    assert [r["index"] for r in results] == [0, 1, 2]
+    assert results[0]["error"] is None
+    assert results[0]["result"] == PricingService(db).calculate_total(model.id, vinyl.id)
+    assert results[1]["result"] is None
+    assert "division by zero" in results[1]["error"]
+    assert results[2] == {"index": 2, "result": None, "error": "Model or Material not found"}
@@ -0,0 +1,80 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.services.pricing_cache import ShippingBand
+from app.services.shipping_index import DEFAULT_SHIPPING_RATE, ShippingRateIndex
+
+
+def linear_lookup(bands, weight):
+    """The lookup the index replaced: first band in id order covering the weight, else the heaviest band."""
+    for band in bands:
+        if band.min_weight <= weight <= band.max_weight:
+            return band.rate + band.surcharge
+    if bands:
+        heaviest = max(bands, key=lambda b: b.max_weight)
+        return heaviest.rate + heaviest.surcharge
+    return DEFAULT_SHIPPING_RATE
+
+
+def bands_of(*ranges):
+    return [
+        ShippingBand(i, min_weight, max_weight, rate, surcharge)
+        for i, (min_weight, max_weight, rate, surcharge) in enumerate(ranges, start=1)
+    ]
+
+
+def assert_parity(bands, weights):
+    index = ShippingRateIndex(bands)
+    expected = [linear_lookup(bands, w) for w in weights]
+
+    assert [index.lookup(w) for w in weights] == expected
+    assert index.lookup_many(weights).tolist() == expected
+
+
+ADJACENT = bands_of((0, 1, 5.0, 0.0), (1, 5, 8.0, 0.5), (5, 20, 12.0, 0.0), (20, 70, 25.0, 2.0))
+
+
+def test_band_boundaries_go_to_the_earlier_band():
+    weights = [0, 0.5, 1, 1.0001, 4.9999, 5, 19.99, 20, 70]
+    assert_parity(ADJACENT, weights)
+    assert ShippingRateIndex(ADJACENT).lookup(1) == 5.0
+    assert ShippingRateIndex(ADJACENT).lookup(5) == 8.5
+
+
+def test_overlapping_bands_follow_id_order():
+    bands = bands_of((0, 50, 30.0, 0.0), (10, 20, 5.0, 0.0), (15, 60, 9.0, 1.0), (40, 45, 2.0, 0.0))
+    assert_parity(bands, [0, 9.9, 10, 15, 20, 20.5, 40, 45, 50, 50.5, 59, 60])
+    assert ShippingRateIndex(bands).lookup(15) == 30.0
+    assert ShippingRateIndex(bands).lookup(55) == 10.0
+
+
+def test_uncovered_weights_fall_back_to_the_heaviest_band():
+    bands = bands_of((5, 10, 6.0, 0.0), (20, 30, 9.0, 1.5), (12, 15, 7.0, 0.0))
+    weights = [-1, 0, 4.99, 10.5, 11.99, 16, 19.99, 30.01, 1000]
+    assert_parity(bands, weights)
+    assert ShippingRateIndex(bands).lookup(1000) == 10.5
+
+
+@pytest.mark.parametrize("bands", [
+    [],
+    bands_of((3, 3, 4.0, 0.0)),
+    bands_of((10, 5, 99.0, 0.0), (0, 8, 4.0, 0.0)),
+])
+def test_empty_point_and_inverted_bands(bands):
+    assert_parity(bands, [-1, 0, 3, 5, 7, 8, 9, 10, 11])
+
+
+def test_random_band_sets_match_the_linear_scan():
+    rng = random.Random(20240611)
+    for _ in range(200):
+        ranges = []
+        for _ in range(rng.randint(1, 8)):
+            low = rng.choice([rng.randint(0, 40), round(rng.uniform(0, 40), 2)])
+            high = low + rng.choice([0, rng.randint(0, 30), round(rng.uniform(0, 30), 2)])
+            ranges.append((low, high, float(rng.randint(1, 50)), rng.choice([0.0, 1.25])))
+        bands = bands_of(*ranges)
+        endpoints = [w for band in bands for w in (band.min_weight, band.max_weight)]
+        weights = endpoints + [w + d for w in endpoints for d in (-0.01, 0.01)] + list(np.linspace(-5, 80, 60))
+        assert_parity(bands, weights)
@@ -0,0 +1,101 @@
+from app.models.templates import AmazonProductType, ProductTypeField
+from app.services.template_service import ParsedTemplate, TemplateService, diff_multiset
+
+NO_CHANGES = {
+    "created": False, "header_rows_changed": False,
+    "fields_added": 0, "fields_updated": 0, "fields_removed": 0,
+    "values_added": 0, "values_removed": 0, "keywords_added": 0, "keywords_removed": 0,
+}
+
+
+def parsed_template(fields, keywords=("case", "bag")):
+    """A ParsedTemplate as parse_amazon_template would return it, for (field name, values) pairs in column order."""
+    parsed = ParsedTemplate()
+    parsed.header_rows = [[name for name, _ in fields]]
+    parsed.keywords = list(keywords)
+    parsed.fields = [
+        {
+            "field_name": name, "display_name": name.title(), "attribute_group": "Offer",
+            "order_index": order_index, "default_value": None, "values": list(values)
+        }
+        for order_index, (name, values) in enumerate(fields)
+    ]
+    parsed.valid_values_imported = sum(len(values) for _, values in fields)
+    return parsed
+
+
+def stored_fields(db):
+    product_type = db.query(AmazonProductType).filter(AmazonProductType.code == "CARRIER_BAG_CASE").one()
+    db.expire_all()
+    return [
+        (field.id, field.field_name, [value.value for value in field.valid_values])
+        for field in db.query(ProductTypeField).filter(
+            ProductTypeField.product_type_id == product_type.id
+        ).order_by(ProductTypeField.order_index)
+    ]
+
+
+def test_diff_multiset_keeps_still_wanted_rows_and_counts_duplicates():
+    existing = [(1, "Black"), (2, "Red"), (3, "Red"), (4, "Blue")]
+
+    assert diff_multiset(existing, ["Red", "Black", "Blue", "Red"]) == ([], [])
+    assert diff_multiset(existing, ["Green", "Red", "Black", "Green"]) == (["Green", "Green"], [3, 4])
+
+
+def test_reimporting_the_same_template_changes_nothing(db):
+    fields = [("item_name", []), ("color", ["Black", "Red"]), ("material", ["Nylon"])]
+    service = TemplateService(db)
+
+    first = service.import_parsed_template(parsed_template(fields), "CARRIER_BAG_CASE")
+    before = stored_fields(db)
+    second = service.import_parsed_template(parsed_template(fields), "CARRIER_BAG_CASE")
+
+    assert first["changes"]["created"] is True
+    assert first["changes"]["fields_added"] == 3
+    assert first["changes"]["values_added"] == 3
+    assert second["changes"] == NO_CHANGES
+    assert stored_fields(db) == before
+
+
+def test_reimport_reports_only_the_changed_value(db):
+    service = TemplateService(db)
+    service.import_parsed_template(
+        parsed_template([("item_name", []), ("color", ["Black", "Red", "Blue"]), ("material", ["Nylon"])]),
+        "CARRIER_BAG_CASE"
+    )
+    before = {name: field_id for field_id, name, _ in stored_fields(db)}
+
+    result = service.import_parsed_template(
+        parsed_template([("item_name", []), ("color", ["Black", "Green", "Blue"]), ("material", ["Nylon"])]),
+        "CARRIER_BAG_CASE"
+    )
+
+    assert result["changes"] == {**NO_CHANGES, "values_added": 1, "values_removed": 1}
+    assert stored_fields(db) == [
+        (before["item_name"], "item_name", []),
+        (before["color"], "color", ["Black", "Blue", "Green"]),
+        (before["material"], "material", ["Nylon"]),
+    ]
+
+
+def test_reimport_follows_the_new_field_order_and_keeps_surviving_value_order(db):
+    service = TemplateService(db)
+    service.import_parsed_template(
+        parsed_template([("item_name", []), ("color", ["Black", "Red"]), ("material", ["Nylon"])]),
+        "CARRIER_BAG_CASE"
+    )
+    before = {name: field_id for field_id, name, _ in stored_fields(db)}
+
+    result = service.import_parsed_template(
+        parsed_template([("material", ["Nylon"]), ("item_name", []), ("color", ["Blue", "Red", "Black"])]),
+        "CARRIER_BAG_CASE"
+    )
+
+    assert result["changes"]["fields_updated"] == 3
+    assert result["changes"]["header_rows_changed"] is True
+    # Fields take the new template's order; surviving values stay ahead of the added one
+    assert stored_fields(db) == [
+        (before["material"], "material", ["Nylon"]),
+        (before["item_name"], "item_name", []),
+        (before["color"], "color", ["Black", "Red", "Blue"]),
+    ]
@@ -0,0 +1,56 @@
+import pytest
+
+from app.api import templates
+from app.models.templates import AmazonProductType, ProductTypeField, ProductTypeFieldValue, ProductTypeKeyword
+
+
+@pytest.fixture
+def client(db, make_client):
+    product_type = AmazonProductType(code="CARRIER_BAG_CASE", name="Carrier Bag Case")
+    db.add(product_type)
+    db.flush()
+    fields = [
+        ProductTypeField(product_type_id=product_type.id, field_name=name, order_index=i)
+        for i, name in enumerate(("item_name", "color", "material"))
+    ]
+    db.add_all(fields)
+    db.add(ProductTypeKeyword(product_type_id=product_type.id, keyword="case"))
+    db.flush()
+    db.add_all([ProductTypeFieldValue(product_type_field_id=fields[1].id, value=v) for v in ("Black", "Red")])
+    db.commit()
+    return make_client(templates.router)
+
+
+def test_list_product_types_returns_the_shape_mode_asks_for(client):
+    summary = client.get("/templates", params={"mode": "summary"}).json()
+    assert summary == [{
+        "id": 1, "code": "CARRIER_BAG_CASE", "name": "Carrier Bag Case", "description": None,
+        "field_count": 3, "keyword_count": 1
+    }]
+
+    full = client.get("/templates", params={"mode": "full"}).json()
+    assert "field_count" not in full[0]
+    assert [f["field_name"] for f in full[0]["fields"]] == ["item_name", "color", "material"]
+    assert [k["keyword"] for k in full[0]["keywords"]] == ["case"]
+
+
+def test_field_routes_include_valid_values_only_when_asked(client):
+    fields = client.get("/templates/CARRIER_BAG_CASE/fields").json()
+    assert [sorted(v["value"] for v in f["valid_values"]) for f in fields] == [[], ["Black", "Red"], []]
+
+    summaries = client.get("/templates/CARRIER_BAG_CASE/fields", params={"include_values": False}).json()
+    assert [f["field_name"] for f in summaries] == ["item_name", "color", "material"]
+    assert all("valid_values" not in f for f in summaries)
+
+    color_id = fields[1]["id"]
+    assert len(client.get(f"/templates/fields/{color_id}").json()["valid_values"]) == 2
+    assert "valid_values" not in client.get(f"/templates/fields/{color_id}", params={"include_values": False}).json()
+
+
+def test_field_pages_carry_the_next_cursor_header(client):
+    first = client.get("/templates/CARRIER_BAG_CASE/fields", params={"limit": 2, "include_values": False})
+    assert [f["field_name"] for f in first.json()] == ["item_name", "color"]
+
+    rest = client.get("/templates/CARRIER_BAG_CASE/fields", params={"cursor": first.headers["X-Next-Cursor"]})
+    assert [f["field_name"] for f in rest.json()] == ["material"]
+    assert "X-Next-Cursor" not in rest.headers